@@ -1,25 +1,53 @@
+import time
+import sys
+
+# 서버 프로세스에서 처음 실행될 때만 모듈 import 비용이 든다 (이후 재실행은 sys.modules 재사용)
+_script_started = time.perf_counter()
+_cold_start = 'swing_analyzer' not in sys.modules
+
 import streamlit as st
 import pandas as pd
-import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
-from datetime import datetime, timedelta
-import FinanceDataReader as fdr
-from swing_analyzer import SwingTradeAnalyzer, filter_swing_candidates
+from datetime import datetime
+from swing_analyzer import SwingTradeAnalyzer, filter_swing_candidates, DEFAULT_MARKETS
+from data_sources import MARKETS
+from shared_cache import get_shared_cache
+from batch_scan import scan_key, parse_markets, universe_tag
+from scan_jobs import get_job_manager
+from chart_payload import get_chart_payload, prefetch_chart_payloads, CHART_PERIODS
+from lazy_import import lazy_module, record_timing, startup_report
+from scan_metrics import get_ui_timer
+from result_export import available_formats, export_frame_cached, EXPORT_FORMATS
+from result_table import render_result_table
+from chart_builder import (downsample_ohlcv, line_trace, candlestick_trace, volume_trace, histogram_trace,
+                           pattern_marker_traces, DEFAULT_MAX_POINTS)
 import warnings
-import sys
 from io import StringIO
 import os
 
-# TA-Lib 임포트 (패턴 감지용)
-try:
-    import talib
-    TALIB_AVAILABLE = True
-except ImportError:
-    TALIB_AVAILABLE = False
+# plotly는 차트를 처음 그릴 때 import
+go = lazy_module('plotly.graph_objects')
+px = lazy_module('plotly.express')
+
+if _cold_start:
+    record_timing('app.py 모듈 import', time.perf_counter() - _script_started, 'startup')
 
 warnings.filterwarnings('ignore')
 
+# 백그라운드 분석 진행 상황 갱신 주기 (초)
+SCAN_POLL_SECONDS = 2
+
+# 메인 화면 (선택한 화면 하나만 실행 - st.tabs는 재실행마다 모든 탭 본문을 실행함)
+MAIN_VIEWS = ["🎯 추천 종목", "📈 차트 분석", "📊 데이터 테이블", "ℹ️ 정보"]
+
+# 다른 화면을 보는 동안에도 값을 유지할 위젯 (기본값은 세션 상태 초기화에서 지정)
+PERSISTENT_WIDGET_DEFAULTS = {
+    'use_cached_swing': True,
+    'chart_period': '1년',
+    'chart_show_patterns': False,
+    'chart_show_ichimoku': True,
+    'chart_full_resolution': False,
+}
+
 # 페이지 설정
 st.set_page_config(
     page_title="스윙매매 종목 추천",
@@ -66,165 +94,6 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# =============== 일목균형표 계산 함수 ===============
-
-def calculate_ichimoku(df, conversion_period=9, base_period=26, leading_span_b_period=52):
-    """
-    일목균형표(Ichimoku Cloud) 지표 계산 (미래 구간 포함)
-
-    Parameters:
-    - conversion_period: 전환선 기간 (기본값: 9일)
-    - base_period: 기준선 기간 (기본값: 26일)
-    - leading_span_b_period: 선행스팬B 기간 (기본값: 52일)
-
-    Returns:
-    - DataFrame with ichimoku indicators including future dates
-    """
-    high = df['High']
-    low = df['Low']
-    close = df['Close']
-
-    # 전환선 (Tenkan-sen): 9일간 최고가와 최저가의 중간값
-    tenkan_sen = (high.rolling(window=conversion_period).max() + low.rolling(window=conversion_period).min()) / 2
-
-    # 기준선 (Kijun-sen): 26일간 최고가와 최저가의 중간값
-    kijun_sen = (high.rolling(window=base_period).max() + low.rolling(window=base_period).min()) / 2
-
-    # 선행 스팬 A (Senkou Span A): 전환선과 기준선의 중간값을 26일 앞으로 이동
-    senkou_span_a = ((tenkan_sen + kijun_sen) / 2).shift(base_period)
-
-    # 선행 스팬 B (Senkou Span B): 52일간 최고가와 최저가의 중간값을 26일 앞으로 이동
-    senkou_span_b = ((high.rolling(window=leading_span_b_period).max() + low.rolling(window=leading_span_b_period).min()) / 2).shift(base_period)
-
-    # 지행 스팬 (Chikou Span): 현재 종가를 26일 뒤로 이동 (과거로 표시)
-    chikou_span = close.shift(-base_period)
-
-    # 미래 날짜까지 인덱스 확장 (선행스팬 표시용)
-    last_date = df.index[-1]
-    future_dates = pd.date_range(start=last_date + pd.Timedelta(days=1), periods=base_period, freq='D')
-
-    # 마지막 값으로 미래 구간 채우기 (선행스팬은 미래 값을 표시하기 위해)
-    # reindex로 날짜 확장 후 forward fill로 마지막 값 확장
-    senkou_span_a_extended = senkou_span_a.reindex(senkou_span_a.index.union(future_dates))
-    senkou_span_a_extended = senkou_span_a_extended.fillna(method='ffill')  # 마지막 값으로 미래 채우기
-
-    senkou_span_b_extended = senkou_span_b.reindex(senkou_span_b.index.union(future_dates))
-    senkou_span_b_extended = senkou_span_b_extended.fillna(method='ffill')  # 마지막 값으로 미래 채우기
-
-    return {
-        'tenkan_sen': tenkan_sen,
-        'kijun_sen': kijun_sen,
-        'senkou_span_a': senkou_span_a_extended,
-        'senkou_span_b': senkou_span_b_extended,
-        'chikou_span': chikou_span,
-        'extended_index': senkou_span_a_extended.index
-    }
-
-# =============== 패턴 감지 함수 ===============
-
-def detect_bullish_patterns(df):
-    """
-    순수 Python으로 상승 패턴 감지 (TA-Lib 독립적)
-    모든 환경에서 동일하게 작동
-
-    Returns:
-        list: 패턴 정보 리스트 [{'date': 날짜, 'pattern': 패턴명, 'price': 종가}, ...]
-    """
-    if df is None or len(df) < 30:
-        return []
-
-    patterns = []
-
-    try:
-        # Try TA-Lib first if available
-        if TALIB_AVAILABLE:
-            open_arr = np.asarray(df['Open'].values, dtype=np.float64)
-            high_arr = np.asarray(df['High'].values, dtype=np.float64)
-            low_arr = np.asarray(df['Low'].values, dtype=np.float64)
-            close_arr = np.asarray(df['Close'].values, dtype=np.float64)
-
-            # 1. Morning Star (아침별) - 강한 상승 신호
-            morningstar = talib.CDLMORNINGSTAR(open_arr, high_arr, low_arr, close_arr)
-            for idx, val in enumerate(morningstar):
-                if val != 0 and idx < len(df):
-                    patterns.append({
-                        'date': df.index[idx].strftime('%Y-%m-%d'),
-                        'pattern': '🌅 Morning Star (아침별)',
-                        'price': close_arr[idx],
-                        'strength': 'Strong'
-                    })
-
-            # 2. Bullish Engulfing (강세 포함) - 상승 신호
-            engulfing = talib.CDLENGULFING(open_arr, high_arr, low_arr, close_arr)
-            for idx, val in enumerate(engulfing):
-                if val > 0 and idx < len(df):  # 양수만 강세 신호
-                    patterns.append({
-                        'date': df.index[idx].strftime('%Y-%m-%d'),
-                        'pattern': '📈 Bullish Engulfing (강세 포함)',
-                        'price': close_arr[idx],
-                        'strength': 'Strong'
-                    })
-
-            # 3. Piercing (관통) - 상승 신호
-            piercing = talib.CDLPIERCING(open_arr, high_arr, low_arr, close_arr)
-            for idx, val in enumerate(piercing):
-                if val != 0 and idx < len(df):
-                    patterns.append({
-                        'date': df.index[idx].strftime('%Y-%m-%d'),
-                        'pattern': '⬆️ Piercing (관통)',
-                        'price': close_arr[idx],
-                        'strength': 'Medium'
-                    })
-
-            # 4. Three White Soldiers (세 개의 흰 병사) - 강한 상승 신호
-            three_white = talib.CDL3WHITESOLDIERS(open_arr, high_arr, low_arr, close_arr)
-            for idx, val in enumerate(three_white):
-                if val != 0 and idx < len(df):
-                    patterns.append({
-                        'date': df.index[idx].strftime('%Y-%m-%d'),
-                        'pattern': '⚪⚪⚪ Three White Soldiers (세 병사)',
-                        'price': close_arr[idx],
-                        'strength': 'Strong'
-                    })
-
-            # 5. Bullish Harami (강세 하라미) - 반전 신호
-            harami = talib.CDLHARAMI(open_arr, high_arr, low_arr, close_arr)
-            for idx, val in enumerate(harami):
-                if val > 0 and idx < len(df):  # 양수만 강세
-                    patterns.append({
-                        'date': df.index[idx].strftime('%Y-%m-%d'),
-                        'pattern': '💫 Bullish Harami (강세 하라미)',
-                        'price': close_arr[idx],
-                        'strength': 'Medium'
-                    })
-
-            # 6. Hammer (망치) - 반전 신호 (저점에서)
-            hammer = talib.CDLHAMMER(open_arr, high_arr, low_arr, close_arr)
-            for idx, val in enumerate(hammer):
-                if val != 0 and idx < len(df):
-                    patterns.append({
-                        'date': df.index[idx].strftime('%Y-%m-%d'),
-                    'pattern': '🔨 Hammer (망치)',
-                    'price': close_arr[idx],
-                    'strength': 'Medium'
-                })
-
-        # 중복 제거 및 날짜순 정렬
-        unique_patterns = {}
-        for p in patterns:
-            key = (p['date'], p['pattern'])
-            if key not in unique_patterns:
-                unique_patterns[key] = p
-
-        patterns = list(unique_patterns.values())
-        patterns.sort(key=lambda x: x['date'], reverse=True)  # 최신순 정렬
-
-    except Exception as e:
-        st.warning(f"패턴 감지 중 오류: {str(e)}")
-        return []
-
-    return patterns
-
 # 세션 상태 초기화
 # ===== 통합 캐시 데이터 =====
 if 'cached_kospi_stocks' not in st.session_state:
@@ -259,8 +128,6 @@ if 'talib_results' not in st.session_state:
     st.session_state.talib_results = None
 if 'selected_talib_stock' not in st.session_state:
     st.session_state.selected_talib_stock = None
-if 'talib_chart_data' not in st.session_state:
-    st.session_state.talib_chart_data = {}
 if 'soaring_signal_results' not in st.session_state:
     st.session_state.soaring_signal_results = None
 if 'selected_stock_ticker' not in st.session_state:
@@ -271,12 +138,21 @@ if 'stock_detail_view_date' not in st.session_state:
     st.session_state.stock_detail_view_date = datetime.now().date()
 if 'reverse_ma_results' not in st.session_state:
     st.session_state.reverse_ma_results = None
+if 'swing_job_id' not in st.session_state:
+    st.session_state.swing_job_id = None
+if 'swing_job_message' not in st.session_state:
+    st.session_state.swing_job_message = None
+
+# ===== 화면 전환 시 유지할 위젯 값 =====
+# 화면에 그려지지 않은 위젯의 값은 Streamlit이 지우므로 매 실행마다 다시 지정해 둔다
+for widget_key, default_value in PERSISTENT_WIDGET_DEFAULTS.items():
+    st.session_state[widget_key] = st.session_state.get(widget_key, default_value)
 
 # 제목
 col1, col2, col3 = st.columns([0.5, 2, 0.5])
 with col2:
     st.markdown('<h1 class="title-style">📈 스윙매매 종목 추천 시스템</h1>', unsafe_allow_html=True)
-    st.markdown('<p class="subtitle-style">기술적 분석 기반 KOSPI 전체 종목 분석</p>', unsafe_allow_html=True)
+    st.markdown('<p class="subtitle-style">기술적 분석 기반 KOSPI · KOSDAQ · KONEX · ETF 전체 종목 분석</p>', unsafe_allow_html=True)
 
 # 사이드바 설정
 with st.sidebar:
@@ -292,6 +168,16 @@ with st.sidebar:
         key="min_score_sidebar"
     )
 
+    scan_markets = st.multiselect(
+        "스캔 대상 시장",
+        options=list(MARKETS),
+        default=list(DEFAULT_MARKETS),
+        help="추천 종목 분석과 TA-Lib 패턴 스캔에 포함할 시장 (비우면 전체 시장)",
+        key="scan_markets"
+    )
+    # 시장 목록 → 배치 스캔/스캔 서비스와 같은 스캔 대상 이름 (공용 캐시 키에 들어감)
+    scan_universe = ','.join(scan_markets) if scan_markets else 'all'
+
     st.divider()
     st.subheader("📊 분석 기준")
     st.markdown("""
@@ -303,11 +189,108 @@ with st.sidebar:
     - **거래량**: 평균 이상 (유동성 확보)
     """)
 
-# 메인 콘텐츠
-tabs = st.tabs(["🎯 추천 종목", "📈 차트 분석", "📊 데이터 테이블", "ℹ️ 정보"])
+    # 단계별 시간 (직전 스캔 + 차트 렌더링) - 체크했을 때만 계산
+    if st.checkbox("⏱️ 단계별 시간 보기", value=False, key="show_stage_timings"):
+        last_job = get_job_manager().last_finished()
+        if last_job is not None:
+            st.caption(f"직전 스캔: {last_job.description} ({last_job.snapshot()['elapsed_seconds']:.0f}초)")
+            job_stages = last_job.stage_summary()
+            if job_stages:
+                st.dataframe(pd.DataFrame(job_stages).T[['count', 'total', 'p50', 'p90', 'p99']], use_container_width=True)
+        ui_stages = get_ui_timer().summary()
+        if ui_stages:
+            st.caption("화면 렌더링")
+            st.dataframe(pd.DataFrame(ui_stages).T[['count', 'total', 'p50', 'p90', 'p99']], use_container_width=True)
+        if last_job is None and not ui_stages:
+            st.caption("아직 측정된 구간이 없습니다.")
+
+    # 시작 시간 보고서 (모듈 import, 지연 import, 직전 스크립트 실행 시간)
+    with st.expander("⏱️ 시작 시간", expanded=False):
+        for name, kind, seconds in startup_report():
+            st.caption(f"{seconds * 1000:,.0f}ms · [{kind}] {name}")
+
+# =============== 백그라운드 분석 작업 ===============
+
+@st.fragment(run_every=SCAN_POLL_SECONDS)
+def render_swing_job_status(min_score):
+    """백그라운드 스윙매매 분석 진행 상황 표시 (fragment - 이 영역만 주기적으로 다시 그림)"""
+    job = get_job_manager().get(st.session_state.swing_job_id)
+    if job is None:
+        st.session_state.swing_job_id = None
+        st.session_state.is_analyzing = False
+        return
+
+    snapshot = job.snapshot()
+
+    if job.is_active:
+        st.session_state.is_analyzing = True
+        st.progress(snapshot['progress'], text=f"분석 중: {snapshot['current']} - {snapshot['processed']}/{snapshot['total']}")
+        st.markdown(f"""
+        <div class="current-stock">
+            <strong>현재 분석 종목:</strong> {snapshot['current']}<br/>
+            <strong>진행률:</strong> {snapshot['processed']}/{snapshot['total']} ({snapshot['progress']*100:.1f}%)<br/>
+            <strong>분석 성공:</strong> {snapshot['succeeded']}개 | <strong>실패:</strong> {snapshot['failed']}개 | <strong>경과:</strong> {snapshot['elapsed_seconds']:.0f}초
+        </div>
+        """, unsafe_allow_html=True)
+
+        # 중간 결과 (현재까지 분석된 종목 중 추천 후보)
+        partial_df = job.partial_frame()
+        if not partial_df.empty:
+            partial_candidates = filter_swing_candidates(partial_df, min_score=min_score)
+            st.caption(f"중간 결과: 추천 후보 {len(partial_candidates)}개 (분석 완료 {len(partial_df)}개)")
+            if not partial_candidates.empty:
+                st.dataframe(
+                    partial_candidates[['name', 'ticker', 'current_price', 'volatility', 'total_score', 'recommendation']].head(10),
+                    use_container_width=True,
+                    hide_index=True
+                )
+        return
+
+    # 완료 또는 실패 - 결과를 세션에 반영하고 전체 화면 다시 그리기
+    st.session_state.swing_job_id = None
+    st.session_state.is_analyzing = False
+
+    if job.status == 'done' and job.result is not None and not job.result.empty:
+        swing_results = job.result
+        st.session_state.analyzer_results = swing_results
+        st.session_state.filtered_results = filter_swing_candidates(swing_results, min_score=min_score)
+
+        # ===== 통합 캐시에 분석 결과 저장 =====
+        st.session_state.cached_swing_results = swing_results
+        st.session_state.cached_analysis_date = datetime.now().date()
+        st.session_state.swing_job_message = ('success', f"✅ 스윙매매 분석 완료: {len(swing_results)}개 종목")
+    elif job.status == 'done':
+        st.session_state.swing_job_message = ('error', """
+        ❌ 분석 결과가 없습니다.
+
+        **원인:**
+        - 종목 데이터를 조회할 수 없거나 인터넷 연결이 불안정함
+        - FinanceDataReader에서 주가 데이터를 받지 못함
+
+        **해결 방법:**
+        1. 인터넷 연결 상태를 확인해주세요
+        2. 잠시 후 다시 시도해주세요
+        3. 분석 범위를 '테스트 (50개)'로 줄여서 시도해보세요
+        """)
+    else:
+        st.session_state.swing_job_message = ('error', f"""
+        ⚠️ 분석 중 오류 발생했습니다.
+
+        **오류 정보:** {snapshot['error']}
+
+        **해결 방법:**
+        1. 인터넷 연결을 확인해주세요
+        2. 분석 범위를 줄여서 다시 시도해보세요
+        3. 계속 오류가 발생하면 '테스트 (50개)'로 시도해보세요
+        """)
 
-with tabs[0]:
-    st.header("KOSPI 전체 종목 분석")
+    st.rerun()
+
+# 메인 콘텐츠 (선택한 화면만 계산)
+active_view = st.radio("화면", MAIN_VIEWS, horizontal=True, key="active_view", label_visibility="collapsed")
+
+if active_view == MAIN_VIEWS[0]:
+    st.header(f"{' · '.join(parse_markets(scan_universe))} 전체 종목 분석")
 
     col1, col2 = st.columns([2, 1])
 
@@ -319,27 +302,48 @@ with tabs[0]:
         )
 
     with col2:
-        use_cached = st.checkbox("캐시된 데이터 사용", value=True, help="같은 날 저장된 데이터가 있으면 사용합니다", key="use_cached_swing")
+        use_cached = st.checkbox("캐시된 데이터 사용", help="같은 날 저장된 데이터가 있으면 사용합니다", key="use_cached_swing")
 
-    # 진행 상황 표시 영역
-    progress_placeholder = st.empty()
+    # 상태 메시지 표시 영역
     status_placeholder = st.empty()
-    current_stock_placeholder = st.empty()
-    progress_bar_placeholder = st.empty()
-
-    if run_analysis:
-        st.session_state.is_analyzing = True
 
-        # 추천 종목만 분석 (점수 >= 50점)
-        max_stocks = None  # 모든 종목을 검토하되, 점수 필터링으로 추천 종목만 반환
+    # 추천 종목만 분석 (점수 >= 50점)
+    max_stocks = None  # 모든 종목을 검토하되, 점수 필터링으로 추천 종목만 반환
+
+    # 프로세스 공용 캐시와 백그라운드 작업 관리자 (모든 사용자 세션이 공유)
+    shared_cache = get_shared_cache()
+    job_manager = get_job_manager()
+    swing_scan_key = scan_key('swing', scan_universe, max_stocks)
+    swing_file_tag = universe_tag(scan_universe, max_stocks)
+
+    # 다른 세션에서 같은 분석이 실행 중이면 새로 시작하지 않고 그 작업에 연결
+    if st.session_state.swing_job_id is None:
+        running_job = job_manager.find_active(swing_scan_key)
+        if running_job is not None:
+            st.session_state.swing_job_id = running_job.job_id
+
+    # 직전 백그라운드 분석의 완료/오류 메시지
+    if st.session_state.swing_job_message is not None:
+        message_type, message_text = st.session_state.swing_job_message
+        st.session_state.swing_job_message = None
+        with status_placeholder.container():
+            if message_type == 'success':
+                st.success(message_text)
+            else:
+                st.error(message_text)
 
+    if run_analysis:
         # 스윙매매 분석기
         analyzer = SwingTradeAnalyzer()
 
-        # 캐시된 데이터 우선 사용
+        # 캐시된 데이터 우선 사용 (공용 캐시 → 저장된 CSV 순)
         cached_results = None
         if use_cached:
-            cached_results = analyzer.load_cached_analysis()
+            cached_results = shared_cache.get(swing_scan_key)
+            if cached_results is None:
+                cached_results = analyzer.load_cached_analysis(tag=swing_file_tag)
+                if cached_results is not None:
+                    shared_cache.set(swing_scan_key, cached_results)
 
         # 캐시 체크박스가 켜져있고 캐시가 있으면 사용, 없으면 새로 분석
         if use_cached and cached_results is not None:
@@ -356,90 +360,37 @@ with tabs[0]:
             # ===== 캐시 데이터를 통합 캐시에도 저장 (다른 탭에서 사용 가능) =====
             st.session_state.cached_swing_results = results
             st.session_state.cached_analysis_date = datetime.now().date()
-
-            st.session_state.is_analyzing = False
         elif not use_cached:
-            # 캐시 체크박스가 꺼져있으면 새로 분석
-            # 진행 상황 콜백 함수
-            def update_progress(idx, total, name, ticker, success_count):
-                """스윙매매 분석 진행 상황을 Streamlit UI에 표시"""
-                progress_ratio = idx / total if total > 0 else 0
-
-                # 진행 상황 표시
-                with progress_placeholder.container():
-                    st.markdown(f"**분석 중**: {name} ({ticker}) - {idx}/{total}")
-                    st.progress(progress_ratio)
-
-                # 현재 상태 표시
-                with current_stock_placeholder.container():
-                    st.markdown(f"""
-                    <div class="current-stock">
-                        <strong>현재 분석 종목:</strong> {name} ({ticker})<br/>
-                        <strong>진행률:</strong> {idx}/{total} ({progress_ratio*100:.1f}%)<br/>
-                        <strong>적합 종목:</strong> {success_count}개
-                    </div>
-                    """, unsafe_allow_html=True)
-
-            try:
-                with status_placeholder.container():
-                    st.info(f"📊 스윙매매 종목 분석 중...")
-
-                # 스윙매매 분석 실행
-                swing_results = analyzer.analyze_all_stocks(
+            # 캐시 체크박스가 꺼져있으면 백그라운드 작업으로 새로 분석
+            def run_swing_job(job):
+                results = analyzer.analyze_all_stocks(
                     max_stocks=max_stocks,
-                    progress_callback=update_progress
+                    markets=parse_markets(scan_universe),
+                    progress_callback=job.update_progress,
+                    result_callback=job.add_result
                 )
-
-                if swing_results is not None and not swing_results.empty:
+                if results is not None and not results.empty:
                     # CSV로 저장
-                    analyzer.save_analysis_results(swing_results)
-
-                    st.session_state.analyzer_results = swing_results
-                    st.session_state.filtered_results = filter_swing_candidates(swing_results, min_score=min_score)
+                    analyzer.save_analysis_results(results, tag=swing_file_tag)
+                return results
 
-                    # ===== 통합 캐시에 분석 결과 저장 =====
-                    st.session_state.cached_swing_results = swing_results
-                    st.session_state.cached_analysis_date = datetime.now().date()
+            job, created = job_manager.submit(swing_scan_key, run_swing_job, description="스윙매매 분석")
+            st.session_state.swing_job_id = job.job_id
+            st.session_state.is_analyzing = True
 
-                    # 완료 메시지
-                    with status_placeholder.container():
-                        st.success(f"✅ 스윙매매 분석 완료: {len(swing_results)}개 종목")
-
-                    st.session_state.is_analyzing = False
+            with status_placeholder.container():
+                if created:
+                    st.info("📊 백그라운드에서 스윙매매 분석을 시작했습니다. 분석 중에도 다른 탭과 캐시된 결과를 볼 수 있습니다.")
                 else:
-                    with status_placeholder.container():
-                        st.error("""
-                        ❌ 분석 결과가 없습니다.
-
-                        **원인:**
-                        - KOSPI 종목 데이터를 조회할 수 없거나 인터넷 연결이 불안정함
-                        - FinanceDataReader에서 주가 데이터를 받지 못함
-
-                        **해결 방법:**
-                        1. 인터넷 연결 상태를 확인해주세요
-                        2. 잠시 후 다시 시도해주세요
-                        3. 분석 범위를 '테스트 (50개)'로 줄여서 시도해보세요
-                        """)
-                    st.session_state.is_analyzing = False
-
-            except Exception as e:
-                with status_placeholder.container():
-                    st.error(f"""
-                    ⚠️ 분석 중 오류 발생했습니다.
-
-                    **오류 정보:** {str(e)}
-
-                    **해결 방법:**
-                    1. 인터넷 연결을 확인해주세요
-                    2. 분석 범위를 줄여서 다시 시도해보세요
-                    3. 계속 오류가 발생하면 '테스트 (50개)'로 시도해보세요
-                    """)
-                st.session_state.is_analyzing = False
+                    st.info("⏳ 다른 사용자가 실행 중인 같은 분석에 연결했습니다. 완료되면 결과를 함께 사용합니다.")
         else:
             # 캐시 체크박스가 켜져있는데 캐시가 없는 경우
             with status_placeholder.container():
                 st.warning("⚠️ 캐시된 데이터가 없습니다. 새로운 분석을 시작하려면 '캐시된 데이터 사용' 체크박스를 끄세요.")
-            st.session_state.is_analyzing = False
+
+    # 백그라운드 분석 진행 상황 (이 영역만 주기적으로 갱신)
+    if st.session_state.swing_job_id is not None:
+        render_swing_job_status(min_score)
 
     # 결과 표시
     if st.session_state.filtered_results is not None and len(st.session_state.filtered_results) > 0:
@@ -503,33 +454,13 @@ with tabs[0]:
             else:
                 st.caption(f"📊 데이터 추출: {extraction_time}")
 
-        display_df = filtered_df[[
-            'name', 'ticker', 'current_price', 'volatility', 'total_score', 'recommendation'
-        ]].head(20).copy()
-
-        display_df.columns = ['종목명', '티커', '현재가', '변동성(%)', '점수', '추천']
-        display_df['순위'] = range(1, len(display_df) + 1)
-
-        # 티커를 문자열로 변환 및 6자리로 패딩 (leading zero 보존)
-        display_df['티커_temp'] = display_df['티커'].astype(str).str.zfill(6)
-
-        # 티커를 네이버 증권 링크로 변환 (0이 생략되지 않도록 텍스트로 표시)
-        display_df['티커'] = display_df['티커_temp'].apply(
-            lambda ticker: f'<a href="https://finance.naver.com/item/main.naver?code={str(ticker)}" target="_blank">{str(ticker)}</a>'
+        render_result_table(
+            filtered_df, "swing_ranking",
+            columns={'name': '종목명', 'ticker': '티커', 'current_price': '현재가', 'volatility': '변동성(%)',
+                     'total_score': '점수', 'recommendation': '추천'},
+            formats={'current_price': '₩%d', 'volatility': '%.2f', 'total_score': '%.1f'},
+            page_size=20
         )
-        display_df = display_df.drop('티커_temp', axis=1)
-
-        display_df = display_df[['순위', '종목명', '티커', '현재가', '변동성(%)', '점수', '추천']]
-
-        # 조건부 스타일
-        def color_recommendation(val):
-            if val == 'Strong Buy':
-                return 'background-color: #ffff99'
-            elif val == 'Buy':
-                return 'background-color: #c2f0c2'
-            return 'background-color: #ffe6e6'
-
-        st.markdown(display_df.to_html(escape=False, index=False), unsafe_allow_html=True)
         st.caption("💡 팁: 종목명을 아래 입력창에 입력하면 모든 분석 정보를 한 화면에서 확인할 수 있습니다")
 
         st.divider()
@@ -732,7 +663,7 @@ with tabs[0]:
     else:
         st.info("📌 '🔍 추천 종목 분석 시작' 버튼을 클릭하여 분석을 시작하세요.")
 
-with tabs[1]:
+if active_view == MAIN_VIEWS[1]:
     st.header("📈 차트 분석")
 
     if st.session_state.filtered_results is not None and len(st.session_state.filtered_results) > 0:
@@ -789,8 +720,8 @@ with tabs[1]:
         with col4:
             chart_period = st.selectbox(
                 "기간",
-                options=["1개월", "3개월", "6개월", "1년"],
-                index=3
+                options=list(CHART_PERIODS),
+                key="chart_period"
             )
 
         if st.session_state.selected_chart_stock:
@@ -810,113 +741,61 @@ with tabs[1]:
 
             st.divider()
 
-            # 기간 설정
-            period_days = {'1개월': 30, '3개월': 90, '6개월': 180, '1년': 365}[chart_period]
+            # 기간 설정 (기준일은 종목 통합 정보 조회의 '분석 기준일')
+            period_days = CHART_PERIODS[chart_period]
+            as_of = min(st.session_state.stock_detail_view_date, datetime.now().date())
+            if as_of < datetime.now().date():
+                st.caption(f"📅 기준일 {as_of.strftime('%Y-%m-%d')}까지의 차트")
 
             try:
-                # 데이터 조회
-                end_date = datetime.now()
-                start_date = end_date - timedelta(days=period_days)
-
-                # FinanceDataReader는 한국 ticker 코드 그대로 사용 (예: 005930)
-                ticker_symbol = ticker
-
-                # 재시도 로직이 있는 데이터 다운로드
-                df = None
-                for attempt in range(3):
-                    try:
-                        # FinanceDataReader로 데이터 조회
-                        df = fdr.DataReader(
-                            ticker_symbol,
-                            start_date,
-                            end_date
-                        )
-                        if df is not None and len(df) > 0:
-                            break
-                    except Exception as e:
-                        if attempt < 2:
-                            import time
-                            time.sleep(0.5)
-                        else:
-                            st.error(f"❌ 데이터 조회 실패: {str(e)}")
+                # 차트 지표/패턴/일목균형표 페이로드 (LRU 차트 캐시 → 배치 스캔이 미리 저장한 디스크 캐시 → 계산)
+                with get_ui_timer().stage('chart_data'):
+                    payload = get_chart_payload(ticker, period_days, as_of)
+                df = payload['frame'] if payload is not None else None
+
+                # ◀/▶ 이동에 대비해 앞뒤 종목을 백그라운드에서 미리 계산
+                prefetch_chart_payloads(st.session_state.filtered_results['ticker'].tolist(), ticker, period_days, as_of)
 
                 # 데이터 확인 및 처리
                 if df is None or len(df) == 0:
                     st.error(f"❌ {st.session_state.selected_chart_stock} ({ticker})의 데이터를 찾을 수 없습니다.")
                 else:
-                    # MultiIndex 처리 (경우에 따라 MultiIndex를 반환할 수 있음)
-                    if isinstance(df.columns, pd.MultiIndex):
-                        # MultiIndex인 경우 첫 번째 레벨만 취함
-                        df.columns = df.columns.get_level_values(0)
-
-                    # 컬럼명 정리 - 첫 글자 대문자 변환
-                    df.columns = [str(col).strip() for col in df.columns]
-                    df.columns = [col[0].upper() + col[1:].lower() if len(col) > 0 else col for col in df.columns]
-
-                    # 필요한 컬럼 확인
-                    required_cols = ['Open', 'High', 'Low', 'Close', 'Volume']
-
-                    # 컬럼 매핑 (대소문자 무시)
-                    col_map = {}
-                    for col in df.columns:
-                        col_lower = col.lower().strip()
-                        if col_lower == 'open':
-                            col_map[col] = 'Open'
-                        elif col_lower == 'high':
-                            col_map[col] = 'High'
-                        elif col_lower == 'low':
-                            col_map[col] = 'Low'
-                        elif col_lower == 'close':
-                            col_map[col] = 'Close'
-                        elif col_lower == 'volume':
-                            col_map[col] = 'Volume'
-                        elif 'adj' in col_lower:
-                            col_map[col] = 'Adj Close'
-
-                    if col_map:
-                        df = df.rename(columns=col_map)
-
-                    # 필요한 컬럼만 선택
-                    available_cols = [col for col in required_cols if col in df.columns]
-                    if len(available_cols) >= 5:
-                        df = df[required_cols].copy()
-                    else:
-                        st.error(f"❌ 필요한 컬럼이 부족합니다. 발견된 컬럼: {list(df.columns)}")
-                        df = None
-
-                    # 데이터 타입 변환
-                    if df is not None:
-                        df['Open'] = pd.to_numeric(df['Open'], errors='coerce')
-                        df['High'] = pd.to_numeric(df['High'], errors='coerce')
-                        df['Low'] = pd.to_numeric(df['Low'], errors='coerce')
-                        df['Close'] = pd.to_numeric(df['Close'], errors='coerce')
-                        df['Volume'] = pd.to_numeric(df['Volume'], errors='coerce')
-
-                        # NaN 값 제거
-                        df = df.dropna()
+                    if df is not None and len(df) > 0:
 
-                        if len(df) == 0:
-                            st.error(f"❌ 유효한 데이터가 없습니다.")
-                            df = None
+                        # ===== 차트 옵션 설정 (토글) =====
+                        detected_patterns = payload['patterns']
 
-                    if df is not None and len(df) > 0:
-                        # 이동평균선 계산
-                        df['MA5'] = df['Close'].rolling(window=5).mean()
-                        df['MA20'] = df['Close'].rolling(window=20).mean()
-                        df['MA60'] = df['Close'].rolling(window=60).mean()
-                        df['MA112'] = df['Close'].rolling(window=112).mean()
-                        df['MA224'] = df['Close'].rolling(window=224).mean()
+                        # 패턴 표시 토글 및 일목균형표 토글
+                        col1, col2, col3 = st.columns([1, 1, 2])
+                        with col1:
+                            show_patterns = st.checkbox(
+                                "패턴 표시",
+                                key="chart_show_patterns",
+                                help="차트에 감지된 상승 패턴을 별 모양으로 표시합니다"
+                            )
+                        with col2:
+                            show_ichimoku = st.checkbox(
+                                "일목균형표",
+                                key="chart_show_ichimoku",
+                                help="Ichimoku Cloud 지표를 표시합니다"
+                            )
+                        with col3:
+                            # 캔들이 화면 폭보다 많으면 구간별 고가/저가를 보존해 합쳐서 그림
+                            full_resolution = len(df) > DEFAULT_MAX_POINTS and st.checkbox(
+                                "원본 해상도",
+                                key="chart_full_resolution",
+                                help="확대해서 일봉 하나하나를 볼 때 켜세요 (기본은 화면 폭에 맞춰 캔들을 합쳐서 표시)"
+                            )
+                        max_points = None if full_resolution else DEFAULT_MAX_POINTS
+                        view = downsample_ohlcv(df, max_points)
 
                         # 캔들스틱 차트 생성 (Plotly - 최신 버전 호환)
+                        chart_render_started = time.perf_counter()
                         fig = go.Figure()
 
                         # 캔들스틱 추가
-                        fig.add_trace(go.Candlestick(
-                            x=df.index,
-                            open=df['Open'],
-                            high=df['High'],
-                            low=df['Low'],
-                            close=df['Close'],
+                        fig.add_trace(candlestick_trace(
+                            view,
                             name='가격',
                             increasing_line_color='#FF3131',      # 상승봉
                             decreasing_line_color='#0047AB',      # 하락봉
@@ -924,51 +803,23 @@ with tabs[1]:
                             decreasing_fillcolor='#0047AB'
                         ))
 
-                        # 이동평균선 추가
-                        fig.add_trace(go.Scatter(
-                            x=df.index,
-                            y=df['MA5'],
-                            name='MA5 (5일)',
-                            mode='lines',
-                            line=dict(color='#FFB400', width=2),
-                            hovertemplate='<b>MA5</b><br>%{x|%Y-%m-%d}<br>₩%{y:,.0f}<extra></extra>'
-                        ))
-
-                        fig.add_trace(go.Scatter(
-                            x=df.index,
-                            y=df['MA20'],
-                            name='MA20 (20일)',
-                            mode='lines',
-                            line=dict(color='#FF6B9D', width=2),
-                            hovertemplate='<b>MA20</b><br>%{x|%Y-%m-%d}<br>₩%{y:,.0f}<extra></extra>'
-                        ))
-
-                        fig.add_trace(go.Scatter(
-                            x=df.index,
-                            y=df['MA60'],
-                            name='MA60 (60일)',
-                            mode='lines',
-                            line=dict(color='#00D084', width=3),
-                            hovertemplate='<b>MA60</b><br>%{x|%Y-%m-%d}<br>₩%{y:,.0f}<extra></extra>'
-                        ))
-
-                        fig.add_trace(go.Scatter(
-                            x=df.index,
-                            y=df['MA112'],
-                            name='MA112 (112일)',
-                            mode='lines',
-                            line=dict(color='#FF9500', width=2),
-                            hovertemplate='<b>MA112</b><br>%{x|%Y-%m-%d}<br>₩%{y:,.0f}<extra></extra>'
-                        ))
-
-                        fig.add_trace(go.Scatter(
-                            x=df.index,
-                            y=df['MA224'],
-                            name='MA224 (224일)',
-                            mode='lines',
-                            line=dict(color='#9C27B0', width=2),
-                            hovertemplate='<b>MA224</b><br>%{x|%Y-%m-%d}<br>₩%{y:,.0f}<extra></extra>'
-                        ))
+                        # 이동평균선 추가 (구간별 최소/최대 점만, 점이 많으면 WebGL)
+                        for ma_col, ma_label, ma_color, ma_width in (
+                            ('MA5', 'MA5 (5일)', '#FFB400', 2),
+                            ('MA20', 'MA20 (20일)', '#FF6B9D', 2),
+                            ('MA60', 'MA60 (60일)', '#00D084', 3),
+                            ('MA112', 'MA112 (112일)', '#FF9500', 2),
+                            ('MA224', 'MA224 (224일)', '#9C27B0', 2),
+                        ):
+                            fig.add_trace(line_trace(
+                                df.index,
+                                df[ma_col],
+                                max_points,
+                                name=ma_label,
+                                mode='lines',
+                                line=dict(color=ma_color, width=ma_width),
+                                hovertemplate=f'<b>{ma_col}</b><br>%{{x|%Y-%m-%d}}<br>₩%{{y:,.0f}}<extra></extra>'
+                            ))
 
                         # 차트 레이아웃 설정 (일목균형표용 x축 확장: 26일 앞)
                         # 현재 날짜 기준으로 26일 뒤까지 x축 범위 확장
@@ -1008,54 +859,19 @@ with tabs[1]:
                             margin=dict(l=60, r=40, t=60, b=60)
                         )
 
-                        # ===== 차트 옵션 설정 (토글) =====
-                        detected_patterns = detect_bullish_patterns(df)
-
-                        # 패턴 표시 토글 및 일목균형표 토글
-                        col1, col2, col3 = st.columns([1, 1, 2])
-                        with col1:
-                            show_patterns = st.checkbox(
-                                "패턴 표시",
-                                value=False,
-                                help="차트에 감지된 상승 패턴을 별 모양으로 표시합니다"
-                            )
-                        with col2:
-                            show_ichimoku = st.checkbox(
-                                "일목균형표",
-                                value=True,
-                                help="Ichimoku Cloud 지표를 표시합니다"
-                            )
-
-                        # 패턴을 차트에 마커로 표시 (토글이 켜져있을 때만)
+                        # 패턴을 차트에 마커로 표시 (토글이 켜져있을 때만, 패턴 종류별로 트레이스 하나씩)
                         if show_patterns and detected_patterns:
-                            for pattern in detected_patterns:
-                                pattern_date_str = pattern['date']
-                                pattern_price = pattern['price']
-
-                                # 차트에 마커 추가
-                                fig.add_trace(go.Scatter(
-                                    x=[pattern_date_str],
-                                    y=[pattern_price],
-                                    mode='markers',
-                                    name=pattern['pattern'],
-                                    marker=dict(
-                                        size=15,
-                                        color='gold' if pattern['strength'] == 'Strong' else 'orange',
-                                        symbol='star',
-                                        line=dict(color='darkred', width=2)
-                                    ),
-                                    hovertemplate=f"<b>{pattern['pattern']}</b><br>날짜: {pattern_date_str}<br>가격: ₩{pattern_price:,.0f}<extra></extra>",
-                                    showlegend=False
-                                ))
+                            fig.add_traces(pattern_marker_traces(detected_patterns))
 
                         # 일목균형표 추가 (토글이 켜져있을 때만)
                         if show_ichimoku:
-                            ichimoku = calculate_ichimoku(df)
+                            ichimoku = payload['ichimoku']
 
                             # 선행 스팬 B (먼저 추가) - 미래 구간 포함
-                            fig.add_trace(go.Scatter(
-                                x=ichimoku['extended_index'],
-                                y=ichimoku['senkou_span_b'],
+                            fig.add_trace(line_trace(
+                                ichimoku['extended_index'],
+                                ichimoku['senkou_span_b'],
+                                max_points,
                                 name='선행스팬 B',
                                 mode='lines',
                                 line=dict(color='rgba(255, 152, 0, 0.3)', width=1),
@@ -1064,9 +880,10 @@ with tabs[1]:
                             ))
 
                             # 선행 스팬 A (클라우드 배경 채우기) - 미래 구간 포함
-                            fig.add_trace(go.Scatter(
-                                x=ichimoku['extended_index'],
-                                y=ichimoku['senkou_span_a'],
+                            fig.add_trace(line_trace(
+                                ichimoku['extended_index'],
+                                ichimoku['senkou_span_a'],
+                                max_points,
                                 name='선행스팬 A (클라우드)',
                                 mode='lines',
                                 line=dict(color='rgba(0, 150, 136, 0.3)', width=1),
@@ -1077,9 +894,10 @@ with tabs[1]:
                             ))
 
                             # 전환선 (Tenkan-sen)
-                            fig.add_trace(go.Scatter(
-                                x=df.index,
-                                y=ichimoku['tenkan_sen'],
+                            fig.add_trace(line_trace(
+                                df.index,
+                                ichimoku['tenkan_sen'],
+                                max_points,
                                 name='전환선',
                                 mode='lines',
                                 line=dict(color='#FF6B6B', width=1, dash='solid'),
@@ -1088,9 +906,10 @@ with tabs[1]:
                             ))
 
                             # 기준선 (Kijun-sen)
-                            fig.add_trace(go.Scatter(
-                                x=df.index,
-                                y=ichimoku['kijun_sen'],
+                            fig.add_trace(line_trace(
+                                df.index,
+                                ichimoku['kijun_sen'],
+                                max_points,
                                 name='기준선',
                                 mode='lines',
                                 line=dict(color='#4ECDC4', width=1, dash='solid'),
@@ -1099,9 +918,10 @@ with tabs[1]:
                             ))
 
                             # 지행 스팬 (Chikou Span)
-                            fig.add_trace(go.Scatter(
-                                x=df.index,
-                                y=ichimoku['chikou_span'],
+                            fig.add_trace(line_trace(
+                                df.index,
+                                ichimoku['chikou_span'],
+                                max_points,
                                 name='지행스팬',
                                 mode='lines',
                                 line=dict(color='#95E1D3', width=1, dash='dot'),
@@ -1111,6 +931,7 @@ with tabs[1]:
 
                         # 차트는 한 번만 표시
                         st.plotly_chart(fig, use_container_width=True)
+                        get_ui_timer().record('chart_render', time.perf_counter() - chart_render_started)
 
                         # ===== 상승 패턴 정보 표시 =====
                         st.subheader("🎯 감지된 상승 패턴")
@@ -1159,17 +980,12 @@ with tabs[1]:
                         # 거래량 차트 (기간 동일, 별도 표시)
                         st.subheader("📊 거래량")
 
-                        # 거래량 바 차트 (양수/음수로 색상 구분)
-                        colors = ['green' if df['Close'].values[i] >= df['Open'].values[i] else 'red'
-                                  for i in range(len(df))]
-
+                        # 거래량 바 차트 (양봉/음봉으로 색상 구분, 합친 구간은 구간 거래량 합계)
                         fig_volume = go.Figure()
 
-                        fig_volume.add_trace(go.Bar(
-                            x=df.index,
-                            y=df['Volume'],
+                        fig_volume.add_trace(volume_trace(
+                            view,
                             name='거래량',
-                            marker=dict(color=colors),
                             showlegend=False,
                             hovertemplate='<b>%{x|%Y-%m-%d}</b><br>거래량: %{y:,.0f}<extra></extra>'
                         ))
@@ -1198,42 +1014,35 @@ with tabs[1]:
                         # MACD 차트
                         st.subheader("📊 MACD (Moving Average Convergence Divergence)")
 
-                        # MACD 계산
-                        ema_fast = df['Close'].ewm(span=12).mean()
-                        ema_slow = df['Close'].ewm(span=26).mean()
-                        df['MACD'] = ema_fast - ema_slow
-                        df['Signal'] = df['MACD'].ewm(span=9).mean()
-                        df['MACD_Hist'] = df['MACD'] - df['Signal']
-
                         fig_macd = go.Figure()
 
                         # MACD 라인
-                        fig_macd.add_trace(go.Scatter(
-                            x=df.index,
-                            y=df['MACD'],
+                        fig_macd.add_trace(line_trace(
+                            df.index,
+                            df['MACD'],
+                            max_points,
                             name='MACD',
                             line=dict(color='blue', width=2),
                             hovertemplate='<b>%{x|%Y-%m-%d}</b><br>MACD: %{y:.4f}<extra></extra>'
                         ))
 
                         # Signal 라인
-                        fig_macd.add_trace(go.Scatter(
-                            x=df.index,
-                            y=df['Signal'],
+                        fig_macd.add_trace(line_trace(
+                            df.index,
+                            df['Signal'],
+                            max_points,
                             name='Signal',
                             line=dict(color='red', width=2),
                             hovertemplate='<b>%{x|%Y-%m-%d}</b><br>Signal: %{y:.4f}<extra></extra>'
                         ))
 
-                        # MACD Histogram
-                        colors = ['green' if df['MACD_Hist'].values[i] >= 0 else 'red'
-                                  for i in range(len(df))]
-
-                        fig_macd.add_trace(go.Bar(
-                            x=df.index,
-                            y=df['MACD_Hist'],
+                        # MACD Histogram (0 이상 초록 / 미만 빨강)
+                        fig_macd.add_trace(histogram_trace(
+                            df.index,
+                            df['MACD_Hist'],
+                            max_points,
+                            opacity=0.3,
                             name='Histogram',
-                            marker=dict(color=colors, opacity=0.3),
                             hovertemplate='<b>%{x|%Y-%m-%d}</b><br>Histogram: %{y:.4f}<extra></extra>'
                         ))
 
@@ -1272,13 +1081,12 @@ with tabs[1]:
                         # 변동성 차트
                         st.subheader("📈 변동성 (Volatility)")
 
-                        df['Volatility'] = df['Close'].rolling(window=20).std() / df['Close'].rolling(window=20).mean() * 100
-
                         fig_volatility = go.Figure()
 
-                        fig_volatility.add_trace(go.Scatter(
-                            x=df.index,
-                            y=df['Volatility'],
+                        fig_volatility.add_trace(line_trace(
+                            df.index,
+                            df['Volatility'],
+                            max_points,
                             name='변동성',
                             fill='tozeroy',
                             line=dict(color='orange', width=2),
@@ -1346,131 +1154,42 @@ with tabs[1]:
         st.info("📌 먼저 '추천 종목' 탭에서 분석을 실행해주세요.")
 
 
-with tabs[2]:
+if active_view == MAIN_VIEWS[2]:
     st.header("📊 데이터 테이블")
 
-    # ===== 헬퍼 함수: 데이터프레임을 HTML로 변환 (클릭 가능한 링크 포함) =====
-    def create_clickable_dataframe(df, tab_name):
-        """
-        데이터프레임에서 ticker와 name 컬럼을 클릭 가능한 링크로 변환
-        """
-        if df is None or len(df) == 0:
-            return None
-
-        df_display = df.copy()
-
-        # 원본 ticker 값을 먼저 저장 (HTML 변환 전)
-        original_ticker = df_display['ticker'].copy() if 'ticker' in df_display.columns else None
-
-        # Name 컬럼이 있는 경우 네이버 차트 페이지 링크로 변환 (ticker 변환 전에 처리)
-        if 'name' in df_display.columns and original_ticker is not None:
-            name_links = []
-            for pos, (idx, row) in enumerate(df_display.iterrows()):
-                if pd.notna(row.get('ticker')):
-                    ticker_code = str(row['ticker']).zfill(6)
-                    name = row['name']
-                    link = f'<a href="https://finance.naver.com/item/fchart.naver?code={ticker_code}" target="_blank">{name}</a>'
-                    name_links.append(link)
-                else:
-                    name_links.append(row['name'])
-
-            df_display['name'] = name_links
-
-        # Ticker 컬럼이 있는 경우 네이버 주식 페이지 링크로 변환
-        if 'ticker' in df_display.columns:
-            df_display['ticker'] = df_display['ticker'].apply(
-                lambda x: f'<a href="https://finance.naver.com/item/main.naver?code={str(x).zfill(6)}" target="_blank">{str(x).zfill(6)}</a>'
-                if pd.notna(x) else x
-            )
-
-        return df_display
-
-    # ===== 엑셀 내보내기 헬퍼 함수 =====
-    def get_excel_download_link(df, filename):
-        """
-        xlsxwriter를 사용하여 HYPERLINK 수식으로 클릭 가능한 링크 생성
-        원본 데이터프레임에서 ticker/name으로 직접 URL 생성
-        """
-        try:
-            from io import BytesIO
-
-            # xlsxwriter 자동 설치
+    # ===== 내보내기 헬퍼 함수 =====
+    def render_export_button(df, file_stem, key):
+        """형식 선택(엑셀/CSV/Parquet) + 파일 만들기/다운로드 버튼 - 누를 때만 변환하고 같은 결과는 한 번만 변환"""
+        formats = available_formats()
+        fmt = st.selectbox(
+            "형식", formats, key=f"{key}_format", label_visibility="collapsed",
+            format_func=lambda f: EXPORT_FORMATS[f][0]
+        )
+        label = EXPORT_FORMATS[fmt][0]
+
+        # 화면을 그릴 때마다(탭 두 개 모두) 엑셀을 만들지 않도록 버튼을 누른 결과만 세션에 보관
+        ready_key = f"{key}_ready"
+        ready = st.session_state.get(ready_key)
+        if ready is None or ready[0] is not df or ready[1] != fmt:
+            if not st.button(f"📦 {label} 파일 만들기", key=f"{key}_build", use_container_width=True):
+                return
             try:
-                import xlsxwriter
-            except ImportError:
-                import subprocess
-                subprocess.check_call(['pip', 'install', 'xlsxwriter', '-q'])
-                import xlsxwriter
-
-            # 원본 데이터프레임 복사
-            df_for_excel = df.copy()
-
-            # Ticker 컬럼: 6자리 zero-pad된 코드로 URL 생성
-            if 'ticker' in df_for_excel.columns:
-                def create_ticker_hyperlink(val):
-                    if pd.isna(val):
-                        return val
-                    ticker_code = str(val).zfill(6)
-                    url = f"https://finance.naver.com/item/main.naver?code={ticker_code}"
-                    return f'=HYPERLINK("{url}", "{ticker_code}")'
-
-                df_for_excel['ticker'] = df_for_excel['ticker'].apply(create_ticker_hyperlink)
-
-            # Name 컬럼: ticker 값을 사용하여 URL 생성
-            if 'name' in df_for_excel.columns and 'ticker' in df_for_excel.columns:
-                # 원본 df의 ticker를 참조하기 위해 먼저 계산
-                original_ticker = df['ticker'].copy().reset_index(drop=True)
-
-                # 반복문에서 위치 인덱스(position) 사용
-                for pos, (idx, row) in enumerate(df_for_excel.iterrows()):
-                    if pd.notna(row.get('name')) and pos < len(original_ticker) and pd.notna(original_ticker.iloc[pos]):
-                        ticker_code = str(original_ticker.iloc[pos]).zfill(6)
-                        url = f"https://finance.naver.com/item/fchart.naver?code={ticker_code}"
-                        df_for_excel.loc[idx, 'name'] = f'=HYPERLINK("{url}", "{row["name"]}")'
-
-            output = BytesIO()
-            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                df_for_excel.to_excel(writer, sheet_name='데이터', index=False)
-
-                # xlsxwriter 포맷 정의
-                workbook = writer.book
-                worksheet = writer.sheets['데이터']
-
-                # Ticker 컬럼: 파란색 폰트
-                ticker_format = workbook.add_format({
-                    'font_color': '#0563C1',  # 파란색
-                    'underline': True,
-                })
-
-                # Name 컬럼: 검은색 Bold
-                name_format = workbook.add_format({
-                    'font_color': '#000000',  # 검은색
-                    'bold': True,
-                })
-
-                # Ticker 컬럼에 포맷 적용
-                if 'ticker' in df_for_excel.columns:
-                    ticker_col_idx = list(df_for_excel.columns).index('ticker')
-                    for row_idx in range(1, len(df_for_excel) + 1):
-                        worksheet.write(row_idx, ticker_col_idx,
-                                      df_for_excel.iloc[row_idx - 1, ticker_col_idx],
-                                      ticker_format)
-
-                # Name 컬럼에 포맷 적용
-                if 'name' in df_for_excel.columns:
-                    name_col_idx = list(df_for_excel.columns).index('name')
-                    for row_idx in range(1, len(df_for_excel) + 1):
-                        worksheet.write(row_idx, name_col_idx,
-                                      df_for_excel.iloc[row_idx - 1, name_col_idx],
-                                      name_format)
-
-            excel_data = output.getvalue()
-            return excel_data
-        except Exception as e:
-            st.error(f"엑셀 생성 실패: {str(e)}")
-            import traceback
-            st.error(traceback.format_exc())
-            return None
+                with st.spinner(f"{label} 파일 생성 중..."):
+                    ready = (df, fmt, export_frame_cached(df, fmt))
+            except Exception as e:
+                st.error(f"{label} 생성 실패: {str(e)}")
+                return
+            st.session_state[ready_key] = ready
+
+        data, ext, mime = ready[2]
+        st.download_button(
+            label=f"📥 {label} 다운로드",
+            data=data,
+            file_name=f"{file_stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{ext}",
+            mime=mime,
+            key=f"{key}_download",
+            use_container_width=True
+        )
 
     tab_data1, tab_data2 = st.tabs(["추천 종목", "급등주"])
 
@@ -1482,23 +1201,10 @@ with tabs[2]:
             # 다운로드 버튼
             col1, col2 = st.columns([4, 1])
             with col2:
-                excel_data = get_excel_download_link(results_df, '추천종목.xlsx')
-                if excel_data:
-                    st.download_button(
-                        label="📥 엑셀 다운로드",
-                        data=excel_data,
-                        file_name=f"추천종목_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        use_container_width=True
-                    )
-
-            # 클릭 가능한 링크가 포함된 테이블
-            display_df = create_clickable_dataframe(results_df, "tab_data1")
-            if display_df is not None:
-                st.markdown(display_df.to_html(escape=False), unsafe_allow_html=True)
-                st.caption(f"총 {len(results_df)}개 종목")
-            else:
-                st.info("표시할 데이터가 없습니다.")
+                render_export_button(results_df, '추천종목', "tab_data1_export")
+
+            # 검색/정렬/페이지 이동이 되는 테이블 (현재 페이지만 전송)
+            render_result_table(results_df, "tab_data1")
         else:
             st.info("데이터가 없습니다. 먼저 분석을 실행해주세요.")
 
@@ -1510,27 +1216,14 @@ with tabs[2]:
             # 다운로드 버튼
             col1, col2 = st.columns([4, 1])
             with col2:
-                excel_data = get_excel_download_link(talib_df, '급등주.xlsx')
-                if excel_data:
-                    st.download_button(
-                        label="📥 엑셀 다운로드",
-                        data=excel_data,
-                        file_name=f"급등주_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        use_container_width=True
-                    )
-
-            # 클릭 가능한 링크가 포함된 테이블
-            display_df = create_clickable_dataframe(talib_df, "tab_data2")
-            if display_df is not None:
-                st.markdown(display_df.to_html(escape=False), unsafe_allow_html=True)
-                st.caption(f"총 {len(talib_df)}개 종목")
-            else:
-                st.info("표시할 데이터가 없습니다.")
+                render_export_button(talib_df, '급등주', "tab_data2_export")
+
+            # 검색/정렬/페이지 이동이 되는 테이블 (현재 페이지만 전송)
+            render_result_table(talib_df, "tab_data2")
         else:
             st.info("데이터가 없습니다. 먼저 분석을 실행해주세요.")
 
-with tabs[3]:
+if active_view == MAIN_VIEWS[3]:
     st.header("ℹ️ 정보")
 
     st.markdown("""
@@ -1620,3 +1313,6 @@ st.markdown("""
     ⚠️ 투자 판단은 본인의 책임입니다. 충분한 검토 후 투자하세요.
 </div>
 """, unsafe_allow_html=True)
+
+# 이번 스크립트 실행 시간 (다음 실행 때 사이드바 보고서에 표시)
+record_timing('app.py 스크립트 실행', time.perf_counter() - _script_started, 'rerun')
@@ -0,0 +1,376 @@
+"""
+헤드리스 배치 스캐너
+
+Streamlit/Plotly 없이 분석기를 실행하고 결과를 공용 캐시(디스크)와 CSV에 저장한다.
+장 시작 전에 cron으로 돌려두면 대시보드는 버튼을 누르자마자 캐시된 결과를 사용한다.
+
+사용 예:
+    python batch_scan.py                                  # 전체 시장 (KOSPI + KOSDAQ + KONEX + ETF), 모든 분석기
+    python batch_scan.py --finders swing talib --workers 16
+    python batch_scan.py --max-stocks 200 --output /data/analysis_data
+    python batch_scan.py --universe kospi                 # KOSPI만
+    python batch_scan.py --universe kospi,kosdaq          # 시장 지정
+    python batch_scan.py --universe my_stocks.csv         # Code, Name (선택: Market) 컬럼이 있는 CSV
+    python batch_scan.py --timings                        # import 시간 보고서 출력
+    python batch_scan.py --refresh-negative-cache         # 캔들 부족/조회 실패 기록을 지우고 전체 종목 다시 조회
+    python batch_scan.py --skip-chart-payloads            # 추천 후보 차트 페이로드 미리 계산 생략
+
+cron 예 (평일 08:00):
+    0 8 * * 1-5 cd /path/to/package && python batch_scan.py >> batch_scan.log 2>&1
+"""
+import argparse
+import os
+import sys
+import time
+
+_import_started = time.perf_counter()
+
+from datetime import datetime
+import pandas as pd
+
+from lazy_import import record_timing, format_startup_report
+from data_sources import MARKETS
+from shared_cache import get_shared_cache, scan_cache_key
+from price_data import prefetch_price_histories
+from price_store import get_price_store
+from chart_payload import get_chart_payload_store, precompute_chart_payloads
+from negative_cache import get_negative_cache
+from progress import ProgressTracker, ConsoleProgressReporter
+from scan_metrics import (
+    StageTimer, ScanRunLog, collect_stage_timings, collect_run_log,
+    append_run_log, build_run_record, ticker_log_path,
+)
+from swing_analyzer import (
+    SWING_HISTORY_DAYS,
+    TALIB_HISTORY_DAYS,
+    SIGNAL_HISTORY_DAYS,
+    LONG_MA_HISTORY_DAYS,
+    ICHIMOKU_SCREEN_DAYS,
+    SwingTradeAnalyzer,
+    TalibPatternFinder,
+    SoaringSignalFinder,
+    ReverseMAAlignmentFinder,
+    universe_markets,
+    filter_swing_candidates,
+    tagged_filename,
+)
+
+record_timing('batch_scan.py 모듈 import', time.perf_counter() - _import_started, 'startup')
+
+# 분석기별 가격 데이터 조회 기간 (미리 조회할 때 가장 긴 기간 하나로 캐시를 채움)
+FINDER_HISTORY_DAYS = {
+    'swing': SWING_HISTORY_DAYS,
+    'talib': TALIB_HISTORY_DAYS,
+    'signals': SIGNAL_HISTORY_DAYS,
+    'reverse-ma': LONG_MA_HISTORY_DAYS,
+    'ichimoku': ICHIMOKU_SCREEN_DAYS,
+    'low-trend': SIGNAL_HISTORY_DAYS,
+}
+
+FINDER_NAMES = list(FINDER_HISTORY_DAYS.keys())
+
+# 기본 스캔 대상 (대시보드/스캔 서비스 기본값과 같아야 cron 결과가 그대로 캐시 적중)
+DEFAULT_UNIVERSE = 'all'
+
+
+def parse_markets(universe):
+    """'all' 또는 쉼표로 구분한 시장 이름 → MARKETS 순서의 시장 튜플 (시장 지정이 아니면 None)"""
+    if universe.lower() == 'all':
+        return MARKETS
+    markets = {part.strip().upper() for part in universe.split(',')}
+    if markets <= set(MARKETS):
+        return tuple(market for market in MARKETS if market in markets)
+    return None
+
+
+def load_universe(universe, max_stocks=None, data_dir="analysis_data"):
+    """
+    스캔 대상 종목 목록 (Code, Name, Market)
+
+    universe: 'kospi', 'all', 'kospi,kosdaq' 같은 시장 목록 또는 CSV 파일 경로
+    """
+    markets = parse_markets(universe)
+    if markets is not None:
+        stocks = SwingTradeAnalyzer(data_dir=data_dir).get_market_stocks(markets)
+    else:
+        stocks = pd.read_csv(universe, dtype={'Code': str})
+        if 'Code' not in stocks.columns or 'Name' not in stocks.columns:
+            raise ValueError(f"종목 파일에 Code, Name 컬럼이 필요합니다: {universe}")
+        stocks['Code'] = stocks['Code'].astype(str).str.zfill(6)
+
+    if max_stocks:
+        stocks = stocks.head(max_stocks)
+    columns = ['Code', 'Name', 'Market'] if 'Market' in stocks.columns else ['Code', 'Name']
+    return stocks[columns].reset_index(drop=True)
+
+
+def scan_key(scan_name, universe, max_stocks):
+    """대시보드/스캔 서비스와 같은 공용 캐시 키 (시장 목록은 순서/대소문자와 관계없이 같은 키)"""
+    markets = parse_markets(universe)
+    if markets is not None:
+        return scan_cache_key(scan_name, max_stocks=max_stocks, universe=','.join(markets))
+    return scan_cache_key(scan_name, max_stocks=max_stocks, universe=os.path.abspath(universe))
+
+
+def universe_tag(universe, max_stocks=None):
+    """
+    결과 CSV 이름에 넣는 스캔 대상 표시 (다른 대상/종목 수로 스캔한 결과가 같은 날 파일을 덮어쓰지 않도록)
+
+    예: 'all', 'kospi-kosdaq', 'all-top50', 'file-my_stocks' (CSV 종목 파일)
+    """
+    markets = parse_markets(universe)
+    if markets == MARKETS:
+        tag = 'all'
+    elif markets is not None:
+        tag = '-'.join(market.lower() for market in markets)
+    else:
+        tag = 'file-' + os.path.splitext(os.path.basename(universe))[0]
+    if max_stocks:
+        tag += f"-top{max_stocks}"
+    return tag
+
+
+def _tracker(label):
+    """콘솔로 집계된 진행 상황을 출력하는 ProgressTracker"""
+    return ProgressTracker(listeners=[ConsoleProgressReporter(label)])
+
+
+def run_swing(stocks, data_dir, progress_callback=None, tag=None):
+    analyzer = SwingTradeAnalyzer(data_dir=data_dir)
+    tracker = progress_callback or _tracker("스윙매매 분석")
+    results = analyzer.analyze_all_stocks(stocks=stocks, progress_callback=tracker)
+    if not results.empty:
+        analyzer.save_analysis_results(results, tag=tag)
+    return results
+
+
+def run_talib(stocks, data_dir, progress_callback=None, tag=None):
+    finder = TalibPatternFinder(data_dir=data_dir)
+    tracker = progress_callback or _tracker("TA-Lib 패턴 스캔")
+    results = finder.find_patterns_in_week(stocks, progress_callback=tracker)
+    if not results.empty:
+        finder.save_talib_week_patterns(results, tag=tag)
+    return results
+
+
+def run_signals(stocks, data_dir, progress_callback=None, tag=None):
+    finder = SoaringSignalFinder(data_dir=data_dir)
+    tracker = progress_callback or _tracker("급등신호 분석")
+    results = finder.find_soaring_signals(stocks, progress_callback=tracker)
+    if not results.empty:
+        save_scan_csv(results, 'soaring_signals', data_dir, tag=tag)
+    return results
+
+
+def run_reverse_ma(stocks, data_dir, progress_callback=None, tag=None):
+    finder = ReverseMAAlignmentFinder(data_dir=data_dir)
+    tracker = progress_callback or _tracker("역매공파 분석")
+    results = finder.find_reverse_ma_patterns(stocks, progress_callback=tracker)
+    if not results.empty:
+        save_scan_csv(results, 'reverse_ma', data_dir, tag=tag)
+    return results
+
+
+def run_ichimoku(stocks, data_dir, progress_callback=None, tag=None):
+    finder = ReverseMAAlignmentFinder(data_dir=data_dir)
+    tracker = progress_callback or _tracker("파란점선 스크리닝")
+    results = finder.screen_ichimoku_clouds(stocks, progress_callback=tracker)
+    if not results.empty:
+        save_scan_csv(results, 'ichimoku_cloud', data_dir, tag=tag)
+    return results
+
+
+def run_low_trend(stocks, data_dir, progress_callback=None, tag=None):
+    finder = SoaringSignalFinder(data_dir=data_dir)
+    tracker = progress_callback or _tracker("저점 추세 스크리닝")
+    results = finder.screen_rising_lows(stocks, progress_callback=tracker)
+    if not results.empty:
+        save_scan_csv(results, 'low_trend', data_dir, tag=tag)
+    return results
+
+
+def format_ticker_summary(summary):
+    """종목별 실행 로그 요약 한 줄 (상태별 건수, 실패가 많은 단계/예외, 재시도 대기 시간)"""
+    if not summary['tickers']:
+        return "종목 기록 없음"
+    status = ", ".join(f"{key} {count}" for key, count in sorted(summary['status'].items(), key=lambda x: -x[1]))
+    parts = [status]
+    if summary['exception']:
+        top = sorted(summary['exception'].items(), key=lambda x: -x[1])[:3]
+        parts.append("예외 " + ", ".join(f"{key} {count}" for key, count in top))
+    if summary['retries']:
+        parts.append(f"재시도 {summary['retries']}회 (대기 {summary['retry_wait_seconds']:.1f}초)")
+    return " | ".join(parts)
+
+
+def save_scan_csv(results, scan_name, data_dir, date=None, tag=None):
+    """전용 저장 함수가 없는 분석기 결과를 {scan_name}_{tag}_YYYY-MM-DD.csv로 저장 (tag: universe_tag)"""
+    if date is None:
+        date = datetime.now().strftime("%Y-%m-%d")
+    filepath = os.path.join(data_dir, tagged_filename(scan_name, date, tag))
+    results.to_csv(filepath, index=False, encoding='utf-8-sig')
+    return filepath
+
+
+def load_scan_csv(scan_name, data_dir, date=None, tag=None):
+    """save_scan_csv로 저장한 결과 로드 (없으면 None)"""
+    if date is None:
+        date = datetime.now().strftime("%Y-%m-%d")
+    filepath = os.path.join(data_dir, tagged_filename(scan_name, date, tag))
+    if not os.path.exists(filepath):
+        return None
+    return pd.read_csv(filepath, dtype={'ticker': str})
+
+
+# 분석기 이름 -> (공용 캐시 스캔 이름, 실행 함수 run(stocks, data_dir, progress_callback, tag))
+FINDERS = {
+    'swing': ('swing', run_swing),
+    'talib': ('talib_patterns', run_talib),
+    'signals': ('soaring_signals', run_signals),
+    'reverse-ma': ('reverse_ma', run_reverse_ma),
+    'ichimoku': ('ichimoku_cloud', run_ichimoku),
+    'low-trend': ('low_trend', run_low_trend),
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="스윙매매 분석기 헤드리스 배치 스캔")
+    parser.add_argument(
+        '--finders', nargs='+', choices=FINDER_NAMES, default=FINDER_NAMES,
+        help="실행할 분석기 (기본: 전체)"
+    )
+    parser.add_argument(
+        '--universe', default=DEFAULT_UNIVERSE,
+        help="스캔 대상: 'all' (기본, KOSPI/KOSDAQ/KONEX/ETF), 'kospi,kosdaq' 같은 시장 목록 "
+             "또는 Code, Name 컬럼이 있는 CSV 파일 경로"
+    )
+    parser.add_argument(
+        '--max-stocks', type=int, default=None,
+        help="스캔할 최대 종목 수 (기본: 전체)"
+    )
+    parser.add_argument(
+        '--workers', type=int, default=8,
+        help="가격 데이터 병렬 조회 스레드 수 (기본: 8)"
+    )
+    parser.add_argument(
+        '--output', default='analysis_data',
+        help="결과/공용 캐시 저장 디렉토리 (기본: analysis_data, 대시보드와 같은 위치)"
+    )
+    parser.add_argument(
+        '--refresh-negative-cache', action='store_true',
+        help="캔들 부족/가격 소스 실패로 건너뛰던 종목 기록을 지우고 전체 종목을 다시 조회"
+    )
+    parser.add_argument(
+        '--skip-chart-payloads', action='store_true',
+        help="스윙 추천 후보의 차트 페이로드(지표/패턴/일목균형표) 미리 계산 생략"
+    )
+    parser.add_argument(
+        '--timings', action='store_true',
+        help="종료 시 모듈 import/지연 import 시간 보고서 출력"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    started = time.time()
+
+    # 공용 캐시/가격 저장소 위치는 첫 호출에서 정해지므로 가장 먼저 초기화
+    shared_cache = get_shared_cache(args.output)
+    get_price_store(args.output)
+    get_chart_payload_store(args.output)
+
+    print(f"🚀 배치 스캔 시작: {', '.join(args.finders)} ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')})")
+    stocks = load_universe(args.universe, args.max_stocks, data_dir=args.output)
+    if stocks.empty:
+        print("❌ 스캔할 종목이 없습니다.")
+        return 1
+    if 'Market' in stocks.columns:
+        counts = ", ".join(f"{market} {count}" for market, count in stocks['Market'].value_counts(sort=False).items())
+        print(f"✓ 대상 종목 {len(stocks)}개 ({counts})")
+    else:
+        print(f"✓ 대상 종목 {len(stocks)}개")
+
+    negative_cache = get_negative_cache(args.output)
+    if args.refresh_negative_cache:
+        negative_cache.clear()
+        negative_cache.save()
+        print("✓ 네거티브 캐시 초기화")
+    else:
+        negative_cache.prune()
+
+    # 가격 데이터를 병렬로 미리 조회 - 이후 분석기들은 캐시에서 바로 읽음
+    # (시장 스냅샷으로 저장소를 먼저 갱신하고, 모든 분석기가 건너뛸 종목은 조회하지 않음)
+    history_days = max(FINDER_HISTORY_DAYS[name] for name in args.finders)
+    prefetch_codes = [
+        code for code in stocks['Code']
+        if not all(negative_cache.lookup(name, code) for name in args.finders)
+    ]
+    log_dir = os.path.join(args.output, "run_logs")
+    prefetch_started = datetime.now()
+    prefetch_timer = StageTimer()
+    with collect_stage_timings(prefetch_timer):
+        fetched = prefetch_price_histories(prefetch_codes, history_days, workers=args.workers,
+                                           markets=universe_markets(stocks))
+    prefetch_elapsed = (datetime.now() - prefetch_started).total_seconds()
+    prefetch_stages = prefetch_timer.summary()
+    append_run_log(build_run_record(
+        "batch prefetch", prefetch_started, datetime.now(),
+        {'elapsed_seconds': prefetch_elapsed, 'processed': len(prefetch_codes), 'total': len(prefetch_codes),
+         'succeeded': fetched, 'failed': len(prefetch_codes) - fetched, 'found': fetched},
+        prefetch_stages, status='done', history_days=history_days, workers=args.workers
+    ), log_dir=log_dir)
+    top_stages = "".join(f", {stage} {summary['total']:.1f}초" for stage, summary in list(prefetch_stages.items())[:3])
+    print(f"✓ 가격 데이터 {fetched}/{len(prefetch_codes)}개 조회 ({prefetch_elapsed:.1f}초, {args.workers} 스레드{top_stages})")
+
+    failures = 0
+    swing_results = None
+    result_tag = universe_tag(args.universe, args.max_stocks)
+    for name in args.finders:
+        scan_name, run = FINDERS[name]
+        finder_started = datetime.now()
+        stage_timer = StageTimer()
+        run_log = ScanRunLog()
+        tracker = _tracker(name)
+        error = None
+        results = None
+        try:
+            with collect_stage_timings(stage_timer), collect_run_log(run_log):
+                results = run(stocks, args.output, progress_callback=tracker, tag=result_tag)
+            shared_cache.set(scan_key(scan_name, args.universe, args.max_stocks), results, persist=True)
+        except Exception as e:
+            failures += 1
+            error = f"{type(e).__name__}: {str(e)}"
+            print(f"❌ {name} 실패: {error}")
+
+        stages = stage_timer.summary()
+        ticker_summary = run_log.summary()
+        append_run_log(build_run_record(
+            f"batch {name}", finder_started, datetime.now(), tracker.flush(), stages,
+            status='failed' if error else 'done', error=error,
+            tickers=ticker_summary, ticker_log=run_log.write(ticker_log_path(log_dir, name, finder_started))
+        ), log_dir=log_dir)
+
+        if results is not None:
+            elapsed = (datetime.now() - finder_started).total_seconds()
+            top_stages = "".join(f", {stage} {summary['total']:.1f}초" for stage, summary in list(stages.items())[:3])
+            print(f"✓ {name}: {len(results)}개 결과 ({elapsed:.1f}초{top_stages})")
+            print(f"  {format_ticker_summary(ticker_summary)}")
+            if name == 'swing':
+                swing_results = results
+
+    # 추천 후보(점수 필터 0점 기준) 차트를 기간별로 미리 계산 - 대시보드 차트 화면은 캐시만 읽음
+    if swing_results is not None and not swing_results.empty and not args.skip_chart_payloads:
+        candidates = filter_swing_candidates(swing_results, min_score=0)['ticker'].tolist()
+        payload_started = time.time()
+        prepared = precompute_chart_payloads(candidates, workers=args.workers)
+        print(f"✓ 차트 페이로드 {prepared}/{len(candidates)}개 종목 준비 ({time.time() - payload_started:.1f}초)")
+
+    print(f"🏁 배치 스캔 완료 ({time.time() - started:.1f}초)")
+    if args.timings:
+        print(format_startup_report())
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
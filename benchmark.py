@@ -0,0 +1,264 @@
+"""
+분석기 벤치마크
+
+합성 시장(SyntheticMarket)을 가격 소스로 연결해서 네트워크 없이 각 분석기의
+처리량(종목/초), 최대 메모리, 단계별 시간을 측정하고 저장된 기준값(baseline)과 비교한다.
+
+사용 예:
+    python benchmark.py                                   # 200종목 x 500일, 전체 분석기
+    python benchmark.py --tickers 500 --finders swing talib
+    python benchmark.py --save-baseline                   # 현재 결과를 기준값으로 저장
+    python benchmark.py --max-regression 15               # 기준 대비 15% 이상 느려지면 종료 코드 1
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+from price_data import set_price_source
+from negative_cache import get_negative_cache
+from shared_cache import get_shared_cache
+from synthetic_market import SyntheticMarket
+from swing_analyzer import (
+    SwingTradeAnalyzer,
+    TalibPatternFinder,
+    SoaringSignalFinder,
+    ReverseMAAlignmentFinder,
+)
+
+DEFAULT_BASELINE = os.path.join("analysis_data", "benchmark_baseline.json")
+
+# 분석기별 벤치마크 설정
+#   mode: per_ticker면 method(ticker, name)를 종목마다 호출, universe면 method(stocks)를 한 번 호출
+#   stages: 시간을 따로 집계할 인스턴스 메서드 (나머지는 'other'로 집계)
+FINDER_BENCHMARKS = {
+    'swing': {
+        'factory': SwingTradeAnalyzer,
+        'mode': 'per_ticker',
+        'method': 'analyze_stock',
+        'stages': ['get_stock_data', 'calculate_indicators', 'is_uptrend', 'check_golden_cross',
+                   'check_rsi_condition', 'check_macd_bullish', 'calculate_volatility_score',
+                   'calculate_volume_score'],
+    },
+    'talib': {
+        'factory': TalibPatternFinder,
+        'mode': 'universe',
+        'method': 'find_patterns_in_week',
+        'stages': ['get_stock_data_long'],
+    },
+    'signals': {
+        'factory': SoaringSignalFinder,
+        'mode': 'per_ticker',
+        'method': 'analyze_soaring_signal',
+        'stages': ['get_stock_data', 'calculate_moving_averages', 'check_ma_alignment',
+                   'check_volume_signal', 'check_candlestick_signal', 'check_support_breakout'],
+    },
+    'reverse-ma': {
+        'factory': ReverseMAAlignmentFinder,
+        'mode': 'per_ticker',
+        'method': 'analyze_reverse_ma_pattern',
+        'stages': ['get_stock_data', 'calculate_all_moving_averages', 'check_long_term_reverse_alignment',
+                   'check_short_term_alignment', 'check_ma112_crossover_path', 'check_support_line',
+                   'check_ichimoku_cloud'],
+    },
+}
+
+
+def _instrument(obj, stage_names, timings):
+    """인스턴스 메서드를 시간 측정 래퍼로 교체 (중첩 호출은 바깥 단계에만 집계)"""
+    active = []
+
+    def wrap(name, method):
+        def timed_method(*args, **kwargs):
+            if active:
+                return method(*args, **kwargs)
+            active.append(name)
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                timings[name] += time.perf_counter() - started
+                active.pop()
+        return timed_method
+
+    for name in stage_names:
+        setattr(obj, name, wrap(name, getattr(obj, name)))
+
+
+def _run_finder(name, market, data_dir):
+    """분석기 하나 실행 → (결과 목록 또는 DataFrame, 전체 시간, 단계별 시간)"""
+    config = FINDER_BENCHMARKS[name]
+    finder = config['factory'](data_dir=data_dir)
+    timings = defaultdict(float)
+    _instrument(finder, config['stages'], timings)
+    method = getattr(finder, config['method'])
+
+    # 가격 캐시/네거티브 캐시를 비워서 매 분석기가 같은 조건(가격 조회 포함)에서 측정되도록 함
+    get_shared_cache().invalidate()
+    get_negative_cache(data_dir).clear()
+
+    started = time.perf_counter()
+    if config['mode'] == 'universe':
+        results = method(market.stocks)
+    else:
+        results = [method(ticker, stock_name) for ticker, stock_name in zip(market.stocks['Code'], market.stocks['Name'])]
+    elapsed = time.perf_counter() - started
+
+    timings['other'] = max(0.0, elapsed - sum(timings.values()))
+    return results, elapsed, dict(timings)
+
+
+def _checks(name, results, market):
+    """심어 둔 패턴을 분석기가 찾았는지 확인 (정확도가 바뀌지 않았는지 보는 용도)"""
+    planted = market.planted_events()
+    if name == 'talib' and isinstance(results, pd.DataFrame) and not results.empty:
+        found = set(zip(results['ticker'], results['pattern_date']))
+        checks = {}
+        for pattern, label in (('morning_star', 'morning_star_recall'), ('breakaway', 'breakaway_recall')):
+            events = planted[planted['pattern'] == pattern]
+            hits = sum((t, d.strftime('%Y-%m-%d')) in found for t, d in zip(events['ticker'], events['date']))
+            checks[label] = round(hits / len(events), 3) if len(events) else None
+        return checks
+    if name == 'swing':
+        crosses = set(planted.loc[planted['pattern'] == 'golden_cross', 'ticker'])
+        hits = sum(1 for r in results if r is not None and r['ticker'] in crosses and r['golden_cross'])
+        return {'golden_cross_recall': round(hits / len(crosses), 3) if crosses else None}
+    return {}
+
+
+def run_benchmark(finders, n_tickers=200, n_days=500, seed=42, measure_memory=True):
+    """벤치마크 실행 → 결과 dict (JSON 저장 가능)"""
+    generate_started = time.perf_counter()
+    market = SyntheticMarket(n_tickers=n_tickers, n_days=n_days, seed=seed)
+    generate_seconds = time.perf_counter() - generate_started
+    set_price_source(market.source, 'synthetic')
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'tickers': n_tickers,
+            'days': n_days,
+            'seed': seed,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'generate_seconds': round(generate_seconds, 3),
+        },
+        'finders': {},
+    }
+
+    try:
+        with tempfile.TemporaryDirectory() as data_dir:
+            for name in finders:
+                results, elapsed, stages = _run_finder(name, market, data_dir)
+                found = len(results) if isinstance(results, pd.DataFrame) else sum(r is not None for r in results)
+                entry = {
+                    'seconds': round(elapsed, 4),
+                    'tickers_per_sec': round(n_tickers / elapsed, 2) if elapsed > 0 else None,
+                    'found': int(found),
+                    'stages': {stage: round(seconds, 4) for stage, seconds in sorted(stages.items(), key=lambda x: -x[1])},
+                    'checks': _checks(name, results, market),
+                }
+
+                # 메모리는 tracemalloc 오버헤드가 시간 측정에 섞이지 않도록 별도 실행에서 측정
+                if measure_memory:
+                    tracemalloc.start()
+                    try:
+                        _run_finder(name, market, data_dir)
+                        entry['peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 2)
+                    finally:
+                        tracemalloc.stop()
+
+                report['finders'][name] = entry
+    finally:
+        set_price_source(None)
+        get_shared_cache().invalidate()
+
+    return report
+
+
+def compare_reports(current, baseline):
+    """기준값 대비 변화율 [(분석기, 지표, 기준, 현재, 변화율%)] (처리량은 +가 개선, 메모리는 -가 개선)"""
+    rows = []
+    for name, entry in current['finders'].items():
+        base = baseline.get('finders', {}).get(name)
+        if not base:
+            continue
+        for metric in ('tickers_per_sec', 'peak_mb'):
+            old, new = base.get(metric), entry.get(metric)
+            if old and new is not None:
+                rows.append((name, metric, old, new, (new - old) / old * 100))
+    return rows
+
+
+def format_report(report, comparison=None):
+    """콘솔 출력용 요약"""
+    meta = report['meta']
+    lines = [f"📊 벤치마크: {meta['tickers']}종목 x {meta['days']}일 (seed={meta['seed']}, 생성 {meta['generate_seconds']}초)"]
+    for name, entry in report['finders'].items():
+        peak = f", 최대 메모리 {entry['peak_mb']}MB" if 'peak_mb' in entry else ""
+        lines.append(f"\n▶ {name}: {entry['tickers_per_sec']}종목/초 ({entry['seconds']}초, 결과 {entry['found']}개{peak})")
+        for stage, seconds in entry['stages'].items():
+            share = seconds / entry['seconds'] * 100 if entry['seconds'] else 0
+            lines.append(f"    {stage:<36} {seconds:8.3f}초 ({share:4.1f}%)")
+        for check, value in entry['checks'].items():
+            lines.append(f"    ✓ {check}: {value}")
+
+    if comparison:
+        lines.append("\n📈 기준값 대비")
+        for name, metric, old, new, change in comparison:
+            lines.append(f"    {name:<12} {metric:<16} {old:>10} → {new:<10} ({change:+.1f}%)")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="합성 데이터 기반 분석기 벤치마크")
+    parser.add_argument('--finders', nargs='+', choices=list(FINDER_BENCHMARKS), default=list(FINDER_BENCHMARKS))
+    parser.add_argument('--tickers', type=int, default=200, help="합성 종목 수 (기본: 200)")
+    parser.add_argument('--days', type=int, default=500, help="종목당 거래일 수 (기본: 500)")
+    parser.add_argument('--seed', type=int, default=42, help="난수 시드 (기본: 42)")
+    parser.add_argument('--no-memory', action='store_true', help="최대 메모리 측정 생략 (실행 시간 절반)")
+    parser.add_argument('--output', help="결과 JSON 저장 경로")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help=f"기준값 JSON 경로 (기본: {DEFAULT_BASELINE})")
+    parser.add_argument('--save-baseline', action='store_true', help="이번 결과를 기준값으로 저장")
+    parser.add_argument('--max-regression', type=float, help="처리량이 기준 대비 이 비율(%%) 이상 떨어지면 종료 코드 1")
+    args = parser.parse_args(argv)
+
+    finders = args.finders
+
+    report = run_benchmark(finders, args.tickers, args.days, args.seed, measure_memory=not args.no_memory)
+
+    comparison = None
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            comparison = compare_reports(report, json.load(f))
+
+    print(format_report(report, comparison))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or '.', exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n✓ 기준값 저장: {args.baseline}")
+
+    if args.max_regression is not None and comparison:
+        regressions = [row for row in comparison if row[1] == 'tickers_per_sec' and row[4] < -args.max_regression]
+        if regressions:
+            print(f"\n❌ 처리량 {args.max_regression}% 이상 저하: {', '.join(row[0] for row in regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
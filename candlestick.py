@@ -0,0 +1,381 @@
+"""
+NumPy 캔들스틱 패턴 엔진 (TA-Lib 없이 동작)
+
+TA-Lib CDL 함수와 같은 기본 캔들 설정(TA_CandleDefaultSettings)과 같은 판정식을 배열 연산으로 옮겼다.
+입력은 1차원(종목 하나의 전체 이력) 또는 2차원(종목 x 거래일 패널, 마지막 축이 시간)이며
+반환값도 TA-Lib과 같은 정수 배열(100 / -100 / 80 / -80 / 0)이다.
+패널에서 상장 전 구간처럼 NaN으로 채운 칸은 TA-Lib을 결측 없는 구간에만 돌린 것과 같은 결과가 되도록
+lookback 구간에 NaN이 하나라도 있으면 0으로 둔다.
+
+TA-Lib이 설치된 환경에서는 `python candlestick.py`로 합성/무작위 데이터에 대해 TA-Lib 결과와 비교한다.
+"""
+import numpy as np
+
+# 캔들 평균 범위 종류
+RANGE_REAL_BODY = 'RealBody'
+RANGE_HIGH_LOW = 'HighLow'
+RANGE_SHADOWS = 'Shadows'
+
+# TA-Lib 기본 캔들 설정: (범위 종류, 평균 기간, 배수)
+CANDLE_SETTINGS = {
+    'BodyLong': (RANGE_REAL_BODY, 10, 1.0),
+    'BodyVeryLong': (RANGE_REAL_BODY, 10, 3.0),
+    'BodyShort': (RANGE_REAL_BODY, 10, 1.0),
+    'BodyDoji': (RANGE_HIGH_LOW, 10, 0.1),
+    'ShadowLong': (RANGE_REAL_BODY, 0, 1.0),
+    'ShadowVeryLong': (RANGE_REAL_BODY, 0, 2.0),
+    'ShadowShort': (RANGE_SHADOWS, 10, 1.0),
+    'ShadowVeryShort': (RANGE_HIGH_LOW, 10, 0.1),
+    'Near': (RANGE_HIGH_LOW, 5, 0.2),
+    'Far': (RANGE_HIGH_LOW, 5, 0.6),
+    'Equal': (RANGE_HIGH_LOW, 5, 0.05),
+}
+
+
+class _Candles:
+    """OHLC 배열과 자주 쓰는 캔들 값 (몸통/그림자/색상), 평균은 설정별로 한 번만 계산"""
+
+    def __init__(self, open_, high, low, close):
+        self.open = np.asarray(open_, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.n = self.close.shape[-1]
+        self.body_top = np.maximum(self.open, self.close)
+        self.body_bottom = np.minimum(self.open, self.close)
+        self.real_body = np.abs(self.close - self.open)
+        self.upper_shadow = self.high - self.body_top
+        self.lower_shadow = self.body_bottom - self.low
+        # TA_CANDLECOLOR: 종가 >= 시가면 양봉(1), 아니면 음봉(-1)
+        self.color = np.where(self.close >= self.open, 1, -1)
+        self._invalid = np.concatenate([
+            np.zeros(self.close.shape[:-1] + (1,), dtype=np.int64),
+            np.cumsum(np.isnan(self.open + self.high + self.low + self.close), axis=-1),
+        ], axis=-1)
+        self._averages = {}
+
+    def range_of(self, range_type):
+        """TA_CANDLERANGE"""
+        if range_type == RANGE_REAL_BODY:
+            return self.real_body
+        if range_type == RANGE_HIGH_LOW:
+            return self.high - self.low
+        return self.upper_shadow + self.lower_shadow
+
+    def average(self, setting):
+        """
+        캔들마다 TA_CANDLEAVERAGE 값 (직전 평균 기간 캔들의 범위 평균 x 배수)
+
+        평균 기간이 0이면 그 캔들 자신의 범위를 쓴다.
+        """
+        if setting in self._averages:
+            return self._averages[setting]
+        range_type, period, factor = CANDLE_SETTINGS[setting]
+        values = self.range_of(range_type)
+        if period:
+            # 각 위치 j의 [j-period, j) 합 (결측 칸은 0으로 더하고, 결측이 걸친 위치는 valid에서 걸러짐)
+            totals = np.concatenate([
+                np.zeros(values.shape[:-1] + (1,)),
+                np.cumsum(np.nan_to_num(values), axis=-1),
+            ], axis=-1)
+            window = np.full(values.shape, np.nan)
+            window[..., period:] = totals[..., period:-1] - totals[..., :-period - 1]
+            base = window / period
+        else:
+            base = values
+        average = factor * base / (2.0 if range_type == RANGE_SHADOWS else 1.0)
+        self._averages[setting] = average
+        return average
+
+    def window(self, lookback):
+        """
+        lookback 이후 위치들에 대해 k봉 전 값을 꺼내는 함수 at(values, k) (복사 없이 슬라이스)
+
+        at(values, 0)[..., t]는 위치 lookback + t의 값, at(values, k)는 그 k봉 전 값이다.
+        """
+        n = self.n
+
+        def at(values, k=0):
+            return values[..., lookback - k:n - k]
+        return at
+
+    def result(self, condition, value, lookback):
+        """
+        lookback 이후 위치의 판정 결과를 전체 길이 int32 배열로 (앞쪽과 결측 구간은 0)
+
+        condition/value는 window(lookback)로 꺼낸 위치 기준 배열 (value는 스칼라도 가능)
+        """
+        out = np.zeros(self.close.shape, dtype=np.int32)
+        if self.n > lookback:
+            # [i-lookback, i] 구간에 결측이 없는 위치만
+            complete = (self._invalid[..., lookback + 1:] - self._invalid[..., :self.n - lookback]) == 0
+            out[..., lookback:] = np.where(condition & complete, value, 0)
+        return out
+
+
+def _lookback(*settings, extra):
+    """TA-Lib lookback: 사용하는 설정 중 가장 긴 평균 기간 + 패턴 캔들 수 - 1"""
+    return max(CANDLE_SETTINGS[name][1] for name in settings) + extra
+
+
+def cdl_morningstar(open_, high, low, close, penetration=0.3):
+    """Morning Star (아침별): 긴 음봉 → 아래로 갭이 난 짧은 봉 → 첫 봉 몸통 안까지 올라온 양봉 (100)"""
+    return _morningstar(_Candles(open_, high, low, close), penetration)
+
+
+def _morningstar(c, penetration=0.3):
+    lookback = _lookback('BodyShort', 'BodyLong', extra=2)
+    at = c.window(lookback)
+    rb = c.real_body
+    body_long = c.average('BodyLong')
+    body_short = c.average('BodyShort')
+    with np.errstate(invalid='ignore'):
+        condition = (
+            (at(rb, 2) > at(body_long, 2))
+            & (at(c.color, 2) == -1)
+            & (at(rb, 1) <= at(body_short, 1))
+            & (at(c.body_top, 1) < at(c.body_bottom, 2))
+            & (at(rb) > at(body_short))
+            & (at(c.color) == 1)
+            & (at(c.close) > at(c.close, 2) + at(rb, 2) * penetration)
+        )
+    return c.result(condition, 100, lookback)
+
+
+def cdl_breakaway(open_, high, low, close):
+    """Breakaway (이탈): 긴 첫 봉에서 갭 → 같은 방향 세 봉 → 반대 색 다섯째 봉이 갭 안에서 마감 (색상 x 100)"""
+    return _breakaway(_Candles(open_, high, low, close))
+
+
+def _breakaway(c):
+    lookback = _lookback('BodyLong', extra=4)
+    at = c.window(lookback)
+    h, l, cl = c.high, c.low, c.close
+    color4, color3, color1, color = at(c.color, 4), at(c.color, 3), at(c.color, 1), at(c.color)
+    with np.errstate(invalid='ignore'):
+        bearish_start = (
+            (color4 == -1)
+            & (at(c.body_top, 3) < at(c.body_bottom, 4))
+            & (at(h, 2) < at(h, 3)) & (at(l, 2) < at(l, 3))
+            & (at(h, 1) < at(h, 2)) & (at(l, 1) < at(l, 2))
+            & (at(cl) > at(c.open, 3)) & (at(cl) < at(cl, 4))
+        )
+        bullish_start = (
+            (color4 == 1)
+            & (at(c.body_bottom, 3) > at(c.body_top, 4))
+            & (at(h, 2) > at(h, 3)) & (at(l, 2) > at(l, 3))
+            & (at(h, 1) > at(h, 2)) & (at(l, 1) > at(l, 2))
+            & (at(cl) < at(c.open, 3)) & (at(cl) > at(cl, 4))
+        )
+        condition = (
+            (at(c.real_body, 4) > at(c.average('BodyLong'), 4))
+            & (color4 == color3) & (color3 == color1) & (color1 == -color)
+            & (bearish_start | bullish_start)
+        )
+    return c.result(condition, color * 100, lookback)
+
+
+def cdl_engulfing(open_, high, low, close):
+    """Engulfing (장악형): 반대 색 직전 몸통을 감싸는 봉 (색상 x 100, 시가/종가 한쪽이 같으면 색상 x 80)"""
+    return _engulfing(_Candles(open_, high, low, close))
+
+
+def _engulfing(c):
+    lookback = 2
+    at = c.window(lookback)
+    o, cl, color = at(c.open), at(c.close), at(c.color)
+    o1, cl1, color1 = at(c.open, 1), at(c.close, 1), at(c.color, 1)
+    with np.errstate(invalid='ignore'):
+        white_engulfs = (color == 1) & (color1 == -1) & (
+            ((cl >= o1) & (o < cl1)) | ((cl > o1) & (o <= cl1))
+        )
+        black_engulfs = (color == -1) & (color1 == 1) & (
+            ((o >= cl1) & (cl < o1)) | ((o > cl1) & (cl <= o1))
+        )
+        strict = (o != cl1) & (cl != o1)
+    return c.result(white_engulfs | black_engulfs, np.where(strict, color * 100, color * 80), lookback)
+
+
+def cdl_piercing(open_, high, low, close):
+    """Piercing (관통형): 긴 음봉 아래에서 시작해 몸통 절반 위로 마감한 긴 양봉 (100)"""
+    return _piercing(_Candles(open_, high, low, close))
+
+
+def _piercing(c):
+    lookback = _lookback('BodyLong', extra=1)
+    at = c.window(lookback)
+    rb = c.real_body
+    body_long = c.average('BodyLong')
+    with np.errstate(invalid='ignore'):
+        condition = (
+            (at(c.color, 1) == -1)
+            & (at(rb, 1) > at(body_long, 1))
+            & (at(c.color) == 1)
+            & (at(rb) > at(body_long))
+            & (at(c.open) < at(c.low, 1))
+            & (at(c.close) < at(c.open, 1))
+            & (at(c.close) > at(c.close, 1) + at(rb, 1) * 0.5)
+        )
+    return c.result(condition, 100, lookback)
+
+
+def cdl_3whitesoldiers(open_, high, low, close):
+    """Three White Soldiers (적삼병): 위꼬리가 짧은 양봉 셋이 앞 몸통 안/근처에서 시작해 계속 높게 마감 (100)"""
+    return _3whitesoldiers(_Candles(open_, high, low, close))
+
+
+def _3whitesoldiers(c):
+    lookback = _lookback('ShadowVeryShort', 'BodyShort', 'Far', 'Near', extra=2)
+    at = c.window(lookback)
+    o, cl, rb, color, upper = c.open, c.close, c.real_body, c.color, c.upper_shadow
+    very_short = c.average('ShadowVeryShort')
+    near = c.average('Near')
+    far = c.average('Far')
+    with np.errstate(invalid='ignore'):
+        condition = (
+            (at(color, 2) == 1) & (at(upper, 2) < at(very_short, 2))
+            & (at(color, 1) == 1) & (at(upper, 1) < at(very_short, 1))
+            & (at(color) == 1) & (at(upper) < at(very_short))
+            & (at(cl) > at(cl, 1)) & (at(cl, 1) > at(cl, 2))
+            & (at(o, 1) > at(o, 2))
+            & (at(o, 1) <= at(cl, 2) + at(near, 2))
+            & (at(o) > at(o, 1))
+            & (at(o) <= at(cl, 1) + at(near, 1))
+            & (at(rb, 1) > at(rb, 2) - at(far, 2))
+            & (at(rb) > at(rb, 1) - at(far, 1))
+            & (at(rb) > at(c.average('BodyShort')))
+        )
+    return c.result(condition, 100, lookback)
+
+
+def cdl_harami(open_, high, low, close):
+    """Harami (잉태형): 긴 몸통 안에 들어간 짧은 몸통 (직전 봉 반대 색상 x 100, 경계가 같으면 x 80)"""
+    return _harami(_Candles(open_, high, low, close))
+
+
+def _harami(c):
+    lookback = _lookback('BodyShort', 'BodyLong', extra=1)
+    at = c.window(lookback)
+    top, bottom, top1, bottom1 = at(c.body_top), at(c.body_bottom), at(c.body_top, 1), at(c.body_bottom, 1)
+    with np.errstate(invalid='ignore'):
+        shape = (at(c.real_body, 1) > at(c.average('BodyLong'), 1)) & (at(c.real_body) <= at(c.average('BodyShort')))
+        inside = (top < top1) & (bottom > bottom1)
+        touching = (top <= top1) & (bottom >= bottom1)
+    reverse = -at(c.color, 1)
+    return c.result(shape & touching, np.where(inside, reverse * 100, reverse * 80), lookback)
+
+
+def cdl_hammer(open_, high, low, close):
+    """Hammer (망치형): 짧은 몸통 + 긴 아래꼬리 + 거의 없는 위꼬리, 몸통이 직전 봉 저가 근처 (100)"""
+    return _hammer(_Candles(open_, high, low, close))
+
+
+def _hammer(c):
+    lookback = _lookback('BodyShort', 'ShadowLong', 'ShadowVeryShort', 'Near', extra=1)
+    at = c.window(lookback)
+    with np.errstate(invalid='ignore'):
+        condition = (
+            (at(c.real_body) < at(c.average('BodyShort')))
+            & (at(c.lower_shadow) > at(c.average('ShadowLong')))
+            & (at(c.upper_shadow) < at(c.average('ShadowVeryShort')))
+            & (at(c.body_bottom) <= at(c.low, 1) + at(c.average('Near'), 1))
+        )
+    return c.result(condition, 100, lookback)
+
+
+# TA-Lib 함수 이름 → 엔진 함수
+PATTERN_FUNCTIONS = {
+    'CDLMORNINGSTAR': cdl_morningstar,
+    'CDLBREAKAWAY': cdl_breakaway,
+    'CDLENGULFING': cdl_engulfing,
+    'CDLPIERCING': cdl_piercing,
+    'CDL3WHITESOLDIERS': cdl_3whitesoldiers,
+    'CDLHARAMI': cdl_harami,
+    'CDLHAMMER': cdl_hammer,
+}
+
+# 같은 _Candles(몸통/그림자/평균)를 공유해서 계산하는 내부 함수
+_PATTERN_KERNELS = {
+    'CDLMORNINGSTAR': _morningstar,
+    'CDLBREAKAWAY': _breakaway,
+    'CDLENGULFING': _engulfing,
+    'CDLPIERCING': _piercing,
+    'CDL3WHITESOLDIERS': _3whitesoldiers,
+    'CDLHARAMI': _harami,
+    'CDLHAMMER': _hammer,
+}
+
+
+def detect_patterns(open_, high, low, close, names=None):
+    """
+    여러 패턴을 한 번에 계산
+
+    Args:
+        open_, high, low, close: 1차원(거래일) 또는 2차원(종목 x 거래일) 배열
+        names: PATTERN_FUNCTIONS 이름 목록 (기본: 전체)
+
+    Returns:
+        {패턴 이름: 입력과 같은 모양의 int32 배열}
+    """
+    candles = _Candles(open_, high, low, close)
+    return {name: _PATTERN_KERNELS[name](candles) for name in (names or PATTERN_FUNCTIONS)}
+
+
+def compare_with_talib(open_, high, low, close, names=None):
+    """TA-Lib 결과와 다른 위치 수 {패턴 이름: 개수} (TA-Lib 필요, 1차원 입력)"""
+    import talib
+    arrays = [np.asarray(a, dtype=np.float64) for a in (open_, high, low, close)]
+    mismatches = {}
+    for name in (names or PATTERN_FUNCTIONS):
+        expected = getattr(talib, name)(*arrays)
+        mismatches[name] = int(np.count_nonzero(PATTERN_FUNCTIONS[name](*arrays) != expected))
+    return mismatches
+
+
+def _validation_series(seed, n_days):
+    """검증용 가격 (정수 호가 단위 무작위 보행 + 작은 몸통/긴 꼬리가 자주 나오는 캔들)"""
+    rng = np.random.default_rng(seed)
+    close = np.maximum(1000 + np.cumsum(rng.normal(0, 20, n_days)), 50).round()
+    open_ = np.maximum(close + rng.normal(0, 15, n_days).round() * rng.integers(0, 2, n_days), 1)
+    # 갭이 나도록 가끔 시가를 크게 띄움
+    open_ = np.where(rng.random(n_days) < 0.1, open_ + rng.normal(0, 60, n_days).round(), open_)
+    high = np.maximum(open_, close) + np.abs(rng.normal(0, 10, n_days)).round() * rng.integers(0, 2, n_days)
+    low = np.minimum(open_, close) - np.abs(rng.normal(0, 25, n_days)).round()
+    return open_, high, low, close
+
+
+def validate(n_series=200, n_days=600, seed=0):
+    """무작위/합성 가격 전체에 대해 TA-Lib과 엔진 결과 비교 (1차원 + 2차원 패널) → {패턴 이름: (불일치 수, TA-Lib 신호 수)}"""
+    import talib
+    from synthetic_market import SyntheticMarket
+
+    series = [_validation_series(seed + i, n_days) for i in range(n_series)]
+    market = SyntheticMarket(n_tickers=n_series, n_days=n_days, seed=seed)
+    for ticker in market.tickers:
+        df = market.history(ticker)
+        series.append(tuple(df[col].to_numpy(dtype=np.float64) for col in ('Open', 'High', 'Low', 'Close')))
+
+    # 길이가 다른 종목을 섞은 패널도 종목별 1차원 결과와 같아야 함
+    trimmed = [tuple(a[i % 50:] for a in arrays) for i, arrays in enumerate(series)]
+    width = max(len(arrays[0]) for arrays in trimmed)
+    panel = np.full((4, len(trimmed), width), np.nan)
+    for row, arrays in enumerate(trimmed):
+        panel[:, row, width - len(arrays[0]):] = arrays
+
+    report = {}
+    for name, function in PATTERN_FUNCTIONS.items():
+        mismatches = signals = 0
+        panel_result = function(*panel)
+        for row, arrays in enumerate(trimmed):
+            expected = getattr(talib, name)(*arrays)
+            signals += int(np.count_nonzero(expected))
+            mismatches += int(np.count_nonzero(function(*arrays) != expected))
+            mismatches += int(np.count_nonzero(panel_result[row, width - len(arrays[0]):] != expected))
+        report[name] = (mismatches, signals)
+    return report
+
+
+if __name__ == "__main__":
+    for pattern_name, (mismatch_count, signal_count) in validate().items():
+        status = "✓" if mismatch_count == 0 else "❌"
+        print(f"{status} {pattern_name}: TA-Lib 신호 {signal_count}개, 불일치 {mismatch_count}개")
@@ -0,0 +1,163 @@
+"""
+차트 트레이스 생성 헬퍼 (다운샘플링 / WebGL / 벡터화 색상)
+
+화면 폭보다 캔들이 많으면 브라우저는 어차피 한 픽셀에 여러 캔들을 겹쳐 그린다.
+표시 구간을 최대 max_points개 구간으로 나눠 구간별 시가(첫 값)/고가(최대)/저가(최소)/종가(마지막 값)/거래량(합계)으로
+합치면 모양과 고점/저점, 구간 거래량은 그대로 두고 전송량만 줄어든다.
+선 지표는 구간별 최소/최대 두 점을 시간 순서대로 남겨 급등락 꼭지점을 잃지 않는다.
+점이 많은 선은 WebGL(Scattergl)로 그린다.
+"""
+import numpy as np
+import pandas as pd
+
+from lazy_import import lazy_module
+
+go = lazy_module('plotly.graph_objects')
+
+# 차트 한 장에 보내는 최대 캔들 수 (약 800px 폭 차트에서 캔들 하나가 2px 이상이 되는 수준)
+DEFAULT_MAX_POINTS = 400
+
+# 이 개수보다 점이 많은 선은 WebGL로 그림 (브라우저의 WebGL 컨텍스트 수가 제한되어 있어 작은 차트는 SVG 유지)
+GL_MIN_POINTS = 500
+
+UP_COLOR = 'green'
+DOWN_COLOR = 'red'
+
+
+def bucket_starts(n, max_points=DEFAULT_MAX_POINTS):
+    """n개 행을 같은 길이의 최대 max_points개 구간으로 나눈 구간 시작 위치 (나눌 필요가 없으면 None)"""
+    if max_points is None or n <= max_points:
+        return None
+    return np.arange(0, n, -(-n // max_points))
+
+
+def downsample_ohlcv(df, max_points=DEFAULT_MAX_POINTS):
+    """
+    OHLCV 구간 합치기 (시가=첫 값, 고가=최대, 저가=최소, 종가=마지막 값, 거래량=합계)
+
+    그 밖의 컬럼(이동평균 등)은 구간의 마지막 값, 인덱스는 구간 첫 날짜.
+    행 수가 max_points 이하이면 그대로 반환한다.
+    """
+    starts = bucket_starts(len(df), max_points)
+    if starts is None:
+        return df
+    ends = np.append(starts[1:], len(df)) - 1
+
+    result = df.iloc[ends].copy()
+    result.index = df.index[starts]
+    for col, reducer in (('High', np.fmax), ('Low', np.fmin), ('Volume', np.add)):
+        if col in df.columns:
+            result[col] = reducer.reduceat(df[col].to_numpy(dtype=np.float64), starts)
+    if 'Open' in df.columns:
+        result['Open'] = df['Open'].to_numpy()[starts]
+    return result
+
+
+def downsample_line(x, y, max_points=DEFAULT_MAX_POINTS):
+    """
+    선 데이터 구간별 최소/최대 두 점 남기기 (시간 순서 유지, 결측 구간은 결측으로)
+
+    Returns:
+        (x, y) 배열 - 점이 max_points 이하이면 그대로
+    """
+    y = np.asarray(y, dtype=np.float64)
+    starts = bucket_starts(len(y), max_points)
+    if starts is None:
+        return x, y
+    x = np.asarray(x)
+    ends = np.append(starts[1:], len(y))
+    lengths = ends - starts
+
+    # 결측값은 최소/최대 후보에서 제외 (구간 전체가 결측이면 첫 위치)
+    bucket_ids = np.repeat(np.arange(len(starts)), lengths)
+    filled_high = np.where(np.isnan(y), -np.inf, y)
+    filled_low = np.where(np.isnan(y), np.inf, y)
+    order_high = np.lexsort((-filled_high, bucket_ids))
+    order_low = np.lexsort((filled_low, bucket_ids))
+    first = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    argmax = order_high[first]
+    argmin = order_low[first]
+
+    picks = np.stack([np.minimum(argmin, argmax), np.maximum(argmin, argmax)], axis=1).ravel()
+    return x[picks], y[picks]
+
+
+def up_down_colors(values, reference=0, up=UP_COLOR, down=DOWN_COLOR):
+    """values >= reference이면 up, 아니면 down 색상 배열"""
+    return np.where(np.asarray(values) >= np.asarray(reference), up, down)
+
+
+def line_trace(x, y, max_points=DEFAULT_MAX_POINTS, **kwargs):
+    """선 트레이스 (점이 많으면 최소/최대 다운샘플링, 그래도 많으면 WebGL)"""
+    x, y = downsample_line(x, y, max_points)
+    trace_cls = go.Scattergl if len(y) > GL_MIN_POINTS else go.Scatter
+    return trace_cls(x=x, y=y, **kwargs)
+
+
+def candlestick_trace(df, **kwargs):
+    """이미 구간을 합친 OHLC DataFrame의 캔들스틱 트레이스"""
+    return go.Candlestick(
+        x=df.index, open=df['Open'].to_numpy(), high=df['High'].to_numpy(),
+        low=df['Low'].to_numpy(), close=df['Close'].to_numpy(), **kwargs
+    )
+
+
+def volume_trace(df, **kwargs):
+    """상승/하락 색상 거래량 막대 (이미 구간을 합친 DataFrame)"""
+    return go.Bar(
+        x=df.index, y=df['Volume'].to_numpy(),
+        marker=dict(color=up_down_colors(df['Close'].to_numpy(), df['Open'].to_numpy())), **kwargs
+    )
+
+
+def histogram_trace(x, y, max_points=DEFAULT_MAX_POINTS, opacity=None, **kwargs):
+    """0 기준 색상 막대 (MACD 히스토그램 등) - 구간별 절댓값이 가장 큰 값만 남김"""
+    y = np.asarray(y, dtype=np.float64)
+    starts = bucket_starts(len(y), max_points)
+    if starts is not None:
+        x = np.asarray(x)
+        magnitude = pd.Series(np.abs(y)).fillna(-1.0)
+        bucket_ids = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(y))))
+        picks = magnitude.groupby(bucket_ids).idxmax().to_numpy()
+        x, y = x[picks], y[picks]
+    marker = dict(color=up_down_colors(np.nan_to_num(y)))
+    if opacity is not None:
+        marker['opacity'] = opacity
+    return go.Bar(x=x, y=y, marker=marker, **kwargs)
+
+
+def vline_shapes(x, color, dash='dash', width=1, opacity=0.7):
+    """
+    x 위치마다 차트 전체 높이의 세로선 shape 목록
+
+    add_vline은 호출할 때마다 레이아웃 전체를 다시 검증하므로,
+    목록을 만들어 fig.update_layout(shapes=...)로 한 번에 지정한다.
+    """
+    line = dict(color=color, dash=dash, width=width)
+    return [dict(type='line', xref='x', yref='paper', x0=value, x1=value, y0=0, y1=1,
+                 line=line, opacity=opacity, layer='below') for value in x]
+
+
+def pattern_marker_traces(patterns, strong_color='gold', medium_color='orange', size=15, symbol='star'):
+    """
+    detect_bullish_patterns 결과를 패턴 종류별 마커 트레이스 하나씩으로 묶음
+
+    패턴이 몇 개든 트레이스 수는 패턴 종류 수로 고정되고, 강도별 색상은 배열로 지정한다.
+    """
+    if not patterns:
+        return []
+    frame = pd.DataFrame(patterns)
+    traces = []
+    for pattern_name, group in frame.groupby('pattern', sort=False):
+        prices = group['price'].to_numpy(dtype=np.float64)
+        colors = np.where(group['strength'].to_numpy() == 'Strong', strong_color, medium_color)
+        traces.append(go.Scatter(
+            x=group['date'].to_numpy(),
+            y=prices,
+            mode='markers',
+            name=pattern_name,
+            marker=dict(size=size, color=colors, symbol=symbol, line=dict(color='darkred', width=2)),
+            hovertemplate=f"<b>{pattern_name}</b><br>날짜: %{{x|%Y-%m-%d}}<br>가격: ₩%{{y:,.0f}}<extra></extra>",
+            showlegend=False
+        ))
+    return traces
@@ -0,0 +1,210 @@
+"""
+차트용 가격 데이터 모듈
+
+추천 종목 차트 탭(app.py)과 급등주 차트 탭(talib_ui.py)이 같은 LRU 차트 캐시를 공유한다.
+캐시는 메모리 예산(SWING_CHART_CACHE_MB)을 넘으면 가장 오래 보지 않은 종목부터 제거하므로
+후보 종목 수백 개를 넘겨봐도 메모리가 무한정 늘지 않고, 방금 본 종목은 네트워크 요청 없이 다시 그린다.
+"""
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+
+from price_data import get_price_history
+from shared_cache import get_chart_cache
+
+# 차트용으로 한 번에 조회하는 기간 (3년 차트 포함, 두 차트 탭이 같은 캐시 항목을 공유하도록 통일)
+CHART_HISTORY_DAYS = 1100
+
+# ◀/▶ 이동 시 앞뒤로 미리 불러올 종목 수와 백그라운드 스레드 수
+PREFETCH_RADIUS = 3
+PREFETCH_WORKERS = 3
+
+REQUIRED_COLS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def normalize_ohlcv(df):
+    """
+    가격 데이터의 컬럼명을 Open/High/Low/Close/Volume으로 통일하고 숫자형으로 정제
+
+    Returns:
+        정제된 DataFrame (필요한 컬럼이 없으면 None)
+    """
+    if df is None:
+        return None
+
+    # MultiIndex 처리
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+
+    # 컬럼 매핑 (대소문자 무시)
+    col_map = {}
+    for col in df.columns:
+        col_lower = str(col).lower().strip()
+        if col_lower in ['open', 'high', 'low', 'close', 'volume']:
+            col_map[col] = col_lower.capitalize()
+        elif col_lower in ['adj close', 'adj_close']:
+            col_map[col] = 'Adj Close'
+
+    if col_map:
+        df = df.rename(columns=col_map)
+
+    if not all(col in df.columns for col in REQUIRED_COLS):
+        return None
+
+    df = df[REQUIRED_COLS].apply(pd.to_numeric, errors='coerce')
+    return df.dropna(subset=REQUIRED_COLS)
+
+
+def price_data_version(df, columns=REQUIRED_COLS):
+    """가격 데이터 버전 (날짜 + columns 값의 해시 - 새 봉이 들어오거나 값이 수정될 때만 바뀜)"""
+    digest = hashlib.blake2b(digest_size=12)
+    digest.update(df.index.asi8.tobytes())
+    digest.update(np.ascontiguousarray(df[list(columns)].to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()
+
+
+def chart_as_of():
+    """차트 캐시 기준일 (slice_recent와 같은 오늘 날짜 - 서버가 날을 넘겨 떠 있어도 전날 차트를 재사용하지 않음)"""
+    return datetime.now().date()
+
+
+def load_chart_data(ticker, days=CHART_HISTORY_DAYS):
+    """
+    차트용 가격 데이터 조회 (LRU 차트 캐시 경유)
+
+    캐시된 DataFrame을 그대로 반환하므로 호출자는 수정하기 전에 copy()해야 한다.
+    캐시 키에 기준일이 들어가므로 날짜가 바뀌면 새로 조회한다.
+    새로 조회한 데이터는 공용 가격 캐시(SharedCache)에 남기지 않는다.
+    조회 실패 시 None (실패는 캐시하지 않음).
+    """
+    ticker = str(ticker).zfill(6)
+    cache = get_chart_cache()
+    key = ('chart', ticker, days, chart_as_of())
+
+    df = cache.get(key)
+    if df is not None:
+        return df
+
+    # 공용 가격 캐시에 이미 있으면 재사용하되 새로 받은 데이터는 남기지 않음
+    # (차트 데이터는 이 LRU 캐시 한 곳에만 있어야 SWING_CHART_CACHE_MB 예산이 실제 메모리 상한이 됨)
+    df = normalize_ohlcv(get_price_history(ticker, days, min_rows=1, retries=3, share=False))
+    if df is None or len(df) == 0:
+        return None
+
+    cache.set(key, df)
+    return df
+
+
+def slice_recent(df, days):
+    """최근 days일(달력 기준) 구간만 잘라서 반환"""
+    if df is None or len(df) == 0:
+        return df
+    start_date = pd.Timestamp((datetime.now() - timedelta(days=days)).date())
+    return df[df.index >= start_date]
+
+
+def get_chart_derived(ticker, days, name, compute):
+    """
+    차트 데이터에서 계산한 파생 값(지표, 패턴 등) 조회 (LRU 차트 캐시 경유)
+
+    Args:
+        ticker: 종목코드
+        days: 원본 차트 데이터 기간 (load_chart_data와 동일)
+        name: 파생 값 이름 (해시 가능한 값, 예: ('app_indicators', 365))
+        compute: compute(df) -> 파생 값
+
+    Returns:
+        파생 값 (차트 데이터가 없으면 None). 캐시된 객체이므로 수정하지 말 것.
+    """
+    ticker = str(ticker).zfill(6)
+    cache = get_chart_cache()
+    key = ('derived', ticker, days, chart_as_of(), name)
+
+    # None 결과도 캐시할 수 있도록 튜플로 감싸서 저장
+    entry = cache.get(key)
+    if entry is not None:
+        return entry[0]
+
+    df = load_chart_data(ticker, days)
+    if df is None:
+        return None
+
+    value = compute(df)
+    cache.set(key, (value,))
+    return value
+
+
+def neighbor_tickers(tickers, current_ticker, radius=PREFETCH_RADIUS):
+    """현재 종목 기준 다음/이전 종목을 가까운 순서로 반환 (다음 종목 우선, 중복 제거)"""
+    tickers = [str(t).zfill(6) for t in tickers]
+    current_ticker = str(current_ticker).zfill(6)
+    if current_ticker not in tickers:
+        return []
+
+    current_idx = tickers.index(current_ticker)
+    neighbors = []
+    for offset in range(1, radius + 1):
+        for idx in (current_idx + offset, current_idx - offset):
+            if 0 <= idx < len(tickers):
+                ticker = tickers[idx]
+                if ticker != current_ticker and ticker not in neighbors:
+                    neighbors.append(ticker)
+    return neighbors
+
+
+class ChartPrefetcher:
+    """현재 보고 있는 종목의 앞뒤 종목 차트 데이터와 파생 값을 백그라운드에서 미리 계산"""
+
+    def __init__(self, max_workers=PREFETCH_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="chart-prefetch")
+        self._lock = threading.Lock()
+        self._pending = set()
+
+    def _run(self, ticker, days, derive, tasks):
+        """종목 하나의 차트 데이터와 파생 값 계산 (예외는 무시 - 화면 표시 시 다시 시도됨)"""
+        try:
+            if load_chart_data(ticker, days) is None:
+                return
+            for name, compute in (derive or {}).items():
+                get_chart_derived(ticker, days, name, compute)
+            for task in (tasks or {}).values():
+                task(ticker)
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                self._pending.discard((ticker, days))
+
+    def prefetch(self, tickers, current_ticker, days=CHART_HISTORY_DAYS, derive=None, radius=PREFETCH_RADIUS, tasks=None):
+        """
+        current_ticker 앞뒤 radius개 종목을 백그라운드에서 미리 불러오기
+
+        Args:
+            tickers: 현재 결과 목록의 종목코드 순서
+            current_ticker: 지금 화면에 표시 중인 종목코드
+            derive: {파생 값 이름: compute(df)} - get_chart_derived와 같은 이름을 써야 화면에서 재사용됨
+            tasks: {작업 이름: task(ticker)} - 차트 데이터를 불러온 뒤 실행할 추가 작업 (차트 페이로드 등)
+        """
+        for ticker in neighbor_tickers(tickers, current_ticker, radius):
+            with self._lock:
+                if (ticker, days) in self._pending:
+                    continue
+                self._pending.add((ticker, days))
+            self._executor.submit(self._run, ticker, days, derive, tasks)
+
+
+_prefetcher = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_chart_prefetcher():
+    """프로세스 전역 ChartPrefetcher 인스턴스 반환"""
+    global _prefetcher
+    if _prefetcher is None:
+        with _prefetcher_lock:
+            if _prefetcher is None:
+                _prefetcher = ChartPrefetcher()
+    return _prefetcher
@@ -0,0 +1,175 @@
+"""
+차트 페이로드 캐시 모듈
+
+추천 종목 차트 한 장에 필요한 값(지표 컬럼, 상승 패턴 마커, 일목균형표 미래 구간)을 한 번에 계산해서
+(종목, 기간, 가격 데이터 버전) 키로 메모리(LRU 차트 캐시)와 디스크에 저장한다.
+가격 데이터 버전은 표시 구간 OHLCV의 해시라서 새 봉이 들어오거나 값이 수정될 때만 바뀐다.
+배치 스캔이 밤사이 후보 종목 전체를 미리 계산해 두면 차트 화면은 캐시 조회 + 그림 조립만 한다.
+"""
+import os
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+
+from chart_data import load_chart_data, get_chart_prefetcher, price_data_version, chart_as_of, CHART_HISTORY_DAYS
+from indicators import detect_bullish_patterns, compute_chart_indicators
+from ichimoku import calculate_ichimoku, get_ichimoku, slice_ichimoku
+from shared_cache import get_chart_cache
+
+# 차트 화면 기간 선택지 (이름 → 달력 일수)
+CHART_PERIODS = {'1개월': 30, '3개월': 90, '6개월': 180, '1년': 365, '3년': 1095}
+
+# 페이로드 형식 버전 (계산 방식이 바뀌면 올려서 디스크에 남은 예전 페이로드를 버림)
+PAYLOAD_FORMAT = 3
+
+
+def slice_period(df, period_days):
+    """마지막 봉 기준 최근 period_days일(달력 기준) 구간 (오늘 날짜와 무관해서 밤사이 계산한 결과를 그대로 쓸 수 있음)"""
+    if df is None or len(df) == 0:
+        return df
+    return df[df.index >= df.index[-1] - pd.Timedelta(days=period_days)]
+
+
+def build_chart_payload(df, version=None, ichimoku=None, history=None):
+    """
+    표시 구간 가격 데이터로 차트 페이로드 계산
+
+    Args:
+        ichimoku: 미리 계산한 표시 구간 일목균형표 (None이면 df로 계산)
+        history: df를 잘라낸 전체 이력. 주면 지표와 패턴을 이력으로 계산해서 표시 구간만 잘라 씀
+            (MA224/MACD 같은 긴 지표가 짧은 기간에서도 앞쪽이 비거나 달라지지 않음)
+
+    Returns:
+        {'version', 'frame': 지표 컬럼이 붙은 DataFrame, 'patterns': detect_bullish_patterns 결과,
+         'ichimoku': calculate_ichimoku 결과 (미래 26영업일 포함)}
+    """
+    if history is None:
+        history = df
+    start = df.index[0]
+    frame = compute_chart_indicators(history)
+    start_date = start.strftime('%Y-%m-%d')
+    return {
+        'version': version or price_data_version(df),
+        'frame': frame[frame.index >= start],
+        'patterns': [p for p in detect_bullish_patterns(history) if p['date'] >= start_date],
+        'ichimoku': ichimoku if ichimoku is not None else calculate_ichimoku(df),
+    }
+
+
+class ChartPayloadStore:
+    """종목/기간별 최신 페이로드 하나씩 디스크에 저장 ({ticker}_{period_days}.pkl, 버전이 다르면 무시)"""
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+
+    def _path(self, ticker, period_days):
+        return os.path.join(self.store_dir, f"{ticker}_{period_days}.pkl")
+
+    def load(self, ticker, period_days, version):
+        """저장된 페이로드 (없거나 버전이 다르면 None)"""
+        path = self._path(ticker, period_days)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                payload = pickle.load(f)
+        except Exception:
+            return None
+        return payload if payload.get('version') == version else None
+
+    def save(self, ticker, period_days, payload):
+        """저장 (임시 파일에 쓴 뒤 교체)"""
+        try:
+            os.makedirs(self.store_dir, exist_ok=True)
+            path = self._path(ticker, period_days)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"⚠️ 차트 페이로드 저장 실패 ({ticker}): {str(e)}")
+
+
+_payload_store = None
+_payload_store_lock = threading.Lock()
+
+
+def get_chart_payload_store(data_dir="analysis_data"):
+    """프로세스 전역 ChartPayloadStore (첫 호출의 data_dir 아래 chart_payloads 디렉토리)"""
+    global _payload_store
+    if _payload_store is None:
+        with _payload_store_lock:
+            if _payload_store is None:
+                _payload_store = ChartPayloadStore(os.path.join(data_dir, "chart_payloads"))
+    return _payload_store
+
+
+def get_chart_payload(ticker, period_days, as_of=None, days=CHART_HISTORY_DAYS):
+    """
+    차트 페이로드 조회 (LRU 차트 캐시 → 디스크 → 계산 순, 계산하면 두 곳에 모두 저장)
+
+    Args:
+        as_of: 기준일 (이 날짜까지의 봉만 사용, None이면 오늘). 디스크 저장소는 오늘 기준 페이로드만 보관한다.
+
+    Returns:
+        build_chart_payload 결과 (차트 데이터가 없으면 None). 캐시된 객체이므로 수정하지 말 것.
+    """
+    ticker = str(ticker).zfill(6)
+    today = chart_as_of()
+    as_of = min(as_of or today, today)
+    history = load_chart_data(ticker, days)
+    if history is not None and as_of < today:
+        history = history[history.index < pd.Timestamp(as_of) + pd.Timedelta(days=1)]
+    df = slice_period(history, period_days)
+    if df is None or len(df) == 0:
+        return None
+
+    version = f"{PAYLOAD_FORMAT}-{price_data_version(df)}"
+    cache = get_chart_cache()
+    key = ('payload', ticker, period_days, as_of, version)
+    payload = cache.get(key)
+    if payload is not None:
+        return payload
+
+    # 과거 기준일 페이로드로 배치 스캔이 저장해 둔 최신 페이로드를 덮어쓰지 않음
+    store = get_chart_payload_store() if as_of == today else None
+    payload = store.load(ticker, period_days, version) if store is not None else None
+    if payload is None:
+        # 지표/일목균형표는 전체 이력으로 계산해서(짧은 기간도 앞쪽이 비지 않음, 일목은 기간끼리 캐시 공유) 표시 구간만 잘라 씀
+        ichimoku = slice_ichimoku(get_ichimoku(ticker, history), df.index[0])
+        payload = build_chart_payload(df, version, ichimoku, history)
+        if store is not None:
+            store.save(ticker, period_days, payload)
+    cache.set(key, payload)
+    return payload
+
+
+def prefetch_chart_payloads(tickers, current_ticker, period_days, as_of=None):
+    """◀/▶ 이동에 대비해 current_ticker 앞뒤 종목의 페이로드를 백그라운드에서 미리 준비"""
+    get_chart_prefetcher().prefetch(
+        tickers, current_ticker,
+        tasks={('payload', period_days, as_of): lambda ticker: get_chart_payload(ticker, period_days, as_of)}
+    )
+
+
+def precompute_chart_payloads(tickers, periods=None, workers=8):
+    """
+    후보 종목 전체의 페이로드를 기간별로 미리 계산해서 디스크에 저장 (배치 스캔용)
+
+    Returns:
+        페이로드를 준비한 종목 수
+    """
+    periods = list(periods or CHART_PERIODS.values())
+    tickers = list(dict.fromkeys(str(t).zfill(6) for t in tickers))
+
+    def precompute(ticker):
+        try:
+            return all(get_chart_payload(ticker, period_days) is not None for period_days in periods)
+        except Exception:
+            return False
+
+    if not tickers:
+        return 0
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="chart-payload") as executor:
+        return sum(executor.map(precompute, tickers))
@@ -0,0 +1,500 @@
+"""
+다중 가격 데이터 소스 모듈 (FinanceDataReader, pykrx, yfinance)
+
+소스별 응답 시간/실패율을 추적하고, 가장 좋은 소스에 먼저 요청한 뒤 응답이 지연 기준
+(해당 소스 최근 응답 시간의 p90)을 넘기면 다음 소스에 헤지 요청을 보내 먼저 온 응답을 쓴다.
+실패하면 기다리지 않고 바로 다음 소스로 넘어간다. 연속으로 실패한 소스는 잠시 후순위로 내린다.
+전체 제한 시간 안에 응답이 없으면 시간 초과(SourceTimeoutError)로 실패시켜 호출자가 재시도/실패 기록을 하게 한다.
+모든 소스의 결과는 같은 형식으로 정규화된다.
+
+- 가격: DatetimeIndex('Date', 시간대 없음, 오름차순) + Open/High/Low/Close/Volume (float)
+- 종목 목록: Code(6자리 문자열), Name
+- 시장 스냅샷: Code 인덱스 + Open/High/Low/Close/Volume (float) - 하루치 전 종목 시세를 요청 한 번으로 조회
+"""
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import pandas as pd
+
+from lazy_import import timed_import, module_available
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# 우선순위 순서 (응답 기록이 쌓이기 전에는 이 순서를 그대로 사용)
+PRICE_SOURCE_ORDER = ('fdr', 'pykrx', 'yfinance')
+LISTING_SOURCE_ORDER = ('fdr', 'pykrx', 'krx')
+SNAPSHOT_SOURCE_ORDER = ('pykrx', 'fdr')
+
+# 스캔 대상 시장 (ETF는 KRX 상장 ETF)
+MARKETS = ('KOSPI', 'KOSDAQ', 'KONEX', 'ETF')
+
+# KRX 상장법인목록(KIND) 시장 구분 (ETF는 KIND 목록에 없음)
+KRX_MARKET_TYPES = {'KOSPI': 'stockMkt', 'KOSDAQ': 'kosdaqMkt', 'KONEX': 'konexMkt'}
+
+# 헤지 요청 지연 기준 (초) - 응답 기록이 부족하면 기본값, 있으면 p90을 범위 안으로 제한
+DEFAULT_HEDGE_AFTER = 1.5
+MIN_HEDGE_AFTER = 0.3
+MAX_HEDGE_AFTER = 5.0
+LISTING_HEDGE_AFTER = 5.0
+
+# 조회 한 번(주 요청 + 헤지)을 기다리는 최대 시간 (초)
+# FDR/pykrx 호출에는 소켓 타임아웃이 없으므로 응답 없는 요청이 호출 스레드를 계속 붙잡지 않도록 시간 초과로 실패 처리
+PRICE_FETCH_TIMEOUT = 30.0
+LISTING_FETCH_TIMEOUT = 90.0
+
+# 동시에 요청하는 최대 소스 수 (주 요청 + 헤지)
+MAX_PARALLEL_SOURCES = 2
+
+# 연속 실패 시 후순위로 내리는 기준과 기간
+FAILURE_THRESHOLD = 5
+COOLDOWN_SECONDS = 60
+
+# 응답 시간 기록 개수
+LATENCY_WINDOW = 50
+
+# 헤지 요청용 스레드 수 (느린 요청이 끝날 때까지 스레드를 점유하므로 넉넉하게)
+SOURCE_WORKERS = 32
+
+
+# ---------- 정규화 ----------
+
+def normalize_price_frame(df):
+    """소스별 가격 데이터를 공통 형식으로 변환 (필요한 컬럼이 없거나 비어 있으면 None)"""
+    if df is None or len(df) == 0:
+        return None
+    df = df.copy()
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+
+    col_map = {}
+    for col in df.columns:
+        col_lower = str(col).lower().strip()
+        if col_lower in ('open', 'high', 'low', 'close', 'volume'):
+            col_map[col] = col_lower.capitalize()
+    df = df.rename(columns=col_map)
+    if not all(col in df.columns for col in PRICE_COLUMNS):
+        return None
+
+    df = df[PRICE_COLUMNS].apply(pd.to_numeric, errors='coerce').astype(float)
+    index = pd.DatetimeIndex(pd.to_datetime(df.index))
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    df.index = index.normalize()
+    df.index.name = 'Date'
+    df = df[~df.index.duplicated(keep='last')].sort_index()
+    df = df.dropna(subset=['Close'])
+    return df if len(df) else None
+
+
+def normalize_listing_frame(df):
+    """종목 목록을 Code(6자리), Name 형식으로 변환"""
+    if df is None or len(df) == 0 or 'Code' not in df.columns or 'Name' not in df.columns:
+        return None
+    result = df[['Code', 'Name']].copy()
+    result['Code'] = result['Code'].astype(str).str.strip().str.zfill(6)
+    result['Name'] = result['Name'].astype(str).str.strip()
+    result = result.drop_duplicates(subset=['Code']).reset_index(drop=True)
+    return result if len(result) else None
+
+
+def normalize_snapshot_frame(df):
+    """시장 스냅샷을 Code 인덱스 + OHLCV 형식으로 변환 (거래가 없던 종목은 제외)"""
+    if df is None or len(df) == 0 or not all(col in df.columns for col in PRICE_COLUMNS):
+        return None
+    result = df[PRICE_COLUMNS].apply(pd.to_numeric, errors='coerce').astype(float)
+    result.index = pd.Index(df.index.astype(str).str.strip().str.zfill(6), name='Code')
+    result = result[~result.index.duplicated(keep='last')]
+    # 거래정지 종목은 시가/고가/저가가 0으로 들어옴
+    result = result[(result['Open'] > 0) & (result['Low'] > 0)].dropna()
+    return result if len(result) else None
+
+
+# ---------- 가격 소스 ----------
+
+def _fdr_prices(ticker, start_date, end_date):
+    fdr = timed_import('FinanceDataReader')
+    return fdr.DataReader(ticker, start_date, end_date)
+
+
+def _pykrx_prices(ticker, start_date, end_date):
+    stock = timed_import('pykrx.stock')
+    df = stock.get_market_ohlcv_by_date(start_date.strftime('%Y%m%d'), end_date.strftime('%Y%m%d'), ticker)
+    if df is None or df.empty:
+        return None
+    return df.rename(columns={'시가': 'Open', '고가': 'High', '저가': 'Low', '종가': 'Close', '거래량': 'Volume'})
+
+
+def _yfinance_prices(ticker, start_date, end_date):
+    yf = timed_import('yfinance')
+    # 코스피(.KS)에 없으면 코스닥(.KQ)으로 재시도
+    for suffix in ('.KS', '.KQ'):
+        df = yf.download(f"{ticker}{suffix}", start=start_date, end=end_date,
+                         progress=False, auto_adjust=False, threads=False, timeout=15)
+        if df is not None and not df.empty:
+            return df
+    return None
+
+
+# ---------- 종목 목록 소스 ----------
+
+def _fdr_listing(market):
+    fdr = timed_import('FinanceDataReader')
+    if market == 'ETF':
+        return fdr.StockListing('ETF/KR').rename(columns={'Symbol': 'Code'})
+    return fdr.StockListing(market)
+
+
+def _pykrx_listing(market):
+    stock = timed_import('pykrx.stock')
+    if market == 'ETF':
+        tickers, get_name = stock.get_etf_ticker_list(), stock.get_etf_ticker_name
+    else:
+        tickers, get_name = stock.get_market_ticker_list(market=market), stock.get_market_ticker_name
+    if not tickers:
+        return None
+    names = []
+    for ticker in tickers:
+        try:
+            names.append(get_name(ticker))
+        except Exception:
+            names.append(f'Unknown_{ticker}')
+    return pd.DataFrame({'Code': tickers, 'Name': names})
+
+
+def _krx_listing(market):
+    """KRX 상장법인목록 CSV (KIND)"""
+    if market not in KRX_MARKET_TYPES:
+        raise ValueError(f"KRX 상장법인목록에 없는 시장입니다: {market}")
+    requests = timed_import('requests')
+    url = ("https://kind.krx.co.kr/corpgeneral/corpList.do?method=download&searchType=13"
+           f"&marketType={KRX_MARKET_TYPES[market]}")
+    response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'}, timeout=15)
+    response.raise_for_status()
+    last_error = None
+    for encoding in ('euc-kr', 'cp949', 'utf-8'):
+        try:
+            df = pd.read_csv(pd.io.common.BytesIO(response.content), encoding=encoding)
+            df.columns = df.columns.str.strip()
+            if '종목코드' in df.columns and '회사명' in df.columns:
+                return df.rename(columns={'종목코드': 'Code', '회사명': 'Name'})
+        except Exception as e:
+            last_error = e
+    raise ValueError(f"KRX CSV 형식을 읽을 수 없습니다: {last_error}")
+
+
+# ---------- 시장 스냅샷 소스 ----------
+
+def _pykrx_snapshot(market, date):
+    stock = timed_import('pykrx.stock')
+    date_str = date.strftime('%Y%m%d')
+    if market == 'ETF':
+        df = stock.get_etf_ohlcv_by_ticker(date_str)
+    else:
+        df = stock.get_market_ohlcv_by_ticker(date_str, market=market)
+    if df is None or df.empty:
+        return None
+    return df.rename(columns={'시가': 'Open', '고가': 'High', '저가': 'Low', '종가': 'Close', '거래량': 'Volume'})
+
+
+def _fdr_snapshot(market, date):
+    """FinanceDataReader 종목 목록의 당일 시세 (가장 최근 거래일만 - date는 호출자가 확인)"""
+    if market == 'ETF':
+        # ETF 목록에는 시가/고가/저가가 없음
+        return None
+    fdr = timed_import('FinanceDataReader')
+    df = fdr.StockListing(market)
+    if df is None or df.empty or 'Code' not in df.columns:
+        return None
+    return df.set_index('Code')
+
+
+PRICE_SOURCE_FUNCS = {
+    'fdr': ('FinanceDataReader', _fdr_prices),
+    'pykrx': ('pykrx', _pykrx_prices),
+    'yfinance': ('yfinance', _yfinance_prices),
+}
+
+LISTING_SOURCE_FUNCS = {
+    'fdr': ('FinanceDataReader', _fdr_listing),
+    'pykrx': ('pykrx', _pykrx_listing),
+    'krx': ('requests', _krx_listing),
+}
+
+SNAPSHOT_SOURCE_FUNCS = {
+    'pykrx': ('pykrx', _pykrx_snapshot),
+    'fdr': ('FinanceDataReader', _fdr_snapshot),
+}
+
+
+# ---------- 상태 추적 / 헤지 요청 ----------
+
+class SourceHealth:
+    """소스 하나의 응답 시간/성공/실패 기록 (스레드 안전)"""
+
+    def __init__(self, name, priority=0):
+        self.name = name
+        self.priority = priority
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self.successes = 0
+        self.empties = 0
+        self.failures = 0
+        self.hedge_wins = 0
+        self.consecutive_failures = 0
+        self.down_until = 0.0
+        self.last_error = None
+
+    def record_success(self, seconds, hedged=False):
+        with self._lock:
+            self._latencies.append(seconds)
+            self.successes += 1
+            self.consecutive_failures = 0
+            self.down_until = 0.0
+            if hedged:
+                self.hedge_wins += 1
+
+    def record_empty(self, seconds):
+        """응답은 왔지만 데이터가 없음 (해당 소스에 없는 종목) - 실패로 치지 않음"""
+        with self._lock:
+            self._latencies.append(seconds)
+            self.empties += 1
+
+    def record_failure(self, exc):
+        with self._lock:
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.last_error = f"{type(exc).__name__}: {str(exc)[:200]}"
+            if self.consecutive_failures >= FAILURE_THRESHOLD:
+                self.down_until = time.monotonic() + COOLDOWN_SECONDS
+
+    @property
+    def is_down(self):
+        return time.monotonic() < self.down_until
+
+    def latency_quantile(self, q):
+        with self._lock:
+            samples = list(self._latencies)
+        if len(samples) < 5:
+            return None
+        return statistics.quantiles(samples, n=100)[int(q * 100) - 1]
+
+    def hedge_after(self, default=DEFAULT_HEDGE_AFTER):
+        """이 소스에 보낸 요청을 얼마나 기다린 뒤 헤지할지 (p90 응답 시간)"""
+        p90 = self.latency_quantile(0.9)
+        if p90 is None:
+            return default
+        return min(MAX_HEDGE_AFTER, max(MIN_HEDGE_AFTER, p90))
+
+    def rank_key(self):
+        """정렬 키 - 후순위 여부, 기대 비용(중앙 응답 시간 / 성공률), 기본 우선순위"""
+        with self._lock:
+            samples = list(self._latencies)
+            attempts = self.successes + self.empties + self.failures
+            success_rate = (self.successes + self.empties) / attempts if attempts else 1.0
+        if attempts < 5:
+            return (self.is_down, 0, self.priority)
+        # 응답 기록이 없으면 (모두 실패) 최대 헤지 기준만큼 걸리는 것으로 간주
+        median = statistics.median(samples) if samples else MAX_HEDGE_AFTER
+        expected = median / max(success_rate, 0.05)
+        return (self.is_down, expected, self.priority)
+
+    def snapshot(self):
+        p50, p90 = self.latency_quantile(0.5), self.latency_quantile(0.9)
+        return {
+            'successes': self.successes,
+            'empties': self.empties,
+            'failures': self.failures,
+            'hedge_wins': self.hedge_wins,
+            'consecutive_failures': self.consecutive_failures,
+            'down': self.is_down,
+            'p50': round(p50, 4) if p50 is not None else None,
+            'p90': round(p90, 4) if p90 is not None else None,
+            'last_error': self.last_error,
+        }
+
+
+class SourceTimeoutError(TimeoutError):
+    """조회 제한 시간 안에 어떤 소스도 응답하지 않음"""
+
+
+class HedgedFetcher:
+    """
+    여러 소스에 헤지 요청을 보내는 조회기
+
+    sources: [(이름, 함수)] - 함수(*args)는 원본 DataFrame을 반환
+    normalize: 원본 → 공통 형식 (데이터가 없으면 None)
+    timeout: 조회 한 번의 전체 제한 시간 (초과하면 응답하지 않은 소스마다 실패로 기록하고 SourceTimeoutError)
+    """
+
+    def __init__(self, sources, normalize, hedge_after=None, max_parallel=MAX_PARALLEL_SOURCES, label="source",
+                 timeout=PRICE_FETCH_TIMEOUT):
+        self.sources = list(sources)
+        self.normalize = normalize
+        self.fixed_hedge_after = hedge_after
+        self.max_parallel = max(1, max_parallel)
+        self.timeout = timeout
+        self.health = {name: SourceHealth(name, priority) for priority, (name, _) in enumerate(self.sources)}
+        self._funcs = dict(self.sources)
+        self._executor = ThreadPoolExecutor(max_workers=SOURCE_WORKERS, thread_name_prefix=label)
+
+    def ranked_sources(self):
+        """상태가 좋은 순서의 소스 이름"""
+        return sorted(self._funcs, key=lambda name: self.health[name].rank_key())
+
+    def _call(self, name, args, hedged, abandoned):
+        health = self.health[name]
+        started = time.perf_counter()
+        try:
+            result = self.normalize(self._funcs[name](*args))
+        except Exception as e:
+            if not abandoned.is_set():
+                health.record_failure(e)
+            raise
+        elapsed = time.perf_counter() - started
+        # 제한 시간이 지나 이미 시간 초과로 기록된 요청은 늦게 끝나도 다시 기록하지 않음
+        if abandoned.is_set():
+            return result
+        if result is None:
+            health.record_empty(elapsed)
+        else:
+            health.record_success(elapsed, hedged)
+        return result
+
+    def fetch(self, *args):
+        """
+        먼저 도착한 정상 응답 반환 (df.attrs['source']에 응답한 소스 이름)
+
+        모든 소스가 비어 있으면 None, 모든 소스가 예외로 실패하면 마지막 예외를 다시 발생시킨다.
+        제한 시간(self.timeout) 안에 응답이 없으면 SourceTimeoutError - 호출자의 재시도/실패 기록으로 처리된다.
+        """
+        remaining = self.ranked_sources()
+        if not remaining:
+            return None
+        pending = {}
+        last_error = None
+        abandoned = threading.Event()
+        deadline = time.monotonic() + self.timeout
+
+        def launch():
+            name = remaining.pop(0)
+            pending[self._executor.submit(self._call, name, args, bool(pending), abandoned)] = name
+            return name
+
+        primary = launch()
+        hedge_after = self.fixed_hedge_after or self.health[primary].hedge_after()
+
+        while pending:
+            time_left = deadline - time.monotonic()
+            if time_left <= 0:
+                # 응답하지 않은 소스는 시간 초과 실패로 기록하고 요청은 버림 (작업 스레드는 응답이 오면 스스로 끝남)
+                abandoned.set()
+                names = list(pending.values())
+                error = SourceTimeoutError(f"{', '.join(names)} 응답 없음 ({self.timeout:g}초 초과)")
+                for name in names:
+                    self.health[name].record_failure(error)
+                raise error from last_error
+            can_hedge = remaining and len(pending) < self.max_parallel
+            timeout = min(hedge_after, time_left) if can_hedge else time_left
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                if can_hedge and time.monotonic() < deadline:
+                    # 지연 기준 초과 → 다음 소스에 헤지 요청
+                    launch()
+                continue
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                if result is not None:
+                    result.attrs['source'] = name
+                    return result
+            # 실패/빈 응답 → 기다리지 않고 다음 소스로
+            if remaining and len(pending) < self.max_parallel:
+                launch()
+
+        if last_error is not None:
+            raise last_error
+        return None
+
+    def health_snapshot(self):
+        return {name: self.health[name].snapshot() for name in self.ranked_sources()}
+
+
+def _available(funcs, order):
+    return [(name, funcs[name][1]) for name in order if module_available(funcs[name][0])]
+
+
+_price_fetcher = None
+_listing_fetcher = None
+_snapshot_fetcher = None
+_fetcher_lock = threading.Lock()
+
+
+def get_price_fetcher():
+    """프로세스 전역 가격 조회기 (설치된 소스만 사용)"""
+    global _price_fetcher
+    if _price_fetcher is None:
+        with _fetcher_lock:
+            if _price_fetcher is None:
+                _price_fetcher = HedgedFetcher(
+                    _available(PRICE_SOURCE_FUNCS, PRICE_SOURCE_ORDER),
+                    normalize_price_frame, label="price-source"
+                )
+    return _price_fetcher
+
+
+def get_listing_fetcher():
+    """프로세스 전역 종목 목록 조회기"""
+    global _listing_fetcher
+    if _listing_fetcher is None:
+        with _fetcher_lock:
+            if _listing_fetcher is None:
+                _listing_fetcher = HedgedFetcher(
+                    _available(LISTING_SOURCE_FUNCS, LISTING_SOURCE_ORDER),
+                    normalize_listing_frame, hedge_after=LISTING_HEDGE_AFTER, label="listing-source",
+                    timeout=LISTING_FETCH_TIMEOUT
+                )
+    return _listing_fetcher
+
+
+def get_snapshot_fetcher():
+    """프로세스 전역 시장 스냅샷 조회기"""
+    global _snapshot_fetcher
+    if _snapshot_fetcher is None:
+        with _fetcher_lock:
+            if _snapshot_fetcher is None:
+                _snapshot_fetcher = HedgedFetcher(
+                    _available(SNAPSHOT_SOURCE_FUNCS, SNAPSHOT_SOURCE_ORDER),
+                    normalize_snapshot_frame, hedge_after=LISTING_HEDGE_AFTER, label="snapshot-source",
+                    timeout=LISTING_FETCH_TIMEOUT
+                )
+    return _snapshot_fetcher
+
+
+def fetch_prices(ticker, start_date, end_date):
+    """price_data 기본 가격 소스: 헤지 요청으로 조회한 공통 형식 DataFrame (없으면 None)"""
+    return get_price_fetcher().fetch(str(ticker).zfill(6), start_date, end_date)
+
+
+def fetch_listing(market="KOSPI"):
+    """시장별 종목 목록 (Code, Name) - 헤지 요청으로 조회 (없으면 None)"""
+    return get_listing_fetcher().fetch(market)
+
+
+def fetch_market_snapshot(market, date):
+    """시장 전 종목의 date 하루 시세 (Code 인덱스 + OHLCV) - 헤지 요청으로 조회 (없으면 None)"""
+    return get_snapshot_fetcher().fetch(market, date)
+
+
+def source_health():
+    """가격/종목 목록 소스별 상태 (서비스 /health 등)"""
+    return {
+        'price': get_price_fetcher().health_snapshot(),
+        'listing': get_listing_fetcher().health_snapshot(),
+        'snapshot': get_snapshot_fetcher().health_snapshot(),
+    }
@@ -0,0 +1,236 @@
+"""
+일목균형표 계산 모듈 (차트 / 역매공파 스캐너 공용)
+
+전환선/기준선/선행스팬/지행스팬을 한 번에 배열 연산으로 계산한다.
+입력은 1차원(한 종목)이나 2차원 패널(종목 x 거래일, 오른쪽 = 최근 봉) 모두 되므로
+시장 전체 일목균형표 조건을 종목 반복 없이 한 번에 걸러낼 수 있다.
+선행스팬은 가격 데이터 끝에서 base_period개 봉만큼 미래까지 실제 값으로 그린다.
+종목별 결과는 (종목, 가격 데이터 버전) 키로 LRU 차트 캐시에 저장해서 차트와 스캐너가 같이 쓴다.
+"""
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from chart_data import price_data_version
+from price_panel import frames_to_panel
+from shared_cache import get_chart_cache
+
+CONVERSION_PERIOD = 9
+BASE_PERIOD = 26
+LEADING_SPAN_B_PERIOD = 52
+
+# 파동 응축 판단 기준 (전환선/기준선 간격이 가격의 1% 미만)
+CONDENSED_GAP_RATIO = 0.01
+
+ICHIMOKU_COLS = ['High', 'Low', 'Close']
+
+
+def rolling_midpoint(high, low, window):
+    """
+    window개 봉 최고가/최저가의 중간값 (마지막 축 기준, 앞쪽 window-1개와 결측이 섞인 구간은 NaN)
+
+    pandas rolling(window).max()/min()과 같은 값이다.
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    result = np.full(high.shape, np.nan)
+    if high.shape[-1] >= window:
+        highest = sliding_window_view(high, window, axis=-1).max(axis=-1)
+        lowest = sliding_window_view(low, window, axis=-1).min(axis=-1)
+        result[..., window - 1:] = (highest + lowest) / 2
+    return result
+
+
+def _shift(values, periods, length):
+    """마지막 축을 periods만큼 뒤로 밀어 길이 length로 (빈 자리는 NaN, 음수면 앞으로)"""
+    result = np.full(values.shape[:-1] + (length,), np.nan)
+    n = values.shape[-1]
+    if periods >= 0:
+        count = min(n, length - periods)
+        if count > 0:
+            result[..., periods:periods + count] = values[..., :count]
+    else:
+        count = min(n + periods, length)
+        if count > 0:
+            result[..., :count] = values[..., -periods:-periods + count]
+    return result
+
+
+def ichimoku_lines(high, low, close, conversion_period=CONVERSION_PERIOD, base_period=BASE_PERIOD,
+                   leading_span_b_period=LEADING_SPAN_B_PERIOD):
+    """
+    일목균형표 전체 선을 배열로 계산 (1차원 또는 2차원 패널)
+
+    Returns:
+        {'tenkan_sen', 'kijun_sen', 'chikou_span': 길이 n,
+         'senkou_span_a', 'senkou_span_b': 길이 n + base_period (뒤쪽 base_period개가 미래 봉)}
+    """
+    close = np.asarray(close, dtype=np.float64)
+    n = close.shape[-1]
+    tenkan = rolling_midpoint(high, low, conversion_period)
+    kijun = rolling_midpoint(high, low, base_period)
+    span_b = rolling_midpoint(high, low, leading_span_b_period)
+    extended = n + base_period
+    return {
+        'tenkan_sen': tenkan,
+        'kijun_sen': kijun,
+        'senkou_span_a': _shift((tenkan + kijun) / 2, base_period, extended),
+        'senkou_span_b': _shift(span_b, base_period, extended),
+        'chikou_span': _shift(close, -base_period, n),
+    }
+
+
+def future_index(index, periods=BASE_PERIOD):
+    """마지막 날짜 뒤 periods개 영업일"""
+    return pd.bdate_range(start=index[-1] + pd.Timedelta(days=1), periods=periods)
+
+
+def calculate_ichimoku(df, conversion_period=CONVERSION_PERIOD, base_period=BASE_PERIOD,
+                       leading_span_b_period=LEADING_SPAN_B_PERIOD):
+    """
+    일목균형표(Ichimoku Cloud) 지표 계산 (미래 구간 포함)
+
+    Returns:
+        {'tenkan_sen', 'kijun_sen', 'chikou_span': df.index 기준 Series,
+         'senkou_span_a', 'senkou_span_b': extended_index 기준 Series,
+         'extended_index': df.index + 미래 base_period 영업일}
+    """
+    lines = ichimoku_lines(df['High'], df['Low'], df['Close'], conversion_period, base_period, leading_span_b_period)
+    extended_index = df.index.append(future_index(df.index, base_period))
+    result = {
+        name: pd.Series(values, index=extended_index if name.startswith('senkou') else df.index, name=name)
+        for name, values in lines.items()
+    }
+    result['extended_index'] = extended_index
+    return result
+
+
+def slice_ichimoku(ichimoku, start):
+    """start 날짜 이후 구간만 (긴 이력으로 계산해 두고 차트 기간만큼 잘라 쓸 때 - 앞쪽 NaN 구간이 없음)"""
+    result = {
+        name: series[series.index >= start]
+        for name, series in ichimoku.items() if name != 'extended_index'
+    }
+    result['extended_index'] = result['senkou_span_a'].index
+    return result
+
+
+def get_ichimoku(ticker, df, version=None):
+    """
+    종목 일목균형표 (LRU 차트 캐시 경유, 키: 종목 + 고가/저가/종가 데이터 버전)
+
+    캐시된 객체이므로 수정하지 말 것.
+    """
+    version = version or price_data_version(df, ICHIMOKU_COLS)
+    cache = get_chart_cache()
+    key = ('ichimoku', str(ticker).zfill(6), version)
+    ichimoku = cache.get(key)
+    if ichimoku is None:
+        ichimoku = calculate_ichimoku(df)
+        cache.set(key, ichimoku)
+    return ichimoku
+
+
+def cloud_signal(tenkan, kijun, close):
+    """
+    전환선/기준선 파동 응축 신호 (배열 입력 가능)
+
+    Returns:
+        {'cloud_ready': 종가 > 전환선 > 기준선 또는 종가 > 기준선 > 전환선,
+         'strength': 간격이 좁을수록 높은 점수 (0~1), 'gap_ratio', 'is_condensed'}
+    """
+    tenkan = np.asarray(tenkan, dtype=np.float64)
+    kijun = np.asarray(kijun, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    avg_price = (tenkan + kijun) / 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gap_ratio = np.where(avg_price > 0, np.abs(tenkan - kijun) / avg_price, 0.0)
+    return {
+        'cloud_ready': ((close > tenkan) & (tenkan > kijun)) | ((close > kijun) & (kijun > tenkan)),
+        'strength': np.maximum(0, 1 - gap_ratio * 100),
+        'gap_ratio': gap_ratio,
+        'is_condensed': gap_ratio < CONDENSED_GAP_RATIO,
+    }
+
+
+def latest_cloud_signal(df):
+    """
+    최근 봉 기준 파동 응축 신호 (역매공파 스캐너의 파란점선 조건)
+
+    Returns:
+        {'cloud_ready', 'strength', 'tenkan', 'kijun', 'close', 'gap_ratio', 'is_condensed', 'reason'}
+        - 전환선/기준선을 계산할 수 없으면 {'cloud_ready': False, 'strength': 0}
+    """
+    # 최근 봉 값만 필요하므로 기준선 기간만큼만 잘라서 계산
+    tail = df.iloc[-BASE_PERIOD:]
+    tenkan = rolling_midpoint(tail['High'], tail['Low'], CONVERSION_PERIOD)[-1]
+    kijun = rolling_midpoint(tail['High'], tail['Low'], BASE_PERIOD)[-1]
+    close = float(tail['Close'].iloc[-1])
+    if np.isnan(tenkan) or np.isnan(kijun):
+        return {'cloud_ready': False, 'strength': 0}
+
+    signal = cloud_signal(tenkan, kijun, close)
+    gap_ratio = float(signal['gap_ratio'])
+    return {
+        'cloud_ready': bool(signal['cloud_ready']),
+        'strength': float(signal['strength']),
+        'tenkan': float(tenkan),
+        'kijun': float(kijun),
+        'close': close,
+        'gap_ratio': gap_ratio,
+        'is_condensed': bool(signal['is_condensed']),
+        'reason': f'파동 응축도: {gap_ratio*100:.2f}%'
+    }
+
+
+def get_ichimoku_signal(ticker, df, version=None):
+    """
+    latest_cloud_signal 결과 (LRU 차트 캐시 경유, 키: 종목 + 고가/저가/종가 데이터 버전)
+
+    스캔마다 종목 수만큼 쌓이므로 전체 선이 아니라 작은 결과 dict만 캐시한다. 수정하지 말 것.
+    """
+    version = version or price_data_version(df, ICHIMOKU_COLS)
+    cache = get_chart_cache()
+    key = ('ichimoku_signal', str(ticker).zfill(6), version)
+    signal = cache.get(key)
+    if signal is None:
+        signal = latest_cloud_signal(df)
+        cache.set(key, signal)
+    return signal
+
+
+def screen_ichimoku(frames, tickers=None):
+    """
+    여러 종목의 최근 봉 일목균형표 신호를 한 번에 계산 (시장 전체 스크리닝용)
+
+    Args:
+        frames: 종목별 OHLC DataFrame 목록
+        tickers: 결과 인덱스로 쓸 종목코드 목록 (None이면 0부터 번호)
+
+    Returns:
+        DataFrame (종목별 tenkan, kijun, close, gap_ratio, strength, cloud_ready, is_condensed)
+        - 전환선/기준선을 계산할 수 없는 종목은 cloud_ready=False, strength=0
+    """
+    columns = ['tenkan', 'kijun', 'close', 'gap_ratio', 'strength', 'cloud_ready', 'is_condensed']
+    index = pd.Index(tickers, name='ticker') if tickers is not None else None
+    if not len(frames):
+        return pd.DataFrame(columns=columns, index=index)
+
+    # 최근 봉 값만 필요하므로 기준선 기간만큼만 잘라서 계산
+    panel, _ = frames_to_panel(frames, ICHIMOKU_COLS)
+    high, low = panel['High'][:, -BASE_PERIOD:], panel['Low'][:, -BASE_PERIOD:]
+    tenkan = rolling_midpoint(high, low, CONVERSION_PERIOD)[:, -1]
+    kijun = rolling_midpoint(high, low, BASE_PERIOD)[:, -1]
+    close = panel['Close'][:, -1]
+
+    signal = cloud_signal(tenkan, kijun, close)
+    valid = ~(np.isnan(tenkan) | np.isnan(kijun))
+    return pd.DataFrame({
+        'tenkan': tenkan,
+        'kijun': kijun,
+        'close': close,
+        'gap_ratio': signal['gap_ratio'],
+        'strength': np.where(valid, signal['strength'], 0.0),
+        'cloud_ready': signal['cloud_ready'] & valid,
+        'is_condensed': signal['is_condensed'] & valid,
+    }, columns=columns, index=index)
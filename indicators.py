@@ -0,0 +1,90 @@
+"""
+차트 지표 계산 모듈
+
+Streamlit에 의존하지 않으므로 차트 탭뿐 아니라 백그라운드 프리페치 스레드에서도 호출할 수 있다.
+일목균형표는 역매공파 스캐너와 같이 쓰는 ichimoku.py에 있다.
+"""
+import numpy as np
+
+from candlestick import detect_patterns
+
+# =============== 패턴 감지 함수 ===============
+
+# 차트에 표시하는 상승 패턴: (엔진 패턴 이름, 표시 이름, 강도, 양수(강세) 신호만 사용)
+BULLISH_PATTERNS = (
+    ('CDLMORNINGSTAR', '🌅 Morning Star (아침별)', 'Strong', False),
+    ('CDLENGULFING', '📈 Bullish Engulfing (강세 포함)', 'Strong', True),
+    ('CDLPIERCING', '⬆️ Piercing (관통)', 'Medium', False),
+    ('CDL3WHITESOLDIERS', '⚪⚪⚪ Three White Soldiers (세 병사)', 'Strong', False),
+    ('CDLHARAMI', '💫 Bullish Harami (강세 하라미)', 'Medium', True),
+    ('CDLHAMMER', '🔨 Hammer (망치)', 'Medium', False),
+)
+
+
+def detect_bullish_patterns(df):
+    """
+    NumPy 캔들 패턴 엔진(candlestick.py)으로 상승 패턴 감지 (TA-Lib 없이 동작, TA-Lib과 같은 판정)
+
+    Returns:
+        list: 패턴 정보 리스트 [{'date': 날짜, 'pattern': 패턴명, 'price': 종가, 'strength': 강도}, ...] (최신순)
+    """
+    if df is None or len(df) < 30:
+        return []
+
+    patterns = []
+
+    try:
+        close_arr = df['Close'].to_numpy(dtype=np.float64)
+        signals = detect_patterns(
+            df['Open'].to_numpy(dtype=np.float64), df['High'].to_numpy(dtype=np.float64),
+            df['Low'].to_numpy(dtype=np.float64), close_arr,
+            names=[name for name, _, _, _ in BULLISH_PATTERNS]
+        )
+
+        for name, label, strength, bullish_only in BULLISH_PATTERNS:
+            hits = np.flatnonzero(signals[name] > 0 if bullish_only else signals[name] != 0)
+            dates = df.index[hits].strftime('%Y-%m-%d')
+            patterns.extend(
+                {'date': date, 'pattern': label, 'price': price, 'strength': strength}
+                for date, price in zip(dates, close_arr[hits].tolist())
+            )
+
+        # 날짜순 정렬 (패턴 종류마다 날짜는 한 번씩만 나옴)
+        patterns.sort(key=lambda x: x['date'], reverse=True)  # 최신순 정렬
+
+    except Exception as e:
+        print(f"⚠️ 패턴 감지 중 오류: {str(e)}")
+        return []
+
+    return patterns
+
+
+# =============== 차트 탭 지표 ===============
+
+def compute_chart_indicators(df):
+    """
+    차트 탭에 표시하는 지표 일괄 계산
+
+    이동평균선(5/20/60/112/224), MACD(12/26/9), 변동성(20일)을 컬럼으로 추가한 복사본 반환
+    """
+    df = df.copy()
+    close = df['Close']
+
+    # 이동평균선
+    df['MA5'] = close.rolling(window=5).mean()
+    df['MA20'] = close.rolling(window=20).mean()
+    df['MA60'] = close.rolling(window=60).mean()
+    df['MA112'] = close.rolling(window=112).mean()
+    df['MA224'] = close.rolling(window=224).mean()
+
+    # MACD
+    ema_fast = close.ewm(span=12).mean()
+    ema_slow = close.ewm(span=26).mean()
+    df['MACD'] = ema_fast - ema_slow
+    df['Signal'] = df['MACD'].ewm(span=9).mean()
+    df['MACD_Hist'] = df['MACD'] - df['Signal']
+
+    # 변동성
+    df['Volatility'] = close.rolling(window=20).std() / close.rolling(window=20).mean() * 100
+
+    return df
@@ -0,0 +1,93 @@
+"""
+지연 import 및 시작 시간 측정 모듈
+
+FinanceDataReader, requests, bs4, talib, plotly.express 같은 무거운 모듈은 실제로 쓰는 코드 경로에서
+처음 접근할 때 import한다. 모듈 존재 여부는 import 없이 확인하고(module_available),
+import와 초기화 구간에 걸린 시간은 기록해 두었다가 시작 시간 보고서로 보여준다.
+"""
+import importlib
+import importlib.util
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+_timings_lock = threading.Lock()
+_timings = {}  # 이름 -> (종류, 소요 시간 초)
+
+
+def record_timing(name, seconds, kind='import'):
+    """시작 시간 보고서에 구간 하나 기록 (같은 이름은 마지막 값으로 갱신)"""
+    with _timings_lock:
+        _timings[name] = (kind, seconds)
+
+
+@contextmanager
+def timed(name, kind='block'):
+    """with 블록의 실행 시간 기록"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(name, time.perf_counter() - started, kind)
+
+
+def module_available(name):
+    """모듈을 import하지 않고 설치 여부만 확인"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def timed_import(name):
+    """모듈 import (처음 import할 때 걸린 시간을 기록)"""
+    if name in sys.modules:
+        return sys.modules[name]
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    record_timing(name, time.perf_counter() - started, 'import')
+    return module
+
+
+class LazyModule:
+    """속성에 처음 접근할 때 실제 모듈을 import하는 대리 객체"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = timed_import(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def lazy_module(name):
+    """모듈 이름으로 LazyModule 생성 - 모듈 최상단에서 `talib = lazy_module('talib')`처럼 사용"""
+    return LazyModule(name)
+
+
+def startup_report():
+    """기록된 구간을 오래 걸린 순으로 반환 [(이름, 종류, 초), ...]"""
+    with _timings_lock:
+        items = [(name, kind, seconds) for name, (kind, seconds) in _timings.items()]
+    return sorted(items, key=lambda item: item[2], reverse=True)
+
+
+def format_startup_report():
+    """시작 시간 보고서를 콘솔 출력용 문자열로"""
+    lines = ["⏱️ 시작 시간 보고서"]
+    for name, kind, seconds in startup_report():
+        lines.append(f"  {seconds * 1000:8.1f}ms  [{kind}] {name}")
+    return "\n".join(lines)
@@ -0,0 +1,222 @@
+"""
+네거티브 캐시 모듈
+
+상장한 지 얼마 안 된 종목, 거래정지/상장폐지 종목은 매 스캔마다 내려받은 뒤 캔들 수가 부족해서
+버려지거나, 가격 소스가 계속 실패해서 재시도 대기 시간만 쓰고 끝난다.
+종목별 실행 기록(scan_metrics.TickerRecord)을 보고 분석기+종목 단위로
+"캔들 부족 - X일까지", "가격 소스 실패 - X일까지"를 기록해 두고, 스캔 시작 전에 해당 종목을 건너뛴다.
+
+- 캔들 부족: 부족한 캔들 수만큼 거래일이 지나야 조건을 채울 수 있으므로 그때까지 (최대 30일)
+- 가격 소스 실패: 연속 2회 이상 실패한 종목만, 1일 → 2일 → 4일 → 7일로 늘려가며 (모든 분석기 공통)
+- 분석에 성공하면 해당 기록은 바로 지운다
+"""
+import json
+import math
+import os
+import threading
+from datetime import datetime, timedelta
+
+from price_data import price_source_name
+
+NEGATIVE_CACHE_FILE = "negative_cache.json"
+
+# 캔들 부족 기록 최대 유지 일수 (잘못 기록되어도 이 기간 뒤에는 다시 확인)
+MAX_INSUFFICIENT_DAYS = 30
+
+# 가격 소스 실패: 이 횟수 이상 연속 실패해야 건너뜀, 최대 유지 일수
+FETCH_FAILURE_THRESHOLD = 2
+MAX_FETCH_FAILURE_DAYS = 7
+
+# 모든 분석기에 적용되는 기록 (가격 소스 실패)
+ALL_DETECTORS = '*'
+
+
+def _today():
+    return datetime.now().date()
+
+
+class NegativeCache:
+    """분석기+종목별 건너뛰기 기록 (JSON 파일로 저장, 스레드 안전)"""
+
+    def __init__(self, data_dir="analysis_data"):
+        self.filepath = os.path.join(data_dir, NEGATIVE_CACHE_FILE)
+        self._lock = threading.Lock()
+        self._entries = self._load()
+        self._dirty = False
+
+    def _load(self):
+        try:
+            with open(self.filepath, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"⚠️ 네거티브 캐시 로드 실패 (새로 시작): {str(e)}")
+            return {}
+
+    @staticmethod
+    def _key(detector, ticker):
+        return f"{detector}:{str(ticker).zfill(6)}"
+
+    def _active_entry(self, detector, ticker, today, source):
+        """지금 건너뛰어야 하는 기록 (self._lock 보유 상태에서 호출)"""
+        entry = self._entries.get(self._key(detector, ticker))
+        if entry and entry['until'] > today:
+            return entry
+        entry = self._entries.get(self._key(ALL_DETECTORS, ticker))
+        if (entry and entry['until'] > today and entry.get('source') == source
+                and entry.get('failures', 0) >= FETCH_FAILURE_THRESHOLD):
+            return entry
+        return None
+
+    def lookup(self, detector, ticker):
+        """건너뛰기 기록 dict (reason, until, ...) 또는 None"""
+        today = _today().isoformat()
+        with self._lock:
+            entry = self._active_entry(detector, ticker, today, price_source_name())
+            return dict(entry) if entry else None
+
+    def filter_stocks(self, detector, stocks):
+        """
+        건너뛸 종목을 뺀 종목 목록
+
+        Args:
+            stocks: Code 컬럼이 있는 DataFrame 또는 (ticker, name) 튜플 리스트
+
+        Returns:
+            (남은 종목 목록 - 입력과 같은 형태, 건너뛴 이유별 종목 수 dict)
+        """
+        today = _today().isoformat()
+        source = price_source_name()
+        with self._lock:
+            if not self._entries:
+                return stocks, {}
+            is_frame = hasattr(stocks, 'columns')
+            tickers = stocks['Code'] if is_frame else [ticker for ticker, _ in stocks]
+            reasons = [self._active_entry(detector, ticker, today, source) for ticker in tickers]
+
+        skipped = {}
+        for entry in reasons:
+            if entry:
+                skipped[entry['reason']] = skipped.get(entry['reason'], 0) + 1
+        if not skipped:
+            return stocks, {}
+
+        keep = [entry is None for entry in reasons]
+        if is_frame:
+            return stocks[keep].reset_index(drop=True), skipped
+        return [stock for stock, k in zip(stocks, keep) if k], skipped
+
+    def observe(self, detector, record):
+        """종목 실행 기록 하나로 네거티브 캐시 갱신"""
+        if record is None or record.status is None:
+            return
+        today = _today()
+        key = self._key(detector, record.ticker)
+        fetch_key = self._key(ALL_DETECTORS, record.ticker)
+
+        with self._lock:
+            if record.status == 'ok':
+                removed = [self._entries.pop(k, None) for k in (key, fetch_key)]
+                self._dirty = self._dirty or any(entry is not None for entry in removed)
+            elif record.status == 'insufficient_bars' and record.required_bars:
+                # 하루 한 개씩 캔들이 늘어나므로 부족분(거래일)을 달력 일수로 환산
+                shortage = max(1, record.required_bars - (record.bars or 0))
+                days = min(MAX_INSUFFICIENT_DAYS, math.ceil(shortage * 7 / 5))
+                self._entries[key] = {
+                    'reason': 'insufficient_bars',
+                    'until': (today + timedelta(days=days)).isoformat(),
+                    'bars': record.bars,
+                    'required': record.required_bars,
+                    'updated': today.isoformat(),
+                }
+                self._entries.pop(fetch_key, None)
+                self._dirty = True
+            elif record.status == 'fetch_failed':
+                previous = self._entries.get(fetch_key)
+                failures = 1
+                if previous and previous.get('source') == record.source:
+                    failures = previous.get('failures', 0) + (previous.get('updated') != today.isoformat())
+                days = min(MAX_FETCH_FAILURE_DAYS, 2 ** max(0, failures - FETCH_FAILURE_THRESHOLD))
+                self._entries[fetch_key] = {
+                    'reason': 'fetch_failed',
+                    'until': (today + timedelta(days=days)).isoformat(),
+                    'failures': max(1, failures),
+                    'source': record.source,
+                    'exception': record.exception,
+                    'updated': today.isoformat(),
+                }
+                self._dirty = True
+
+    def observer(self, detector):
+        """scan_metrics.ticker_run(observer=...)에 넘길 콜백"""
+        return lambda record: self.observe(detector, record)
+
+    def prune(self):
+        """
+        만료된 기록 삭제 → 삭제 개수
+
+        가격 소스 실패 기록은 연속 실패 횟수를 이어가야 하므로 만료 후 MAX_FETCH_FAILURE_DAYS일 더 보관한다.
+        """
+        today = _today()
+        fetch_cutoff = (today - timedelta(days=MAX_FETCH_FAILURE_DAYS)).isoformat()
+        today = today.isoformat()
+        with self._lock:
+            expired = [key for key, entry in self._entries.items()
+                       if entry['until'] <= (fetch_cutoff if entry['reason'] == 'fetch_failed' else today)]
+            for key in expired:
+                del self._entries[key]
+            if expired:
+                self._dirty = True
+        return len(expired)
+
+    def clear(self, detector=None):
+        """기록 삭제 (detector를 주면 해당 분석기 기록만)"""
+        with self._lock:
+            if detector is None:
+                self._entries.clear()
+            else:
+                prefix = f"{detector}:"
+                for key in [k for k in self._entries if k.startswith(prefix)]:
+                    del self._entries[key]
+            self._dirty = True
+
+    def save(self):
+        """변경된 기록을 파일로 저장 (원자적 교체)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = dict(self._entries)
+            self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.filepath) or '.', exist_ok=True)
+            tmp_path = f"{self.filepath}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.filepath)
+        except Exception as e:
+            print(f"⚠️ 네거티브 캐시 저장 실패: {str(e)}")
+
+    def stats(self):
+        """이유별 기록 수"""
+        with self._lock:
+            counts = {}
+            for entry in self._entries.values():
+                counts[entry['reason']] = counts.get(entry['reason'], 0) + 1
+            return counts
+
+
+_negative_caches = {}
+_negative_caches_lock = threading.Lock()
+
+
+def get_negative_cache(data_dir="analysis_data"):
+    """데이터 디렉토리별 NegativeCache 인스턴스 (같은 디렉토리면 같은 인스턴스)"""
+    path = os.path.abspath(data_dir)
+    cache = _negative_caches.get(path)
+    if cache is None:
+        with _negative_caches_lock:
+            cache = _negative_caches.get(path)
+            if cache is None:
+                cache = _negative_caches[path] = NegativeCache(data_dir)
+    return cache
@@ -0,0 +1,322 @@
+"""
+공유 가격 데이터 로더
+
+모든 분석기와 차트가 같은 종목의 가격 데이터를 각자 내려받지 않도록,
+프로세스 공용 캐시(SharedCache)를 거쳐 가격 이력을 조회한다.
+같은 날 더 긴 기간이 이미 조회되어 있으면 네트워크 요청 없이 잘라서 반환한다.
+기본 가격 소스는 data_sources의 헤지 조회 (FinanceDataReader → pykrx → yfinance)이다.
+
+캐시에는 정수 압축 형식(price_store.CompactPrices)으로 보관하고, 기본 소스로 받은 데이터는
+디스크 저장소(analysis_data/price_store)에도 남겨서 프로세스를 다시 시작해도 바로 읽는다.
+저장된 이력이 오래되면 전체 기간을 다시 받지 않고 마지막 날짜 이후 며칠치만 받아서 덧붙이고,
+장 마감 후에는 시장 전체 스냅샷(요청 한 번에 전 종목 하루치)으로 저장소를 한꺼번에 갱신한다.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+
+from shared_cache import get_shared_cache
+from data_sources import fetch_prices, fetch_market_snapshot, PRICE_COLUMNS
+from price_store import (
+    CompactPrices, get_price_store, day_ordinal, ordinal_date, previous_weekday,
+    is_market_open, last_market_close, MARKET_CLOSE,
+)
+from scan_metrics import timed_stage, current_ticker_record, active_stage_timers, collect_stage_timings
+
+# 가격 데이터 캐시 유효 시간 (장중 갱신을 고려해 30분)
+PRICE_TTL_SECONDS = 30 * 60
+
+# 증분 조회: 마지막 저장일 며칠 전부터 다시 받아서 장중에 저장된 미완성 캔들도 교체
+INCREMENTAL_OVERLAP_DAYS = 5
+# 마지막 저장일이 이보다 오래되면 증분 대신 전체 기간 재조회
+MAX_INCREMENTAL_DAYS = 60
+
+# 기본 소스 이름 (실제로 응답한 소스는 df.attrs['source']로 전달됨)
+DEFAULT_SOURCE_NAME = 'hedged'
+
+_price_source = fetch_prices
+_price_source_name = DEFAULT_SOURCE_NAME
+
+
+def set_price_source(source, name=None):
+    """
+    가격 데이터 소스 교체
+
+    source(ticker, start_date, end_date) -> DataFrame 형태의 함수.
+    None을 넘기면 기본 다중 소스 헤지 조회로 되돌린다.
+    name은 종목별 실행 로그에 남는 소스 이름 (기본: 함수 이름)
+    """
+    global _price_source, _price_source_name
+    if source is None:
+        _price_source, _price_source_name = fetch_prices, DEFAULT_SOURCE_NAME
+    else:
+        _price_source = source
+        _price_source_name = name or getattr(source, '__qualname__', type(source).__name__)
+
+
+def price_source_name():
+    """현재 가격 소스 이름 (실행 로그/네거티브 캐시에서 소스 구분용)"""
+    return _price_source_name
+
+
+def _fetch_with_retries(ticker, days, min_rows, retries):
+    """
+    가격 소스에서 데이터 조회 (min_rows 미만이거나 실패하면 재시도)
+
+    Returns:
+        (DataFrame 또는 None, 조회 정보 dict - 소스, 시도 횟수, 재시도 대기 시간, 소요 시간, 마지막 예외)
+    """
+    df = None
+    info = {'source': _price_source_name, 'attempts': 0, 'retry_wait': 0.0, 'seconds': 0.0,
+            'exception': None, 'message': None}
+    started = time.perf_counter()
+    for attempt in range(retries):
+        info['attempts'] = attempt + 1
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=days)
+        with timed_stage('fetch'):
+            try:
+                df = _price_source(ticker, start_date, end_date)
+            except Exception as e:
+                # 소스 예외는 재시도 대상이므로 단계 실패로 기록하지 않고 조회 정보에만 남김
+                df = None
+                info['exception'] = type(e).__name__
+                info['message'] = str(e)[:200]
+        if df is not None:
+            # 헤지 조회는 실제로 응답한 소스 이름을 남김
+            info['source'] = df.attrs.get('source', _price_source_name)
+            if len(df) >= min_rows:
+                break
+        if attempt < retries - 1:
+            time.sleep(0.5)
+            info['retry_wait'] += 0.5
+    info['seconds'] = time.perf_counter() - started
+    return df, info
+
+
+def get_price_history(ticker, days, min_rows=0, retries=1, share=True):
+    """
+    종목의 최근 days일 가격 데이터 조회 (프로세스 공용 캐시 경유)
+
+    Args:
+        ticker: 종목코드 (6자리로 패딩됨)
+        days: 조회 기간 (달력 기준 일수)
+        min_rows: 이 개수 미만이면 재시도 (재시도 후에도 부족하면 그대로 반환)
+        retries: 최대 시도 횟수
+        share: False면 공용 캐시에 이미 있는 데이터만 재사용하고 새로 조회한 결과는 공용 캐시에 남기지 않음
+               (차트처럼 자체 메모리 예산 캐시를 가진 호출자가 같은 데이터를 두 번 들고 있지 않도록)
+
+    Returns:
+        float64 DataFrame (호출마다 새로 만들어서 호출자가 자유롭게 수정 가능) 또는 None
+    """
+    ticker = str(ticker).zfill(6)
+    cache = get_shared_cache()
+    today = datetime.now().strftime("%Y-%m-%d")
+    cover_key = ('price', ticker, today)
+
+    # 이 호출에서 직접 조회했는지 (아니면 캐시 적중 또는 다른 스레드의 조회를 기다림)
+    fetched_here = []
+
+    def fetch(use_store=True):
+        stored = _load_stored(ticker, days) if use_store else None
+        if stored is not None:
+            if stored[2]['attempts']:
+                fetched_here.append(True)
+            return stored
+        fetched_here.append(True)
+        df, info = _fetch_with_retries(ticker, days, min_rows, retries)
+        info['min_rows'], info['retries'] = min_rows, retries
+        prices = CompactPrices.from_frame(df) if df is not None else None
+        if prices is not None and _price_source is fetch_prices:
+            get_price_store().save(ticker, prices, day_ordinal(datetime.now()) - days, info['source'])
+        return (days, prices, info)
+
+    cached = cache.get(cover_key)
+    if cached is None or cached[0] < days:
+        if not share:
+            cached = fetch()
+        else:
+            cached = cache.get_or_compute(('price_fetch', ticker, today, days), fetch, ttl=PRICE_TTL_SECONDS)
+            current = cache.get(cover_key)
+            if current is None or current[0] < cached[0]:
+                cache.set(cover_key, cached, ttl=PRICE_TTL_SECONDS)
+    df = _cached_frame(cached, days)
+
+    if min_rows and (df is None or len(df) < min_rows) and _less_strict(cached[2], min_rows, retries):
+        # min_rows/retries가 더 느슨한 호출자가 남긴 짧은(실패한) 결과 → 이 호출의 조건으로 소스에서 다시 조회
+        # (조건별 키라서 같은 조건의 다음 호출은 다시 조회하지 않음)
+        if not share:
+            cached = fetch(use_store=False)
+        else:
+            cached = cache.get_or_compute(('price_fetch', ticker, today, days, min_rows, retries),
+                                          lambda: fetch(use_store=False), ttl=PRICE_TTL_SECONDS)
+            current = cache.get(cover_key)
+            if current is None or (current[0] <= cached[0] and _row_count(cached) > _row_count(current)):
+                cache.set(cover_key, cached, ttl=PRICE_TTL_SECONDS)
+        df = _cached_frame(cached, days)
+
+    info = cached[2]
+    record = current_ticker_record()
+    if record is not None:
+        record.note_fetch(info, not fetched_here, len(df) if df is not None else None)
+    return df
+
+
+def _cached_frame(cached, days):
+    """캐시 항목 (조회 기간, CompactPrices, 조회 정보)에서 최근 days일 float64 DataFrame (데이터가 없으면 None)"""
+    fetched_days, prices, _ = cached
+    if prices is None:
+        return None
+    # 지표 계산용 float64 DataFrame은 여기서만 만듦 (호출마다 새 배열이라 복사 불필요)
+    start_date = None
+    if fetched_days > days:
+        start_date = (datetime.now() - timedelta(days=days)).date()
+    return prices.to_frame(start_date)
+
+
+def _row_count(cached):
+    """캐시 항목의 캔들 수 (조회 실패면 0)"""
+    return len(cached[1]) if cached[1] is not None else 0
+
+
+def _less_strict(info, min_rows, retries):
+    """캐시 항목을 만든 조회가 이번 호출보다 느슨한 조건(min_rows/retries)이었는지 (저장소에서 읽은 항목은 0/0)"""
+    return info.get('min_rows', 0) < min_rows or info.get('retries', 0) < retries
+
+
+def _load_stored(ticker, days):
+    """
+    디스크 저장소에 기간을 덮는 데이터가 있으면 캐시 항목 형태로 반환
+
+    오래된 데이터는 마지막 저장일 이후만 증분 조회해서 덧붙인다 (증분 조회가 안 되면 None → 전체 조회).
+    """
+    if _price_source is not fetch_prices:
+        return None
+    store = get_price_store()
+    stored = store.load(ticker)
+    if stored is None:
+        return None
+    prices, meta = stored
+    today = day_ordinal(datetime.now())
+    if meta['start_day'] > today - days or not len(prices):
+        return None
+
+    info = {'source': f"store:{meta['source']}", 'attempts': 0, 'retry_wait': 0.0, 'seconds': 0.0,
+            'exception': None, 'message': None}
+    if not store.is_fresh(meta['saved_at'], PRICE_TTL_SECONDS):
+        gap = today - prices.last_day + INCREMENTAL_OVERLAP_DAYS
+        if gap > MAX_INCREMENTAL_DAYS:
+            return None
+        df, info = _fetch_with_retries(ticker, gap, 0, 1)
+        if df is None:
+            return None
+        prices = prices.merge(CompactPrices.from_frame(df))
+        store.save(ticker, prices, meta['start_day'], info['source'])
+    return (today - meta['start_day'], prices, info)
+
+
+def _close_timestamp(day):
+    date = ordinal_date(day)
+    return datetime(date.year, date.month, date.day, *MARKET_CLOSE).timestamp()
+
+
+def apply_market_snapshot(snapshot, date, source=None):
+    """
+    시장 스냅샷(Code 인덱스 + OHLCV)의 date 캔들을 저장된 이력에 덧붙임
+
+    직전 평일 장 마감까지 빠짐없이 저장된 종목만 갱신한다 (그 밖의 종목은 조회 시 증분 조회).
+    대부분 종목의 시세가 마지막 저장 캔들과 같으면 휴장일로 보고 적용하지 않는다.
+
+    Returns:
+        갱신한 종목 수
+    """
+    store = get_price_store()
+    day = day_ordinal(date)
+    prev_day = previous_weekday(day)
+    updates = []
+    unchanged = 0
+    for code, bar in zip(snapshot.index, snapshot[PRICE_COLUMNS].to_numpy(dtype=np.float64)):
+        stored = store.load(code)
+        if stored is None or not len(stored[0]):
+            continue
+        prices, meta = stored
+        if prices.last_day == day:
+            if meta['saved_at'] >= _close_timestamp(day):
+                continue
+        elif prices.last_day == prev_day and meta['saved_at'] >= _close_timestamp(prev_day):
+            unchanged += np.allclose(prices.last_bar(), bar)
+        else:
+            continue
+        updates.append((code, prices, meta, bar))
+
+    if updates and unchanged * 2 > len(updates):
+        print(f"⚠️ 시장 스냅샷이 직전 거래일과 같아 적용하지 않음 ({ordinal_date(day)} 휴장일로 판단)")
+        return 0
+
+    index = pd.DatetimeIndex([pd.Timestamp(ordinal_date(day))], name='Date')
+    for code, prices, meta, bar in updates:
+        bar_frame = pd.DataFrame([bar], columns=PRICE_COLUMNS, index=index)
+        store.save(code, prices.merge(CompactPrices.from_frame(bar_frame)), meta['start_day'], source)
+    return len(updates)
+
+
+def refresh_market_snapshots(markets, now=None):
+    """
+    시장별 스냅샷을 한 번씩 조회해서 저장소를 한꺼번에 갱신 (장중에는 캔들이 미완성이라 건너뜀)
+
+    Returns:
+        갱신한 종목 수
+    """
+    if _price_source is not fetch_prices or not markets:
+        return 0
+    now = now or datetime.now()
+    if is_market_open(now):
+        return 0
+
+    date = last_market_close(now).date()
+    updated = 0
+    for market in markets:
+        try:
+            with timed_stage('snapshot'):
+                snapshot = fetch_market_snapshot(market, date)
+        except Exception as e:
+            print(f"⚠️ {market} 시장 스냅샷 조회 실패: {str(e)}")
+            continue
+        if snapshot is not None:
+            updated += apply_market_snapshot(snapshot, date, snapshot.attrs.get('source'))
+    if updated:
+        print(f"✓ 시장 스냅샷으로 {updated}개 종목 가격 갱신 ({date})")
+    return updated
+
+
+def prefetch_price_histories(tickers, days, workers=8, min_rows=0, retries=2, markets=None):
+    """
+    여러 종목의 가격 데이터를 병렬로 미리 조회해서 공용 캐시를 채움
+
+    이후 분석기들이 같은 날 days 이하 기간을 조회하면 네트워크 요청 없이 캐시에서 잘라 쓴다.
+    markets를 주면 먼저 시장 스냅샷으로 저장소를 갱신해서 종목별 조회를 줄인다.
+    호출 스레드에서 수집 중인 단계 타이머(collect_stage_timings)에 작업 스레드의 fetch 시간도 기록한다.
+
+    Returns:
+        조회에 성공한 종목 수
+    """
+    if markets:
+        refresh_market_snapshots(markets)
+    timers = active_stage_timers()
+
+    def fetch(ticker):
+        # 단계 타이머는 스레드별이므로 작업 스레드에서 호출 스레드의 타이머를 다시 연결
+        with ExitStack() as stack:
+            for timer in timers:
+                stack.enter_context(collect_stage_timings(timer))
+            try:
+                return get_price_history(ticker, days, min_rows=min_rows, retries=retries) is not None
+            except Exception:
+                return False
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="price-prefetch") as executor:
+        return sum(executor.map(fetch, tickers))
+
@@ -0,0 +1,28 @@
+"""
+종목 x 거래일 가격 패널 모듈
+
+종목별 DataFrame 목록을 오른쪽(최근 봉) 기준으로 맞춘 2차원 배열로 바꾼다.
+캔들 패턴/일목균형표/저점 추세 같은 배열 연산 지표를 시장 전체에 한 번에 적용할 때 공통 입력으로 쓴다.
+"""
+import numpy as np
+
+
+def frames_to_panel(frames, columns=('Open', 'High', 'Low', 'Close')):
+    """
+    종목별 OHLC DataFrame 목록 → 오른쪽(최근 봉) 기준으로 맞춘 (종목 x 거래일) 배열
+
+    짧은 이력은 앞쪽을 NaN으로 채운다 (날짜가 아니라 각 종목 자신의 봉 순서 기준).
+
+    Returns:
+        ({컬럼: 2차원 배열}, 종목별 이력 길이 배열)
+    """
+    lengths = np.array([len(df) for df in frames], dtype=np.int64)
+    width = int(lengths.max()) if len(frames) else 0
+    panel = {}
+    for col in columns:
+        values = np.full((len(frames), width), np.nan)
+        for row, df in enumerate(frames):
+            if len(df):
+                values[row, width - len(df):] = df[col].to_numpy(dtype=np.float64)
+        panel[col] = values
+    return panel, lengths
@@ -0,0 +1,214 @@
+"""
+정수 압축 가격 저장소
+
+KRX 가격은 원 단위 정수, 거래량도 정수인데 pandas float64 DataFrame으로 들고 있으면
+종목 하나(500거래일)에 인덱스 포함 약 24KB를 쓴다. CompactPrices는 가격을 int32, 거래량을 int64,
+날짜를 int32 일 수(1970-01-01 기준)로 저장해서 약 14KB로 줄이고,
+지표 계산 직전에만 float64 DataFrame으로 변환한다.
+
+소수점이 있는 가격(해외 소스, 합성 데이터 등)은 100배 해서 정수로 저장한다 (0.01원 단위).
+
+PriceStore는 종목별 .npz 파일 디스크 저장소로, 프로세스를 다시 시작해도 네트워크 없이 바로 읽는다.
+저장된 이력은 merge()로 최근 며칠치(종목별 증분 조회 또는 시장 전체 스냅샷)만 덧붙여 갱신한다.
+"""
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+OHLC_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+# 소수점 가격 저장 배율
+FRACTIONAL_PRICE_SCALE = 100
+INT32_MAX = np.iinfo(np.int32).max
+
+# 장 운영 시간 (이 시간 밖에서는 마지막 종가 이후 저장된 데이터가 바뀌지 않음)
+MARKET_OPEN = (9, 0)
+MARKET_CLOSE = (15, 30)
+
+
+def day_ordinal(date):
+    """날짜 → 1970-01-01 기준 일 수"""
+    return int(np.datetime64(pd.Timestamp(date).date(), 'D').astype(np.int64))
+
+
+def ordinal_date(day):
+    """1970-01-01 기준 일 수 → date"""
+    return pd.Timestamp(np.datetime64(int(day), 'D')).date()
+
+
+def previous_weekday(day):
+    """직전 평일의 일 수 (공휴일은 고려하지 않음)"""
+    day -= 1
+    while ordinal_date(day).weekday() >= 5:
+        day -= 1
+    return day
+
+
+class CompactPrices:
+    """종목 하나의 정수 압축 OHLCV"""
+
+    __slots__ = ('days', 'ohlc', 'volume', 'scale')
+
+    def __init__(self, days, ohlc, volume, scale=1):
+        self.days = days        # int32 [n] - 1970-01-01 기준 일 수
+        self.ohlc = ohlc        # int32 [n, 4] - 가격 x scale
+        self.volume = volume    # int64 [n]
+        self.scale = scale
+
+    @classmethod
+    def from_frame(cls, df):
+        """DatetimeIndex + OHLCV DataFrame → CompactPrices (결측 행은 제외)"""
+        df = df[PRICE_COLUMNS].apply(pd.to_numeric, errors='coerce').dropna()
+        index = pd.DatetimeIndex(df.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        days = index.normalize().values.astype('datetime64[D]').astype(np.int64).astype(np.int32)
+
+        prices = df[OHLC_COLUMNS].to_numpy(dtype=np.float64)
+        scale = 1 if np.array_equal(prices, np.round(prices)) else FRACTIONAL_PRICE_SCALE
+        if scale > 1 and len(prices) and np.abs(prices).max() * scale > INT32_MAX:
+            scale = 1
+        ohlc = np.round(prices * scale).astype(np.int32)
+        volume = np.round(df['Volume'].to_numpy(dtype=np.float64)).astype(np.int64)
+        return cls(days, ohlc, volume, scale)
+
+    def __len__(self):
+        return len(self.days)
+
+    @property
+    def nbytes(self):
+        return self.days.nbytes + self.ohlc.nbytes + self.volume.nbytes
+
+    @property
+    def last_day(self):
+        return int(self.days[-1]) if len(self.days) else None
+
+    def last_bar(self):
+        """마지막 캔들 [Open, High, Low, Close, Volume] (float64)"""
+        return np.append(self.ohlc[-1] / self.scale, self.volume[-1])
+
+    def merge(self, newer):
+        """newer의 캔들을 덧붙인 새 CompactPrices (같은 날짜는 newer 값으로 교체)"""
+        combined = pd.concat([self.to_frame(), newer.to_frame()])
+        combined = combined[~combined.index.duplicated(keep='last')].sort_index()
+        return CompactPrices.from_frame(combined)
+
+    def to_frame(self, start_date=None):
+        """
+        지표 계산용 float64 DataFrame (start_date 이후만)
+
+        매번 새 배열을 만들므로 호출자가 자유롭게 수정해도 된다.
+        """
+        start = 0
+        if start_date is not None:
+            start_day = np.datetime64(pd.Timestamp(start_date).date(), 'D').astype(np.int64)
+            start = int(np.searchsorted(self.days, start_day))
+
+        ohlc = self.ohlc[start:].astype(np.float64)
+        if self.scale != 1:
+            ohlc /= self.scale
+        index = pd.DatetimeIndex(self.days[start:].astype('datetime64[D]').astype('datetime64[ns]'), name='Date')
+        return pd.DataFrame({
+            'Open': ohlc[:, 0],
+            'High': ohlc[:, 1],
+            'Low': ohlc[:, 2],
+            'Close': ohlc[:, 3],
+            'Volume': self.volume[start:].astype(np.float64),
+        }, index=index)
+
+
+def last_market_close(now=None):
+    """now 이전의 가장 최근 장 마감 시각 (주말은 건너뜀, 공휴일은 고려하지 않음)"""
+    now = now or datetime.now()
+    close = now.replace(hour=MARKET_CLOSE[0], minute=MARKET_CLOSE[1], second=0, microsecond=0)
+    if now < close:
+        close -= timedelta(days=1)
+    while close.weekday() >= 5:
+        close -= timedelta(days=1)
+    return close
+
+
+def is_market_open(now=None):
+    now = now or datetime.now()
+    if now.weekday() >= 5:
+        return False
+    return MARKET_OPEN <= (now.hour, now.minute) < MARKET_CLOSE
+
+
+class PriceStore:
+    """종목별 CompactPrices 디스크 저장소 ({ticker}.npz)"""
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+
+    def _path(self, ticker):
+        return os.path.join(self.store_dir, f"{str(ticker).zfill(6)}.npz")
+
+    def save(self, ticker, prices, start_day, source=None):
+        """
+        저장 (임시 파일에 쓴 뒤 교체)
+
+        start_day: 이 날짜(일 수) 이후 이력은 빠짐없이 들어 있음 (상장 전이면 앞부분이 비어 있을 수 있음)
+        """
+        try:
+            os.makedirs(self.store_dir, exist_ok=True)
+            path = self._path(ticker)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.savez(
+                    f, days=prices.days, ohlc=prices.ohlc, volume=prices.volume,
+                    scale=np.int32(prices.scale), start_day=np.int32(start_day),
+                    saved_at=np.float64(time.time()), source=np.str_(source or ''),
+                )
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"⚠️ 가격 저장 실패 ({ticker}): {str(e)}")
+
+    def load(self, ticker):
+        """(CompactPrices, {'start_day', 'saved_at', 'source'}) 또는 None"""
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                prices = CompactPrices(data['days'], data['ohlc'], data['volume'], int(data['scale']))
+                saved_at = float(data['saved_at'])
+                if 'start_day' in data:
+                    start_day = int(data['start_day'])
+                else:
+                    # 조회 기간(일수)만 저장하던 파일
+                    start_day = day_ordinal(datetime.fromtimestamp(saved_at)) - int(data['days_covered'])
+                meta = {'start_day': start_day, 'saved_at': saved_at, 'source': str(data['source'])}
+            return prices, meta
+        except Exception:
+            return None
+
+    @staticmethod
+    def is_fresh(saved_at, ttl_seconds, now=None):
+        """
+        저장된 데이터를 그대로 써도 되는지
+
+        ttl_seconds 이내에 저장했거나, 장이 열려 있지 않고 마지막 장 마감 이후에 저장한 경우
+        """
+        now = now or datetime.now()
+        if now.timestamp() - saved_at < ttl_seconds:
+            return True
+        return not is_market_open(now) and saved_at >= last_market_close(now).timestamp()
+
+
+_price_store = None
+_price_store_lock = threading.Lock()
+
+
+def get_price_store(data_dir="analysis_data"):
+    """프로세스 전역 PriceStore (첫 호출의 data_dir 아래 price_store 디렉토리)"""
+    global _price_store
+    if _price_store is None:
+        with _price_store_lock:
+            if _price_store is None:
+                _price_store = PriceStore(os.path.join(data_dir, "price_store"))
+    return _price_store
@@ -0,0 +1,153 @@
+"""
+스캔 진행 상황 집계 모듈
+
+분석기는 종목 하나를 처리할 때마다 progress_callback을 호출하지만, 그때마다 화면을 다시 그리거나
+콘솔에 출력하면 종목 수(약 950개)만큼 UI 갱신이 일어난다. ProgressTracker는 이 이벤트를 모아서
+누적 카운터(처리/성공/실패/발견)를 유지하고, 일정 시간 또는 일정 건수마다 한 번씩만
+구독자(Streamlit 작업 상태, 콘솔 출력 등)에게 스냅샷을 전달한다.
+"""
+import threading
+import time
+
+# 구독자에게 전달하는 최소 간격 (초)
+PROGRESS_MIN_INTERVAL = 0.5
+
+# 시간 간격과 관계없이 이 건수만큼 처리되면 전달
+PROGRESS_EMIT_EVERY = 50
+
+# 콘솔 출력 최소 간격 (초)
+CONSOLE_MIN_INTERVAL = 5.0
+
+
+class ProgressTracker:
+    """진행 이벤트를 집계해서 제한된 빈도로 구독자에게 전달"""
+
+    def __init__(self, total=0, min_interval=PROGRESS_MIN_INTERVAL, emit_every=PROGRESS_EMIT_EVERY, listeners=None):
+        self.min_interval = min_interval
+        self.emit_every = emit_every
+        self._lock = threading.Lock()
+        self._listeners = list(listeners or [])
+        self.total = total
+        self.processed = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.found = 0
+        self.current = ""
+        self.started_at = time.time()
+        self._last_emit_time = 0.0
+        self._last_emit_processed = 0
+
+    def subscribe(self, listener):
+        """구독자 등록 - listener(snapshot)는 집계된 스냅샷을 받는다"""
+        with self._lock:
+            self._listeners.append(listener)
+        return listener
+
+    def update(self, idx, total, name, ticker, found_count, success=True):
+        """
+        종목 하나 처리 완료 - 분석기의 progress_callback으로 그대로 넘길 수 있음
+
+        (idx, total, name, ticker, success_count) 형태와
+        (idx, total, name, ticker, found_count, success) 형태를 모두 지원한다.
+        """
+        with self._lock:
+            self.total = total
+            self.processed = idx
+            if success:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+            self.found = found_count
+            self.current = f"{name} ({ticker})"
+
+            now = time.time()
+            due = (
+                idx >= total
+                or now - self._last_emit_time >= self.min_interval
+                or idx - self._last_emit_processed >= self.emit_every
+            )
+            if not due:
+                return
+            snapshot = self._snapshot_locked(now)
+            self._last_emit_time = now
+            self._last_emit_processed = idx
+            listeners = list(self._listeners)
+
+        self._emit(listeners, snapshot)
+
+    __call__ = update
+
+    def flush(self):
+        """마지막 상태를 즉시 전달 (스캔 종료 시 호출)"""
+        with self._lock:
+            now = time.time()
+            snapshot = self._snapshot_locked(now)
+            self._last_emit_time = now
+            self._last_emit_processed = self.processed
+            listeners = list(self._listeners)
+        self._emit(listeners, snapshot)
+        return snapshot
+
+    def snapshot(self):
+        """현재 누적 상태"""
+        with self._lock:
+            return self._snapshot_locked(time.time())
+
+    def _snapshot_locked(self, now):
+        elapsed = now - self.started_at
+        return {
+            'processed': self.processed,
+            'total': self.total,
+            'progress': self.processed / self.total if self.total else 0.0,
+            'succeeded': self.succeeded,
+            'failed': self.failed,
+            'found': self.found,
+            'current': self.current,
+            'elapsed_seconds': elapsed,
+            'rate': self.processed / elapsed if elapsed > 0 else 0.0,
+        }
+
+    @staticmethod
+    def _emit(listeners, snapshot):
+        # 구독자 오류가 스캔을 멈추지 않도록 무시
+        for listener in listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                print(f"⚠️ 진행 상황 전달 실패: {str(e)}")
+
+
+def message_progress(callback, label):
+    """
+    (메시지, 비율) 형태 진행 콜백(이전 Streamlit 진행바)을 표준 progress_callback으로 감싸기
+
+    표준 콜백: (idx, total, name, ticker, found_count, success)
+    """
+    def progress(idx, total, name, ticker, found_count, success=True):
+        callback(f"{label}: {name}", idx / total if total else 0.0)
+    return progress
+
+
+class ConsoleProgressReporter:
+    """ProgressTracker 구독자 - 진행 상황을 콘솔에 한 줄씩 출력 (최소 간격 적용)"""
+
+    def __init__(self, label="스캔", min_interval=CONSOLE_MIN_INTERVAL):
+        self.label = label
+        self.min_interval = min_interval
+        self._last_print = 0.0
+        self._last_processed = None
+
+    def __call__(self, snapshot):
+        now = time.time()
+        finished = snapshot['total'] and snapshot['processed'] >= snapshot['total']
+        if snapshot['processed'] == self._last_processed:
+            return
+        if not finished and now - self._last_print < self.min_interval:
+            return
+        self._last_print = now
+        self._last_processed = snapshot['processed']
+        print(
+            f"📊 {self.label} 진행: {snapshot['processed']}/{snapshot['total']} "
+            f"({snapshot['progress']*100:.1f}%) - 성공 {snapshot['succeeded']}, 실패 {snapshot['failed']}, "
+            f"발견 {snapshot['found']} | {snapshot['rate']:.1f}종목/초"
+        )
@@ -0,0 +1,204 @@
+"""
+스캔 결과 내보내기 (Excel / CSV / Parquet)
+
+Excel은 xlsxwriter의 constant_memory 모드로 한 행씩 바로 파일에 쓰므로 워크시트 전체를 메모리에 들고 있지 않는다.
+네이버 금융 링크 URL은 컬럼 단위 문자열 연산으로 한 번에 만들어 셀 하이퍼링크로 쓰고
+(HYPERLINK 수식은 xlsxwriter가 수식마다 정규식 수십 개를 돌려서 10배 가까이 느림),
+서식은 셀마다 다시 쓰지 않고 set_column으로 컬럼에 한 번만 지정한다.
+값 변환은 EXPORT_CHUNK_ROWS 행씩 나눠서 해서 원본 DataFrame 크기만큼 복사본이 생기지 않는다.
+"""
+import threading
+from io import BytesIO
+import numpy as np
+import pandas as pd
+
+from lazy_import import timed_import, module_available
+from shared_cache import LRUByteCache
+
+NAVER_MAIN_URL = "https://finance.naver.com/item/main.naver?code="
+NAVER_CHART_URL = "https://finance.naver.com/item/fchart.naver?code="
+
+# 한 번에 Python 값으로 변환하는 행 수
+EXPORT_CHUNK_ROWS = 5000
+
+# 엑셀 워크시트 하나에 넣을 수 있는 하이퍼링크 수 (넘치면 ticker 링크만, 그래도 넘치면 링크 없이)
+MAX_SHEET_URLS = 65530
+
+# 내보낸 바이트 캐시 예산 (대시보드 재실행마다 같은 결과를 다시 만들지 않도록)
+EXPORT_CACHE_MB = 64
+
+# 형식별 (표시 이름, 확장자, MIME, 필요한 모듈)
+EXPORT_FORMATS = {
+    'xlsx': ('엑셀', 'xlsx', "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", 'xlsxwriter'),
+    'csv': ('CSV', 'csv', "text/csv", None),
+    'parquet': ('Parquet', 'parquet', "application/vnd.apache.parquet", 'pyarrow'),
+}
+
+TICKER_FORMAT = {'font_color': '#0563C1', 'underline': True}
+NAME_FORMAT = {'font_color': '#000000', 'bold': True}
+HEADER_FORMAT = {'bold': True, 'bottom': 1}
+DATE_FORMAT = {'num_format': 'yyyy-mm-dd'}
+FLOAT_FORMAT = {'num_format': '0.00'}
+
+
+def available_formats():
+    """설치된 모듈로 만들 수 있는 내보내기 형식"""
+    return [fmt for fmt, (_, _, _, module) in EXPORT_FORMATS.items() if module is None or module_available(module)]
+
+
+def link_columns(df):
+    """
+    ticker/name 컬럼의 네이버 금융 링크 (컬럼 이름 → (URL 배열, 표시 값 배열), 링크가 없는 행은 URL None)
+
+    ticker는 종목 메인, name은 차트 페이지로 연결한다.
+    """
+    if 'ticker' not in df.columns:
+        return {}
+    valid = df['ticker'].notna()
+    tickers = df['ticker']
+    if pd.api.types.is_numeric_dtype(tickers):
+        # CSV에서 읽으며 숫자가 된 종목코드 (결측이 있으면 float)
+        tickers = tickers.astype('Int64')
+    codes = tickers.astype(str).str.zfill(6)
+    links = {'ticker': (np.where(valid, NAVER_MAIN_URL + codes, None), np.where(valid, codes, None))}
+    if 'name' in df.columns:
+        named = valid & df['name'].notna()
+        links['name'] = (np.where(named, NAVER_CHART_URL + codes, None), df['name'].to_numpy())
+    return links
+
+
+def _column_width(name, series):
+    """헤더/자료형 기준의 대략적인 컬럼 너비 (값을 모두 훑지 않음)"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return 12
+    if pd.api.types.is_numeric_dtype(series):
+        return max(10, len(str(name)) + 2)
+    return max(12, min(40, len(str(name)) + 4))
+
+
+def _plain_values(series):
+    """object 컬럼의 리스트/딕셔너리 등 엑셀에 쓸 수 없는 값을 문자열로"""
+    return series.map(lambda v: v if v is None or isinstance(v, (str, int, float, bool)) else str(v))
+
+
+def to_excel_bytes(df, sheet_name='데이터'):
+    """DataFrame → xlsx 바이트 (constant_memory 스트리밍 쓰기, 링크/서식은 컬럼 단위)"""
+    xlsxwriter = timed_import('xlsxwriter')
+    output = BytesIO()
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True, 'strings_to_urls': False,
+                                            'strings_to_formulas': False})
+    worksheet = workbook.add_worksheet(sheet_name)
+    formats = {
+        'ticker': workbook.add_format(TICKER_FORMAT),
+        'name': workbook.add_format(NAME_FORMAT),
+    }
+    header_format = workbook.add_format(HEADER_FORMAT)
+    date_format = workbook.add_format(DATE_FORMAT)
+    float_format = workbook.add_format(FLOAT_FORMAT)
+
+    columns = list(df.columns)
+    datetime_cols = []
+    object_cols = [col for col in columns if df[col].dtype == object and col not in ('ticker', 'name')]
+    for col_idx, col in enumerate(columns):
+        series = df[col]
+        fmt = formats.get(col)
+        if fmt is None and pd.api.types.is_datetime64_any_dtype(series):
+            fmt = date_format
+            datetime_cols.append(col)
+        elif fmt is None and pd.api.types.is_float_dtype(series):
+            fmt = float_format
+        worksheet.set_column(col_idx, col_idx, _column_width(col, series), fmt)
+
+    links = link_columns(df)
+    if len(df) * len(links) > MAX_SHEET_URLS:
+        links = {'ticker': links['ticker']} if len(df) <= MAX_SHEET_URLS else {}
+    link_cells = [(columns.index(col), urls, labels, formats[col]) for col, (urls, labels) in links.items()]
+
+    # constant_memory 모드는 행 순서대로만 쓸 수 있음
+    worksheet.write_row(0, 0, [str(col) for col in columns], header_format)
+    row_idx = 1
+    for start in range(0, len(df), EXPORT_CHUNK_ROWS):
+        chunk = df.iloc[start:start + EXPORT_CHUNK_ROWS]
+        # 링크 셀은 write_url로 따로 쓰므로 값은 비워 둠 (인덱스 정렬 없이 위치 기준으로 교체)
+        replaced = {columns[col_idx]: None for col_idx, _, _, _ in link_cells}
+        for col in object_cols:
+            replaced[col] = _plain_values(chunk[col]).to_numpy()
+        for col in datetime_cols:
+            if chunk[col].dt.tz is not None:
+                replaced[col] = chunk[col].dt.tz_localize(None).to_numpy()
+        if replaced:
+            chunk = chunk.assign(**replaced)
+        # 결측값은 빈 셀로 (xlsxwriter는 NaN을 쓸 수 없음)
+        values = chunk.astype(object).where(chunk.notna(), None).to_numpy().tolist()
+        for offset, row in enumerate(values, start):
+            worksheet.write_row(row_idx, 0, row)
+            for col_idx, urls, labels, fmt in link_cells:
+                if urls[offset] is not None:
+                    worksheet.write_url(row_idx, col_idx, urls[offset], fmt, string=str(labels[offset]))
+                elif pd.notna(labels[offset]):
+                    worksheet.write(row_idx, col_idx, labels[offset], fmt)
+            row_idx += 1
+
+    worksheet.freeze_panes(1, 0)
+    workbook.close()
+    return output.getvalue()
+
+
+def to_csv_bytes(df):
+    """DataFrame → UTF-8 BOM CSV 바이트 (엑셀에서 한글이 깨지지 않도록)"""
+    return df.to_csv(index=False).encode('utf-8-sig')
+
+
+def to_parquet_bytes(df):
+    """DataFrame → Parquet 바이트 (pyarrow 필요)"""
+    output = BytesIO()
+    frame = df.copy(deep=False)
+    frame.columns = [str(col) for col in frame.columns]
+    frame.to_parquet(output, index=False)
+    return output.getvalue()
+
+
+def export_frame(df, fmt='xlsx', sheet_name='데이터'):
+    """
+    결과 DataFrame을 지정한 형식의 바이트로 변환
+
+    Returns:
+        (바이트, 확장자, MIME)
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+    _, ext, mime, _ = EXPORT_FORMATS[fmt]
+    if fmt == 'xlsx':
+        data = to_excel_bytes(df, sheet_name)
+    elif fmt == 'parquet':
+        data = to_parquet_bytes(df)
+    else:
+        data = to_csv_bytes(df)
+    return data, ext, mime
+
+
+_export_cache = None
+_export_cache_lock = threading.Lock()
+
+
+def get_export_cache():
+    """프로세스 전역 내보내기 캐시"""
+    global _export_cache
+    if _export_cache is None:
+        with _export_cache_lock:
+            if _export_cache is None:
+                _export_cache = LRUByteCache(max_bytes=EXPORT_CACHE_MB * 1024 * 1024)
+    return _export_cache
+
+
+def export_frame_cached(df, fmt='xlsx', sheet_name='데이터'):
+    """같은 DataFrame 객체를 다시 내보내면 만들어 둔 결과 재사용 (export_frame과 같은 반환값)"""
+    cache = get_export_cache()
+    key = (id(df), fmt, sheet_name)
+    entry = cache.get(key)
+    if entry is not None and entry[0] is df:
+        return entry[1]
+    result = export_frame(df, fmt, sheet_name)
+    # DataFrame도 같이 들고 있어서 항목이 남아 있는 동안 id가 재사용되지 않음
+    cache.set(key, (df, result))
+    return result
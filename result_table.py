@@ -0,0 +1,147 @@
+"""
+서버 측 페이지네이션 결과 테이블 (Streamlit)
+
+결과 전체를 to_html로 그려 보내면 재실행마다 수 MB의 HTML이 브라우저로 간다.
+검색/정렬은 서버에서 행 위치 배열로만 처리하고, 현재 페이지 행만 잘라서 st.dataframe으로 보낸다.
+네이버 금융 링크는 페이지 행에 대해서만 컬럼 단위 문자열 연산으로 만들어 LinkColumn으로 표시한다.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from result_export import NAVER_MAIN_URL, NAVER_CHART_URL
+
+DEFAULT_PAGE_SIZE = 50
+PAGE_SIZE_OPTIONS = (20, 50, 100, 200)
+
+# 검색 대상 컬럼 (있는 것만)
+SEARCH_COLUMNS = ('name', 'ticker', 'pattern_type', 'market')
+
+# 정렬하지 않음 (원래 순서 = 분석기 순위)
+DEFAULT_ORDER = '__default__'
+
+
+def _ticker_codes(series):
+    """종목코드 Series → 6자리 문자열 (CSV에서 숫자로 읽힌 코드 포함)"""
+    if pd.api.types.is_numeric_dtype(series):
+        series = series.astype('Int64')
+    return series.astype(str).str.zfill(6)
+
+
+def search_positions(df, query, columns=SEARCH_COLUMNS):
+    """검색어가 들어 있는 행 위치 (대소문자 무시, 검색어가 없으면 전체)"""
+    positions = np.arange(len(df))
+    query = (query or '').strip()
+    if not query:
+        return positions
+    mask = np.zeros(len(df), dtype=bool)
+    for col in columns:
+        if col in df.columns:
+            values = _ticker_codes(df[col]) if col == 'ticker' else df[col].astype(str)
+            mask |= values.str.contains(query, case=False, regex=False, na=False).to_numpy()
+    return positions[mask]
+
+
+def sort_positions(df, positions, column, descending=False):
+    """positions 행들을 column 기준으로 정렬한 위치 (안정 정렬, 결측값은 뒤로)"""
+    if column == DEFAULT_ORDER or column not in df.columns or len(positions) == 0:
+        return positions
+    values = pd.Series(df[column].to_numpy()[positions])
+    order = values.sort_values(ascending=not descending, kind='mergesort', na_position='last').index.to_numpy()
+    return positions[order]
+
+
+def page_frame(df, positions, columns=None):
+    """
+    표시할 페이지 행만 잘라서 링크 컬럼을 붙인 DataFrame
+
+    ticker는 종목 메인 URL, name은 차트 URL + '#종목명' (LinkColumn이 '#' 뒤만 표시)
+    """
+    page = df.iloc[positions]
+    if columns:
+        page = page[[col for col in columns if col in page.columns]]
+    page = page.reset_index(drop=True)
+    if 'ticker' in df.columns:
+        codes = _ticker_codes(df['ticker'].iloc[positions]).reset_index(drop=True)
+        valid = df['ticker'].iloc[positions].notna().to_numpy()
+        if 'name' in page.columns:
+            names = page['name'].astype(str)
+            page['name'] = (NAVER_CHART_URL + codes + '#' + names).where(valid & page['name'].notna().to_numpy(), page['name'])
+        if 'ticker' in page.columns:
+            page['ticker'] = (NAVER_MAIN_URL + codes).where(valid, None)
+    return page
+
+
+def render_result_table(df, key, columns=None, formats=None, page_size=DEFAULT_PAGE_SIZE, rank=True):
+    """
+    검색/정렬/페이지 이동이 되는 결과 테이블
+
+    Args:
+        df: 결과 DataFrame (수정하지 않음)
+        key: 위젯 키 접두어 (화면마다 다르게)
+        columns: {원본 컬럼: 표시 이름} - 순서대로 표시 (None이면 전체 컬럼)
+        formats: {원본 컬럼: printf 형식} 숫자 표시 형식 (예: '₩%d')
+        page_size: 기본 페이지 크기
+        rank: 원래 순서 기준 순위 컬럼 표시
+    """
+    if df is None or len(df) == 0:
+        st.info("표시할 데이터가 없습니다.")
+        return
+
+    labels = dict(columns) if columns else {col: str(col) for col in df.columns}
+    formats = formats or {}
+
+    col_search, col_sort, col_desc, col_size = st.columns([3, 2, 1, 1])
+    with col_search:
+        query = st.text_input("검색", key=f"{key}_query", placeholder="종목명 / 티커 검색", label_visibility="collapsed")
+    with col_sort:
+        sort_options = [DEFAULT_ORDER] + [col for col in labels if col in df.columns]
+        sort_column = st.selectbox(
+            "정렬", sort_options, key=f"{key}_sort", label_visibility="collapsed",
+            format_func=lambda col: "기본 순서" if col == DEFAULT_ORDER else f"정렬: {labels[col]}"
+        )
+    with col_desc:
+        descending = st.toggle("내림차순", key=f"{key}_desc")
+    with col_size:
+        size_options = sorted(set(PAGE_SIZE_OPTIONS) | {page_size})
+        page_size = st.selectbox(
+            "페이지 크기", size_options, index=size_options.index(page_size),
+            key=f"{key}_size", label_visibility="collapsed", format_func=lambda n: f"{n}개씩"
+        )
+
+    positions = sort_positions(df, search_positions(df, query), sort_column, descending)
+    total = len(positions)
+    pages = max(1, -(-total // page_size))
+    page = 1
+    if pages > 1:
+        # 검색/페이지 크기가 바뀌어 페이지 수가 줄면 위젯 값이 범위를 넘지 않도록 먼저 맞춤
+        if st.session_state.get(f"{key}_page", 1) > pages:
+            st.session_state[f"{key}_page"] = pages
+        page = st.number_input("페이지", min_value=1, max_value=pages, value=1, step=1, key=f"{key}_page")
+        page = min(int(page), pages)
+    start = (page - 1) * page_size
+    page_positions = positions[start:start + page_size]
+
+    view = page_frame(df, page_positions, list(labels))
+    if rank:
+        view.insert(0, '__rank__', page_positions + 1)
+
+    column_config = {'__rank__': st.column_config.NumberColumn("순위", width='small')} if rank else {}
+    for col in view.columns:
+        if col == '__rank__':
+            continue
+        label = labels.get(col, str(col))
+        if col == 'ticker':
+            column_config[col] = st.column_config.LinkColumn(label, display_text=r"code=(\d{6})")
+        elif col == 'name' and 'ticker' in df.columns:
+            column_config[col] = st.column_config.LinkColumn(label, display_text=r"#(.*)$")
+        elif col in formats:
+            column_config[col] = st.column_config.NumberColumn(label, format=formats[col])
+        else:
+            column_config[col] = label
+
+    st.dataframe(view, column_config=column_config, hide_index=True, use_container_width=True)
+    if total:
+        st.caption(f"총 {len(df)}개 중 {total}개 · {start + 1}-{start + len(page_positions)}번째 (페이지 {page}/{pages})")
+    else:
+        st.caption(f"'{query}' 검색 결과가 없습니다 (총 {len(df)}개)")
@@ -0,0 +1,240 @@
+"""
+백그라운드 스캔 작업 모듈
+
+전체 종목 스캔을 Streamlit 스크립트 스레드가 아닌 작업 스레드에서 실행한다.
+각 작업은 job_id를 가지며, UI는 진행 상황과 중간 결과를 주기적으로 조회(polling)한다.
+같은 스캔 키로 이미 실행 중인 작업이 있으면 새로 시작하지 않고 그 작업에 연결(attach)한다.
+완료된 결과는 프로세스 공용 캐시(SharedCache)에 저장되어 다른 세션도 바로 사용할 수 있다.
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import pandas as pd
+
+from shared_cache import get_shared_cache
+from progress import ProgressTracker, ConsoleProgressReporter
+from scan_metrics import (
+    StageTimer, ScanRunLog, collect_stage_timings, collect_run_log,
+    append_run_log, build_run_record, ticker_log_path, RUN_LOG_DIR,
+)
+
+# 동시에 실행할 수 있는 스캔 작업 수
+SCAN_JOB_WORKERS = 2
+
+# 보관할 완료 작업 수 (오래된 것부터 정리)
+MAX_FINISHED_JOBS = 20
+
+
+class ScanJob:
+    """백그라운드 스캔 작업 하나의 상태"""
+
+    def __init__(self, key, description=""):
+        self.job_id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.description = description
+        self.status = 'pending'  # pending / running / done / failed
+        self.total = 0
+        self.processed = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.found = 0
+        self.current = ""
+        self.result = None
+        self.error = None
+        self.created_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+        self._partial_results = []
+        self._lock = threading.Lock()
+
+        # 분석기 콜백 → 집계 → (작업 상태, 콘솔) 순으로 제한된 빈도로 전달
+        self.progress = ProgressTracker(listeners=[self._apply_progress])
+        if description:
+            self.progress.subscribe(ConsoleProgressReporter(description))
+
+        # 작업 스레드의 timed_stage() 구간 시간 (가격 조회, 지표 계산, TA-Lib 등)
+        self.stage_timer = StageTimer()
+        self.run_log = ScanRunLog()
+
+    @property
+    def is_active(self):
+        """실행 대기 중이거나 실행 중인지 여부"""
+        return self.status in ('pending', 'running')
+
+    def update_progress(self, idx, total, name, ticker, found_count, success=True):
+        """
+        진행 상황 갱신 - 분석기의 progress_callback으로 그대로 넘길 수 있음
+
+        (idx, total, name, ticker, success_count) 형태와
+        (idx, total, name, ticker, found_count, success) 형태를 모두 지원한다.
+        이벤트는 ProgressTracker에서 집계되어 일정 간격으로만 작업 상태에 반영된다.
+        """
+        self.progress.update(idx, total, name, ticker, found_count, success)
+
+    def _apply_progress(self, snapshot):
+        """ProgressTracker 구독자 - 집계된 스냅샷을 작업 상태에 반영"""
+        with self._lock:
+            self.processed = snapshot['processed']
+            self.total = snapshot['total']
+            self.succeeded = snapshot['succeeded']
+            self.failed = snapshot['failed']
+            self.found = snapshot['found']
+            self.current = snapshot['current']
+
+    def add_result(self, result):
+        """중간 결과 한 건 추가 - 분석기의 result_callback으로 넘길 수 있음"""
+        with self._lock:
+            self._partial_results.append(result)
+
+    def stage_summary(self):
+        """단계별 시간 요약 (백분위수)"""
+        return self.stage_timer.summary()
+
+    def partial_frame(self):
+        """지금까지 수집된 중간 결과 DataFrame"""
+        with self._lock:
+            rows = list(self._partial_results)
+        return pd.DataFrame(rows)
+
+    def snapshot(self):
+        """UI 표시용 상태 스냅샷"""
+        with self._lock:
+            elapsed_end = self.finished_at or datetime.now()
+            return {
+                'job_id': self.job_id,
+                'description': self.description,
+                'status': self.status,
+                'processed': self.processed,
+                'total': self.total,
+                'progress': self.processed / self.total if self.total else 0.0,
+                'succeeded': self.succeeded,
+                'failed': self.failed,
+                'found': self.found,
+                'partial_count': len(self._partial_results),
+                'current': self.current,
+                'error': self.error,
+                'elapsed_seconds': (elapsed_end - self.started_at).total_seconds() if self.started_at else 0.0,
+            }
+
+
+class ScanJobManager:
+    """스캔 작업 실행/조회 관리자 (프로세스 전역)"""
+
+    def __init__(self, max_workers=SCAN_JOB_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scan-job")
+        self._lock = threading.Lock()
+        self._jobs = {}          # job_id -> ScanJob
+        self._active_by_key = {}  # key -> job_id
+
+    def _run(self, job, run):
+        """작업 스레드에서 스캔 실행 후 결과를 공용 캐시에 저장"""
+        with job._lock:
+            job.status = 'running'
+            job.started_at = datetime.now()
+        try:
+            with collect_stage_timings(job.stage_timer), collect_run_log(job.run_log):
+                result = run(job)
+            get_shared_cache().set(job.key, result, persist=True)
+            with job._lock:
+                job.result = result
+                job.status = 'done'
+        except Exception as e:
+            with job._lock:
+                job.error = f"{type(e).__name__}: {str(e)}"
+                job.status = 'failed'
+        finally:
+            progress = job.progress.flush()
+            with job._lock:
+                job.finished_at = datetime.now()
+            ticker_log = job.run_log.write(ticker_log_path(RUN_LOG_DIR, job.job_id, job.started_at))
+            append_run_log(build_run_record(
+                job.description, job.started_at, job.finished_at, progress, job.stage_summary(),
+                job_id=job.job_id, key=job.key, status=job.status, error=job.error,
+                tickers=job.run_log.summary(), ticker_log=ticker_log
+            ))
+            with self._lock:
+                if self._active_by_key.get(job.key) == job.job_id:
+                    del self._active_by_key[job.key]
+                self._prune_finished()
+
+    def _prune_finished(self):
+        """오래된 완료 작업 정리 (self._lock 보유 상태에서 호출)"""
+        finished = sorted(
+            (j for j in self._jobs.values() if not j.is_active),
+            key=lambda j: j.finished_at or j.created_at
+        )
+        for job in finished[:-MAX_FINISHED_JOBS]:
+            del self._jobs[job.job_id]
+
+    def submit(self, key, run, description=""):
+        """
+        스캔 작업 제출
+
+        Args:
+            key: 스캔 캐시 키 (scan_cache_key) - 같은 키의 실행 중 작업이 있으면 그 작업에 연결
+            run: run(job) -> 결과 DataFrame. job.update_progress / job.add_result를 콜백으로 사용
+            description: 작업 설명 (UI 표시용)
+
+        Returns:
+            (job, created) - created가 False면 기존 작업에 연결된 것
+        """
+        with self._lock:
+            active_id = self._active_by_key.get(key)
+            if active_id is not None:
+                return self._jobs[active_id], False
+
+            job = ScanJob(key, description)
+            self._jobs[job.job_id] = job
+            self._active_by_key[key] = job.job_id
+
+        self._executor.submit(self._run, job, run)
+        return job, True
+
+    def get(self, job_id):
+        """job_id로 작업 조회"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def find_active(self, key):
+        """해당 키로 실행 중인 작업 조회 (없으면 None)"""
+        with self._lock:
+            job_id = self._active_by_key.get(key)
+            return self._jobs.get(job_id) if job_id else None
+
+    def last_finished(self):
+        """가장 최근에 끝난 작업 (없으면 None)"""
+        finished = [job for job in self.list_jobs() if not job.is_active]
+        return max(finished, key=lambda j: j.finished_at, default=None)
+
+    def list_jobs(self):
+        """전체 작업 목록 (최근 생성 순)"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return sorted(jobs, key=lambda j: j.created_at, reverse=True)
+
+    def wait(self, job_id, timeout=None, poll_interval=0.2):
+        """작업 완료까지 대기 (CLI/테스트용). 완료되면 True"""
+        deadline = time.time() + timeout if timeout else None
+        while True:
+            job = self.get(job_id)
+            if job is None or not job.is_active:
+                return job is not None
+            if deadline and time.time() > deadline:
+                return False
+            time.sleep(poll_interval)
+
+
+_job_manager = None
+_job_manager_lock = threading.Lock()
+
+
+def get_job_manager():
+    """프로세스 전역 ScanJobManager 인스턴스 반환"""
+    global _job_manager
+    if _job_manager is None:
+        with _job_manager_lock:
+            if _job_manager is None:
+                _job_manager = ScanJobManager()
+    return _job_manager
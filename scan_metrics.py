@@ -0,0 +1,424 @@
+"""
+스캔 단계별 시간 측정 모듈
+
+분석기의 핫패스(가격 조회, 지표 계산, TA-Lib 호출, 결과 조립, 차트 렌더링)를 timed_stage()로 감싸면
+현재 스레드에서 수집 중인 StageTimer에 시간이 쌓인다. 수집 중인 타이머가 없으면 거의 비용이 없다.
+스캔이 끝나면 단계별 백분위수(p50/p90/p99)로 요약해서 사이드바 패널과 실행 로그(JSON Lines)에 남긴다.
+
+종목 단위 작업을 ticker_run()으로 감싸면 수집 중인 ScanRunLog에 종목별 레코드(가격 소스, 재시도,
+조회 시간, 캔들 수, 실패 단계, 예외 클래스)가 쌓인다. 분석기가 예외를 삼키고 None을 반환해도
+어느 단계에서 왜 실패했는지 남는다.
+"""
+import json
+import os
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+import numpy as np
+
+# 단계별로 보관하는 최대 샘플 수 (오래된 것부터 버림)
+MAX_STAGE_SAMPLES = 20000
+
+# 스캔 실행 로그 위치
+RUN_LOG_DIR = os.path.join("analysis_data", "run_logs")
+RUN_LOG_FILE = "scan_runs.jsonl"
+
+# 종목 실행 결과 분류
+#   ok: 분석 완료 (패턴/신호 발견 여부와 무관)
+#   fetch_failed: 가격 소스에서 데이터를 받지 못함
+#   insufficient_bars: 받았지만 분석기가 요구하는 캔들 수보다 적음
+#   error: 분석 단계에서 예외 발생 또는 계산 실패
+TICKER_STATUSES = ('ok', 'fetch_failed', 'insufficient_bars', 'error')
+
+# 요약에 포함할 가장 오래 걸린 종목 수
+SLOWEST_TICKERS = 10
+
+
+class StageTimer:
+    """단계 이름별 소요 시간 샘플 수집 (스레드 안전)"""
+
+    def __init__(self, max_samples=MAX_STAGE_SAMPLES):
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._samples = {}  # 단계 이름 -> deque[초]
+        self._totals = {}   # 단계 이름 -> 누적 초 (샘플이 버려져도 정확하게 유지)
+        self._counts = {}
+
+    def record(self, name, seconds):
+        """샘플 하나 기록"""
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.max_samples)
+                self._totals[name] = 0.0
+                self._counts[name] = 0
+            samples.append(seconds)
+            self._totals[name] += seconds
+            self._counts[name] += 1
+
+    def stage(self, name):
+        """with 블록의 실행 시간을 이 타이머에 기록"""
+        return _StageContext(name, (self,))
+
+    def summary(self):
+        """단계별 요약 {단계: {count, total, mean, p50, p90, p99, max}} (누적 시간 큰 순)"""
+        with self._lock:
+            snapshot = {name: (np.fromiter(samples, dtype=float), self._totals[name], self._counts[name])
+                        for name, samples in self._samples.items()}
+
+        result = {}
+        for name, (samples, total, count) in sorted(snapshot.items(), key=lambda item: -item[1][1]):
+            if len(samples) == 0:
+                continue
+            p50, p90, p99 = np.percentile(samples, [50, 90, 99])
+            result[name] = {
+                'count': count,
+                'total': round(total, 4),
+                'mean': round(total / count, 6),
+                'p50': round(float(p50), 6),
+                'p90': round(float(p90), 6),
+                'p99': round(float(p99), 6),
+                'max': round(float(samples.max()), 6),
+            }
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+            self._counts.clear()
+
+
+class _StageContext:
+    """timed_stage/StageTimer.stage가 반환하는 가벼운 컨텍스트 매니저"""
+
+    __slots__ = ('name', 'timers', 'record', 'started')
+
+    def __init__(self, name, timers, record=None):
+        self.name = name
+        self.timers = timers
+        self.record = record
+        self.started = 0.0
+
+    def __enter__(self):
+        if self.timers:
+            self.started = time.perf_counter()
+        if self.record is not None:
+            self.record.stage = self.name
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.timers:
+            elapsed = time.perf_counter() - self.started
+            for timer in self.timers:
+                timer.record(self.name, elapsed)
+        if exc_type is not None and self.record is not None and self.record.exception is None:
+            self.record.fail('error', self.name, exc)
+        return False
+
+
+_local = threading.local()
+
+
+def _active_timers():
+    return getattr(_local, 'timers', ())
+
+
+class collect_stage_timings:
+    """
+    with 블록 동안 현재 스레드의 timed_stage() 시간을 timer에 수집
+
+    중첩하면 바깥/안쪽 타이머 모두에 기록된다.
+    """
+
+    def __init__(self, timer):
+        self.timer = timer
+        self._previous = ()
+
+    def __enter__(self):
+        self._previous = _active_timers()
+        _local.timers = self._previous + (self.timer,)
+        return self.timer
+
+    def __exit__(self, exc_type, exc, tb):
+        _local.timers = self._previous
+        return False
+
+
+def active_stage_timers():
+    """현재 스레드에서 수집 중인 타이머 (스레드 풀 작업에 넘겨서 collect_stage_timings로 이어서 수집)"""
+    return _active_timers()
+
+
+def timed_stage(name):
+    """핫패스 단계 시간 측정 (현재 스레드에서 수집 중인 타이머가 없으면 아무것도 하지 않음)"""
+    return _StageContext(name, _active_timers(), getattr(_local, 'record', None))
+
+
+class TickerRecord:
+    """종목 하나의 실행 기록"""
+
+    __slots__ = ('ticker', 'name', 'status', 'source', 'cached', 'attempts', 'retry_wait',
+                 'fetch_seconds', 'bars', 'required_bars', 'stage', 'failed_stage',
+                 'exception', 'message', 'elapsed')
+
+    def __init__(self, ticker, name=None):
+        self.ticker = str(ticker)
+        self.name = name
+        self.status = None
+        self.source = None
+        self.cached = False
+        self.attempts = 0
+        self.retry_wait = 0.0
+        self.fetch_seconds = 0.0
+        self.bars = None
+        self.required_bars = None
+        self.stage = None
+        self.failed_stage = None
+        self.exception = None
+        self.message = None
+        self.elapsed = 0.0
+
+    def note_fetch(self, info, cached, bars):
+        """price_data의 조회 정보 반영 (캐시 적중이면 원래 조회했을 때의 소스/재시도 정보)"""
+        if info:
+            self.source = info.get('source')
+            self.attempts = info.get('attempts', 0)
+            self.retry_wait = info.get('retry_wait', 0.0)
+            self.fetch_seconds = info.get('seconds', 0.0)
+            if bars is None and info.get('exception'):
+                self.exception = info['exception']
+                self.message = info.get('message')
+        self.cached = cached
+        self.bars = bars
+
+    def fail(self, status, stage=None, exc=None):
+        """실패 기록 (먼저 기록된 실패를 덮어쓰지 않음)"""
+        if self.status is not None:
+            return
+        self.status = status
+        self.failed_stage = stage or self.stage
+        if exc is not None:
+            self.exception = type(exc).__name__
+            self.message = str(exc)[:200]
+
+    def to_dict(self):
+        return {
+            'ticker': self.ticker,
+            'name': self.name,
+            'status': self.status,
+            'source': self.source,
+            'cached': self.cached,
+            'attempts': self.attempts,
+            'retries': max(0, self.attempts - 1),
+            'retry_wait': round(self.retry_wait, 3),
+            'fetch_seconds': round(self.fetch_seconds, 4),
+            'bars': self.bars,
+            'required_bars': self.required_bars,
+            'failed_stage': self.failed_stage,
+            'exception': self.exception,
+            'message': self.message,
+            'elapsed': round(self.elapsed, 4),
+        }
+
+
+class ScanRunLog:
+    """스캔 한 번의 종목별 실행 기록 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records = []
+        self._skipped = Counter()
+
+    def add(self, record):
+        with self._lock:
+            self._records.append(record)
+
+    def add_skipped(self, counts):
+        """스캔 전에 건너뛴 종목 수 {이유: 개수} 누적 (네거티브 캐시)"""
+        with self._lock:
+            self._skipped.update(counts)
+
+    def records(self):
+        """종목별 레코드 dict 목록"""
+        with self._lock:
+            records = list(self._records)
+        return [record.to_dict() for record in records]
+
+    def summary(self):
+        """상태/실패 단계/예외 클래스/소스별 건수와 재시도·조회 시간 합계, 가장 느린 종목"""
+        records = self.records()
+        with self._lock:
+            skipped = dict(self._skipped)
+        failed = [r for r in records if r['status'] != 'ok']
+        slowest = sorted(records, key=lambda r: -r['elapsed'])[:SLOWEST_TICKERS]
+        return {
+            'tickers': len(records),
+            'status': dict(Counter(r['status'] for r in records)),
+            'skipped': skipped,
+            'failed_stage': dict(Counter(r['failed_stage'] for r in failed if r['failed_stage'])),
+            'exception': dict(Counter(r['exception'] for r in failed if r['exception'])),
+            'source': dict(Counter(r['source'] or 'unknown' for r in records)),
+            'cached': sum(1 for r in records if r['cached']),
+            'retries': sum(r['retries'] for r in records),
+            'retry_wait_seconds': round(sum(r['retry_wait'] for r in records), 3),
+            'fetch_seconds': round(sum(r['fetch_seconds'] for r in records), 3),
+            'failed_seconds': round(sum(r['elapsed'] for r in failed), 3),
+            'slowest': [{'ticker': r['ticker'], 'elapsed': r['elapsed'], 'status': r['status']} for r in slowest],
+        }
+
+    def write(self, path):
+        """종목별 레코드를 JSON Lines 파일로 저장 → 경로 (레코드가 없거나 실패하면 None)"""
+        records = self.records()
+        if not records:
+            return None
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            return path
+        except Exception as e:
+            print(f"⚠️ 종목별 실행 로그 저장 실패: {str(e)}")
+            return None
+
+
+class collect_run_log:
+    """with 블록 동안 현재 스레드의 ticker_run() 레코드를 run_log에 수집"""
+
+    def __init__(self, run_log):
+        self.run_log = run_log
+        self._previous = None
+
+    def __enter__(self):
+        self._previous = getattr(_local, 'run_log', None)
+        _local.run_log = self.run_log
+        return self.run_log
+
+    def __exit__(self, exc_type, exc, tb):
+        _local.run_log = self._previous
+        return False
+
+
+class ticker_run:
+    """
+    종목 하나의 분석 작업을 감싸는 컨텍스트 매니저
+
+    수집 중인 ScanRunLog도 observer도 없으면 아무것도 기록하지 않는다.
+    블록이 끝날 때 실패가 기록되지 않았으면 'ok'로 분류하고, observer(record)를 호출한다.
+    """
+
+    __slots__ = ('record', 'run_log', 'observer', 'started', '_previous')
+
+    def __init__(self, ticker, name=None, observer=None):
+        self.run_log = getattr(_local, 'run_log', None)
+        self.observer = observer
+        self.record = TickerRecord(ticker, name) if (self.run_log is not None or observer is not None) else None
+        self.started = 0.0
+        self._previous = None
+
+    def __enter__(self):
+        if self.record is not None:
+            self._previous = getattr(_local, 'record', None)
+            _local.record = self.record
+            self.started = time.perf_counter()
+        return self.record
+
+    def __exit__(self, exc_type, exc, tb):
+        record = self.record
+        if record is not None:
+            _local.record = self._previous
+            record.elapsed = time.perf_counter() - self.started
+            if exc_type is not None:
+                record.fail('error', exc=exc)
+            elif record.status is None and record.exception is not None:
+                # 가격 조회 예외만 남고 분석기가 따로 기록하지 않은 경우
+                record.fail('fetch_failed', 'fetch')
+            elif record.status is None:
+                record.status = 'ok'
+            if self.run_log is not None:
+                self.run_log.add(record)
+            if self.observer is not None:
+                self.observer(record)
+        return False
+
+
+def current_ticker_record():
+    """현재 스레드에서 기록 중인 TickerRecord (없으면 None)"""
+    return getattr(_local, 'record', None)
+
+
+def record_skipped(counts):
+    """네거티브 캐시로 건너뛴 종목 수를 현재 스레드에서 수집 중인 ScanRunLog에 기록"""
+    run_log = getattr(_local, 'run_log', None)
+    if run_log is not None and counts:
+        run_log.add_skipped(counts)
+
+
+def record_ticker_error(exc=None, stage=None):
+    """분석기가 삼킨 예외나 계산 실패(None 반환)를 현재 종목 레코드에 기록"""
+    record = getattr(_local, 'record', None)
+    if record is not None:
+        record.fail('error', stage, exc)
+
+
+def record_ticker_shortfall(df, required):
+    """가격 데이터가 없거나 required개 미만이라 분석을 건너뛴 경우 기록"""
+    record = getattr(_local, 'record', None)
+    if record is not None:
+        record.required_bars = required
+        if df is None:
+            record.fail('fetch_failed', 'fetch')
+        else:
+            record.bars = len(df)
+            record.fail('insufficient_bars', 'fetch')
+
+
+_ui_timer = None
+_ui_timer_lock = threading.Lock()
+
+
+def get_ui_timer():
+    """화면 렌더링(차트 탭 등) 단계 시간을 모으는 프로세스 전역 StageTimer"""
+    global _ui_timer
+    if _ui_timer is None:
+        with _ui_timer_lock:
+            if _ui_timer is None:
+                _ui_timer = StageTimer(max_samples=1000)
+    return _ui_timer
+
+
+def append_run_log(record, log_dir=RUN_LOG_DIR):
+    """스캔 실행 요약 한 건을 JSON Lines 로그에 추가"""
+    try:
+        os.makedirs(log_dir, exist_ok=True)
+        with open(os.path.join(log_dir, RUN_LOG_FILE), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+    except Exception as e:
+        print(f"⚠️ 실행 로그 저장 실패: {str(e)}")
+
+
+def ticker_log_path(log_dir, label, started_at=None):
+    """종목별 실행 로그 파일 경로 (tickers_{label}_{시각}.jsonl)"""
+    stamp = (started_at or datetime.now()).strftime('%Y%m%d_%H%M%S')
+    safe_label = "".join(c if c.isalnum() or c in '-_' else '_' for c in str(label))
+    return os.path.join(log_dir, f"tickers_{safe_label}_{stamp}.jsonl")
+
+
+def build_run_record(description, started_at, finished_at, progress, stages, **extra):
+    """실행 로그 레코드 (진행 카운터 + 단계별 요약)"""
+    record = {
+        'description': description,
+        'started_at': started_at.strftime('%Y-%m-%d %H:%M:%S') if started_at else None,
+        'finished_at': (finished_at or datetime.now()).strftime('%Y-%m-%d %H:%M:%S'),
+        'elapsed_seconds': round(progress.get('elapsed_seconds', 0.0), 3),
+        'processed': progress.get('processed', 0),
+        'total': progress.get('total', 0),
+        'succeeded': progress.get('succeeded', 0),
+        'failed': progress.get('failed', 0),
+        'found': progress.get('found', 0),
+        'stages': stages,
+    }
+    record.update(extra)
+    return record
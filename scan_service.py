@@ -0,0 +1,332 @@
+"""
+로컬 HTTP/JSON 스캔 서비스
+
+Streamlit 세션 안에 갇혀 있던 스캔 결과를 다른 도구에서도 쓸 수 있도록 JSON으로 제공한다.
+결과는 프로세스 공용 캐시(SharedCache) → 저장된 CSV 순으로 읽고, 조회만으로는 재스캔하지 않는다.
+같은 결과에 대한 반복 조회는 직렬화된 응답을 재사용하므로 수 ms 안에 응답한다.
+
+엔드포인트 (GET):
+    /health                      캐시/작업/데이터 소스 상태
+    /swing?min_score=50          스윙매매 추천 종목
+    /patterns?pattern=Morning    TA-Lib 패턴 이벤트 (Morning Star / Bullish Breakaway)
+    /reverse-ma?min_score=0      역매공파 점수
+    /signals                     급등신호 분석 결과
+    /ichimoku                    일목균형표 파란점선(파동 응축) 스크리닝
+    /low-trend                   저점 상승 추세 스크리닝
+    /indicators/<ticker>?days=365  종목별 지표 시계열 (MA, MACD, 변동성)
+    /jobs/<job_id>               백그라운드 스캔 진행 상황
+
+엔드포인트 (POST):
+    /scan/<swing|talib|signals|reverse-ma|ichimoku|low-trend>   백그라운드 스캔 시작 (이미 실행 중이면 그 작업 반환)
+
+공통 쿼리: universe=all|kospi,kosdaq (스캔 대상, 기본 all - batch_scan.py --universe와 같은 결과),
+         market=KOSPI|KOSDAQ|KONEX|ETF (결과 행 필터), limit=N,
+         format=json|ndjson (ndjson은 chunked 전송으로 스트리밍)
+
+실행:
+    python scan_service.py --port 8765
+"""
+import argparse
+import json
+import threading
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+from data_sources import source_health
+from shared_cache import get_shared_cache, LRUByteCache
+from scan_jobs import get_job_manager
+from chart_data import get_chart_derived, slice_recent, CHART_HISTORY_DAYS
+from indicators import compute_chart_indicators
+from swing_analyzer import SwingTradeAnalyzer, TalibPatternFinder, filter_swing_candidates
+import batch_scan
+
+DEFAULT_PORT = 8765
+
+# NDJSON 스트리밍 시 한 번에 보내는 행 수
+STREAM_CHUNK_ROWS = 500
+
+# 직렬화된 응답 캐시 예산 (MB)
+RESPONSE_CACHE_MB = 32
+
+# 엔드포인트 -> 공용 캐시 스캔 이름 (batch_scan.FINDERS와 동일)
+SCAN_ENDPOINTS = {
+    'swing': 'swing',
+    'patterns': 'talib_patterns',
+    'reverse-ma': 'reverse_ma',
+    'signals': 'soaring_signals',
+    'ichimoku': 'ichimoku_cloud',
+    'low-trend': 'low_trend',
+}
+
+
+class ScanService:
+    """스캔 결과 조회/직렬화 (HTTP 핸들러와 분리해서 스레드 간 공유)"""
+
+    def __init__(self, data_dir="analysis_data"):
+        self.data_dir = data_dir
+        self.shared_cache = get_shared_cache(data_dir)
+        self.response_cache = LRUByteCache(max_bytes=RESPONSE_CACHE_MB * 1024 * 1024)
+        self._load_lock = threading.Lock()
+
+    # ---------- 결과 조회 ----------
+
+    def _load_saved(self, scan_name, tag):
+        """공용 캐시에 없을 때 같은 스캔 대상(tag)으로 저장된 CSV에서 로드 (최근 7일 중 가장 최근 파일)"""
+        today = datetime.now().date()
+        for days_back in range(8):
+            date = today - timedelta(days=days_back)
+            if scan_name == 'swing':
+                df = SwingTradeAnalyzer(data_dir=self.data_dir).load_cached_analysis(date=date, tag=tag)
+            elif scan_name == 'talib_patterns':
+                df = TalibPatternFinder(data_dir=self.data_dir).load_talib_week_patterns(date=date, tag=tag)
+            else:
+                df = batch_scan.load_scan_csv(scan_name, self.data_dir, date=date.strftime("%Y-%m-%d"), tag=tag)
+            if df is not None and len(df) > 0:
+                return df
+            if scan_name == 'swing':
+                # 스윙매매 결과는 당일 분석만 의미가 있음
+                break
+        return None
+
+    @staticmethod
+    def resolve_universe(universe):
+        """쿼리의 스캔 대상 → 시장 목록 이름 (시장 목록만 허용, 잘못된 값이면 ValueError)"""
+        universe = universe or batch_scan.DEFAULT_UNIVERSE
+        if batch_scan.parse_markets(universe) is None:
+            raise ValueError(f"알 수 없는 스캔 대상: {universe} ('all' 또는 쉼표로 구분한 시장 이름)")
+        return universe
+
+    def get_scan_results(self, scan_name, universe=None):
+        """스캔 결과 DataFrame (공용 캐시 → 저장된 CSV, 없으면 None - 재스캔하지 않음)"""
+        universe = self.resolve_universe(universe)
+        key = batch_scan.scan_key(scan_name, universe, None)
+        results = self.shared_cache.get(key)
+        if results is not None:
+            return results
+
+        # 여러 요청이 동시에 CSV를 읽지 않도록 직렬화
+        with self._load_lock:
+            results = self.shared_cache.get(key)
+            if results is None:
+                results = self._load_saved(scan_name, batch_scan.universe_tag(universe))
+                if results is not None:
+                    self.shared_cache.set(key, results)
+        return results
+
+    def query_scan(self, endpoint, params):
+        """
+        엔드포인트별 필터 적용
+
+        Returns:
+            (원본 결과, 필터된 DataFrame) - 결과가 없으면 (None, None)
+        """
+        source = self.get_scan_results(SCAN_ENDPOINTS[endpoint], params.get('universe'))
+        if source is None:
+            return None, None
+        results = source
+
+        if endpoint == 'swing' and 'min_score' in params:
+            results = filter_swing_candidates(results, min_score=float(params['min_score']))
+        elif endpoint == 'patterns' and 'pattern' in params and 'pattern_type' in results.columns:
+            results = results[results['pattern_type'].str.contains(params['pattern'], case=False, na=False)]
+        elif endpoint == 'reverse-ma' and 'min_score' in params and 'score' in results.columns:
+            results = results[results['score'] >= float(params['min_score'])]
+
+        if 'market' in params and 'market' in results.columns:
+            results = results[results['market'] == params['market'].upper()]
+        if 'limit' in params:
+            results = results.head(int(params['limit']))
+        return source, results
+
+    def get_indicators(self, ticker, days, params):
+        """
+        종목별 지표 시계열 (차트 캐시의 파생 값 재사용)
+
+        Returns:
+            (원본 지표 DataFrame, 기간/limit 적용 DataFrame) - 데이터가 없으면 (None, None)
+        """
+        source = get_chart_derived(ticker, CHART_HISTORY_DAYS, ('service_indicators',), compute_chart_indicators)
+        if source is None:
+            return None, None
+        df = slice_recent(source, days)
+        df = df.reset_index().rename(columns={df.index.name or 'index': 'Date'})
+        if 'limit' in params:
+            df = df.tail(int(params['limit']))
+        return source, df
+
+    # ---------- 직렬화 ----------
+
+    def encode_json(self, cache_key, source, df, meta):
+        """
+        DataFrame을 JSON 본문으로 직렬화
+
+        원본 결과 객체(source)가 바뀌지 않았으면 같은 쿼리는 직렬화된 본문을 그대로 재사용한다.
+        """
+        entry = self.response_cache.get(cache_key)
+        if entry is not None and entry[0] is source:
+            return entry[1]
+        records = df.to_json(orient='records', force_ascii=False, date_format='iso')
+        body = f'{{"meta": {json.dumps(meta, ensure_ascii=False)}, "count": {len(df)}, "rows": {records}}}'.encode('utf-8')
+        self.response_cache.set(cache_key, (source, body))
+        return body
+
+    @staticmethod
+    def iter_ndjson(df, chunk_rows=STREAM_CHUNK_ROWS):
+        """DataFrame을 NDJSON 조각으로 나눠서 생성 (스트리밍 응답용)"""
+        for start in range(0, len(df), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            yield chunk.to_json(orient='records', lines=True, force_ascii=False, date_format='iso').rstrip('\n').encode('utf-8') + b'\n'
+
+    # ---------- 스캔 작업 ----------
+
+    def submit_scan(self, finder_name, universe=None):
+        """백그라운드 스캔 시작 (같은 스캔 대상으로 실행 중이면 그 작업 반환)"""
+        scan_name, run = batch_scan.FINDERS[finder_name]
+        universe = self.resolve_universe(universe)
+        data_dir = self.data_dir
+
+        def run_job(job):
+            stocks = batch_scan.load_universe(universe, data_dir=data_dir)
+            return run(stocks, data_dir, progress_callback=job.update_progress, tag=batch_scan.universe_tag(universe))
+
+        return get_job_manager().submit(batch_scan.scan_key(scan_name, universe, None), run_job,
+                                        description=f"{finder_name} 스캔 ({universe})")
+
+
+class ScanRequestHandler(BaseHTTPRequestHandler):
+    """스캔 서비스 HTTP 핸들러 (요청마다 별도 스레드)"""
+
+    protocol_version = "HTTP/1.1"
+    service = None  # make_server에서 주입
+
+    def log_message(self, format, *args):
+        # 요청마다 stderr에 찍히는 기본 로그 대신 간단히 출력
+        print(f"🌐 {self.address_string()} {format % args}")
+
+    # ---------- 응답 헬퍼 ----------
+
+    def _send_body(self, status, body, content_type="application/json; charset=utf-8"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, payload):
+        self._send_body(status, json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8'))
+
+    def _send_error(self, status, message):
+        self._send_json(status, {'error': message})
+
+    def _send_frame(self, cache_key, source, df, meta, params):
+        """format=ndjson이면 chunked 스트리밍, 아니면 JSON 한 번에 전송"""
+        if params.get('format') != 'ndjson':
+            self._send_body(200, self.service.encode_json(cache_key, source, df, meta))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for piece in self.service.iter_ndjson(df):
+            self.wfile.write(f"{len(piece):X}\r\n".encode('ascii') + piece + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    # ---------- 라우팅 ----------
+
+    def _parse(self):
+        parsed = urlparse(self.path)
+        parts = [p for p in parsed.path.split('/') if p]
+        params = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+        return parts, params
+
+    def do_GET(self):
+        parts, params = self._parse()
+        try:
+            if parts == ['health']:
+                self._send_json(200, {
+                    'status': 'ok',
+                    'shared_cache': self.service.shared_cache.stats(),
+                    'response_cache': self.service.response_cache.stats(),
+                    'jobs': [job.snapshot() for job in get_job_manager().list_jobs()],
+                    'sources': source_health(),
+                })
+            elif len(parts) == 1 and parts[0] in SCAN_ENDPOINTS:
+                endpoint = parts[0]
+                source, df = self.service.query_scan(endpoint, params)
+                if df is None:
+                    self._send_error(404, f"'{endpoint}' 결과가 없습니다. batch_scan.py 또는 POST /scan 으로 먼저 스캔하세요.")
+                    return
+                cache_key = ('scan', endpoint, tuple(sorted(params.items())))
+                self._send_frame(cache_key, source, df, {'endpoint': endpoint}, params)
+            elif len(parts) == 2 and parts[0] == 'indicators':
+                ticker = str(parts[1]).zfill(6)
+                days = int(params.get('days', 365))
+                source, df = self.service.get_indicators(ticker, days, params)
+                if df is None:
+                    self._send_error(404, f"{ticker} 가격 데이터를 조회할 수 없습니다.")
+                    return
+                cache_key = ('indicators', ticker, tuple(sorted(params.items())))
+                self._send_frame(cache_key, source, df, {'endpoint': 'indicators', 'ticker': ticker, 'days': days}, params)
+            elif len(parts) == 2 and parts[0] == 'jobs':
+                job = get_job_manager().get(parts[1])
+                if job is None:
+                    self._send_error(404, f"작업을 찾을 수 없습니다: {parts[1]}")
+                    return
+                self._send_json(200, job.snapshot())
+            else:
+                self._send_error(404, f"알 수 없는 경로: {self.path}")
+        except (ValueError, KeyError) as e:
+            self._send_error(400, f"잘못된 요청: {str(e)}")
+        except Exception as e:
+            self._send_error(500, f"{type(e).__name__}: {str(e)}")
+
+    def do_POST(self):
+        parts, params = self._parse()
+        # 본문은 사용하지 않지만 keep-alive 연결을 위해 읽어서 버림
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+
+        if len(parts) == 2 and parts[0] == 'scan' and parts[1] in batch_scan.FINDERS:
+            try:
+                job, created = self.service.submit_scan(parts[1], params.get('universe'))
+            except ValueError as e:
+                self._send_error(400, f"잘못된 요청: {str(e)}")
+                return
+            except Exception as e:
+                self._send_error(500, f"{type(e).__name__}: {str(e)}")
+                return
+            self._send_json(202 if created else 200, dict(job.snapshot(), created=created))
+        else:
+            self._send_error(404, f"알 수 없는 경로: {self.path}")
+
+
+def make_server(host="127.0.0.1", port=DEFAULT_PORT, data_dir="analysis_data"):
+    """스캔 서비스 HTTP 서버 생성 (serve_forever()로 실행)"""
+    handler = type('BoundScanRequestHandler', (ScanRequestHandler,), {'service': ScanService(data_dir)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="스윙매매 스캔 결과 JSON 서비스")
+    parser.add_argument('--host', default="127.0.0.1", help="바인드 주소 (기본: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"포트 (기본: {DEFAULT_PORT})")
+    parser.add_argument('--data-dir', default="analysis_data", help="결과/공용 캐시 디렉토리 (기본: analysis_data)")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.data_dir)
+    print(f"🚀 스캔 서비스 시작: http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 스캔 서비스 종료")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
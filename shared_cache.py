@@ -0,0 +1,340 @@
+"""
+프로세스 공용 캐시 모듈
+
+Streamlit의 st.session_state는 브라우저 세션마다 따로 존재하므로, 여러 사용자가
+같은 스캔을 요청하면 각자 전체 종목을 다시 분석하고 결과를 각자 메모리에 들고 있게 된다.
+SharedCache는 프로세스 전체에서 하나만 존재하는 캐시로, 같은 키에 대한 동시 요청은
+하나의 계산(single-flight)을 함께 기다린 뒤 결과를 공유한다.
+"""
+import os
+import sys
+import pickle
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+
+class _Flight:
+    """진행 중인 계산 하나 (single-flight)"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+# 이 횟수만큼 저장할 때마다 만료된 항목을 정리 (가격 캐시 키에 날짜가 들어 있어 정리하지 않으면 날마다 쌓임)
+PRUNE_INTERVAL = 256
+
+
+class SharedCache:
+    """
+    프로세스 전역 캐시 (TTL + single-flight 중복 제거 + 선택적 디스크 저장)
+
+    max_entries를 넘으면 가장 오래 안 쓴 항목부터 메모리에서 제거한다 (디스크에 저장한 값은 다시 읽을 수 있음).
+    """
+
+    def __init__(self, persist_dir=None, max_entries=None):
+        self.persist_dir = persist_dir
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, expires_at), 최근 사용 순
+        self._flights = {}  # key -> _Flight
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.joins = 0
+        self.evictions = 0
+
+    # ---------- 디스크 저장 ----------
+
+    def _persist_path(self, key):
+        """키에 대응하는 디스크 파일 경로"""
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.persist_dir, f"{digest}.pkl")
+
+    def _load_persisted(self, key):
+        """디스크에 저장된 값 로드 (없거나 만료되면 None)"""
+        if not self.persist_dir:
+            return None
+        filepath = self._persist_path(key)
+        if not os.path.exists(filepath):
+            return None
+        try:
+            with open(filepath, 'rb') as f:
+                stored_key, value, expires_at = pickle.load(f)
+        except Exception:
+            return None
+        if stored_key != key or (expires_at is not None and expires_at < time.time()):
+            return None
+        return value, expires_at
+
+    def _save_persisted(self, key, value, expires_at):
+        """값을 디스크에 저장 (다른 프로세스/재시작 후에도 재사용)"""
+        if not self.persist_dir:
+            return
+        try:
+            os.makedirs(self.persist_dir, exist_ok=True)
+            filepath = self._persist_path(key)
+            tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((key, value, expires_at), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, filepath)
+        except Exception as e:
+            print(f"⚠️ 공용 캐시 디스크 저장 실패: {str(e)}")
+
+    # ---------- 기본 연산 ----------
+
+    def get(self, key, default=None):
+        """캐시된 값 조회 (메모리 → 디스크 순)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at >= time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+        persisted = self._load_persisted(key)
+        with self._lock:
+            if persisted is not None:
+                self._store(key, persisted)
+                self.hits += 1
+                return persisted[0]
+            self.misses += 1
+        return default
+
+    def set(self, key, value, ttl=None, persist=False):
+        """값 저장 (ttl: 초 단위 유효 시간, persist: 디스크에도 저장)"""
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._store(key, (value, expires_at))
+        if persist:
+            self._save_persisted(key, value, expires_at)
+
+    def invalidate(self, key=None):
+        """키 하나(또는 전체) 삭제"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+        if key is not None and self.persist_dir:
+            try:
+                os.remove(self._persist_path(key))
+            except OSError:
+                pass
+
+    def _store(self, key, entry):
+        """메모리에 저장 (락을 잡은 상태에서 호출) - 주기적으로 만료 항목 정리, 개수 상한을 넘으면 오래된 항목 제거"""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._writes += 1
+        if self._writes % PRUNE_INTERVAL == 0:
+            self._prune_expired()
+        if self.max_entries is not None:
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _prune_expired(self):
+        """만료된 항목 삭제 (락을 잡은 상태에서 호출)"""
+        now = time.time()
+        expired = [k for k, (_, exp) in self._entries.items() if exp is not None and exp < now]
+        for k in expired:
+            del self._entries[k]
+        return len(expired)
+
+    def prune(self):
+        """만료된 항목 정리"""
+        with self._lock:
+            return self._prune_expired()
+
+    def in_flight(self, key):
+        """해당 키의 계산이 다른 요청에서 진행 중인지 여부"""
+        with self._lock:
+            return key in self._flights
+
+    def get_or_compute(self, key, compute, ttl=None, persist=False, refresh=False):
+        """
+        캐시된 값을 반환하거나, 없으면 compute()로 계산해서 저장
+
+        같은 키로 동시에 들어온 요청은 첫 요청의 계산이 끝나기를 기다린 뒤 같은 결과를 받는다.
+        refresh=True면 저장된 값은 무시하지만, 이미 진행 중인 계산이 있으면 그 결과에 합류한다.
+        compute()가 예외를 던지면 기다리던 모든 요청에 같은 예외가 전달되고 값은 저장되지 않는다.
+        """
+        if not refresh:
+            sentinel = object()
+            value = self.get(key, sentinel)
+            if value is not sentinel:
+                return value
+
+        with self._lock:
+            flight = self._flights.get(key)
+            owner = flight is None
+            if owner:
+                flight = _Flight()
+                self._flights[key] = flight
+            else:
+                self.joins += 1
+
+        if not owner:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+            self.set(key, flight.value, ttl=ttl, persist=persist)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.event.set()
+
+    def stats(self):
+        """캐시 통계"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'in_flight': len(self._flights),
+                'hits': self.hits,
+                'misses': self.misses,
+                'joins': self.joins,
+                'evictions': self.evictions,
+            }
+
+
+# 공용 캐시 메모리 항목 수 상한 - 환경변수 SWING_SHARED_CACHE_ENTRIES로 조정
+SHARED_CACHE_MAX_ENTRIES = int(os.environ.get('SWING_SHARED_CACHE_ENTRIES', '10000'))
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache(data_dir="analysis_data"):
+    """프로세스 전역 SharedCache 인스턴스 반환"""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = SharedCache(persist_dir=os.path.join(data_dir, "shared_cache"),
+                                            max_entries=SHARED_CACHE_MAX_ENTRIES)
+    return _shared_cache
+
+
+def scan_cache_key(scan_name, date=None, **params):
+    """스캔 결과용 캐시 키 (스캔 종류 + 날짜 + 파라미터)"""
+    if date is None:
+        date = datetime.now().strftime("%Y-%m-%d")
+    return ('scan', scan_name, str(date), tuple(sorted(params.items())))
+
+
+def estimate_nbytes(value):
+    """캐시 항목의 대략적인 메모리 크기 (바이트)"""
+    memory_usage = getattr(value, 'memory_usage', None)
+    if callable(memory_usage):
+        try:
+            usage = memory_usage(index=True, deep=True)
+            return int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+        except TypeError:
+            pass
+    nbytes = getattr(value, 'nbytes', None)
+    if nbytes is not None:
+        return int(nbytes)
+    if isinstance(value, dict):
+        return sum(estimate_nbytes(v) for v in value.values()) + sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_nbytes(v) for v in value) + sys.getsizeof(value)
+    return sys.getsizeof(value)
+
+
+class LRUByteCache:
+    """메모리 예산(바이트) 기반 LRU 캐시 - 예산을 넘으면 가장 오래 안 쓴 항목부터 제거"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, nbytes)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """값 조회 (조회된 항목은 최근 사용으로 이동)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        """값 저장 후 예산을 넘으면 오래된 항목 제거 (예산보다 큰 항목은 저장하지 않음)"""
+        nbytes = estimate_nbytes(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (value, nbytes)
+            self.current_bytes += nbytes
+            while self.current_bytes > self.max_bytes and self._entries:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_bytes
+                self.evictions += 1
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def invalidate(self, key=None):
+        """키 하나(또는 전체) 삭제"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self.current_bytes = 0
+            else:
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    self.current_bytes -= entry[1]
+
+    def stats(self):
+        """캐시 통계"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+# 차트 데이터 캐시 예산 (MB) - 환경변수 SWING_CHART_CACHE_MB로 조정
+CHART_CACHE_MB = int(os.environ.get('SWING_CHART_CACHE_MB', '128'))
+
+_chart_cache = None
+
+
+def get_chart_cache():
+    """프로세스 전역 차트 데이터 LRU 캐시 반환"""
+    global _chart_cache
+    if _chart_cache is None:
+        with _shared_cache_lock:
+            if _chart_cache is None:
+                _chart_cache = LRUByteCache(max_bytes=CHART_CACHE_MB * 1024 * 1024)
+    return _chart_cache
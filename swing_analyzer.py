@@ -1,20 +1,134 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import FinanceDataReader as fdr
-import requests
-from bs4 import BeautifulSoup
 import warnings
 import os
 
-try:
-    import talib
-    TALIB_AVAILABLE = True
-except ImportError:
-    TALIB_AVAILABLE = False
+from price_data import get_price_history, prefetch_price_histories
+from data_sources import fetch_listing, MARKETS
+from shared_cache import get_shared_cache
+from progress import ProgressTracker, ConsoleProgressReporter
+from scan_metrics import timed_stage, ticker_run, record_ticker_error, record_ticker_shortfall, record_skipped
+from negative_cache import get_negative_cache
+from candlestick import cdl_morningstar, cdl_breakaway
+from ichimoku import latest_cloud_signal, get_ichimoku_signal, screen_ichimoku, BASE_PERIOD as ICHIMOKU_BASE_PERIOD
+from trend import rolling_trend, rising_run_length, screen_low_trends, SUPPORT_TREND_WINDOW, RISING_LOWS_WINDOW
 
 warnings.filterwarnings('ignore')
 
+
+def load_price_frame(ticker, days, required):
+    """
+    공용 가격 레이어에서 OHLCV 조회
+
+    Returns:
+        Open/High/Low/Close/Volume DataFrame (required개 미만이거나 실패하면 None, 사유는 실행 로그에 기록)
+    """
+    try:
+        # 공용 레이어가 정수 압축 데이터에서 결측 없는 float64 OHLCV를 새로 만들어 주므로 추가 정제/복사 불필요
+        df = get_price_history(str(ticker).zfill(6), days)
+        if df is None or len(df) < required:
+            record_ticker_shortfall(df, required)
+            return None
+        return df
+    except Exception as e:
+        record_ticker_error(e, 'fetch')
+        return None
+
+
+def skip_negative_cached(detector, stocks, data_dir):
+    """
+    네거티브 캐시(캔들 부족/가격 소스 연속 실패)에 걸린 종목을 스캔 전에 제외
+
+    Returns:
+        (남은 종목 목록, NegativeCache) - 종목별로 observer(detector)를 넘기고 스캔 후 save() 호출
+    """
+    negative_cache = get_negative_cache(data_dir)
+    stocks, skipped = negative_cache.filter_stocks(detector, stocks)
+    if skipped:
+        record_skipped(skipped)
+        detail = ", ".join(f"{reason} {count}" for reason, count in skipped.items())
+        print(f"⏭️ {detector}: 이전 스캔 기록으로 {sum(skipped.values())}개 종목 건너뜀 ({detail})")
+    return stocks, negative_cache
+
+
+def load_panel_frames(detector, stocks, data_dir, days, required, progress_callback=None):
+    """
+    시장 전체 패널 스크리닝용 가격 데이터 조회 (종목별 실행 로그/네거티브 캐시 기록 포함)
+
+    Args:
+        stocks: Code/Name DataFrame 또는 (종목코드, 종목명) 목록
+        progress_callback: progress_callback(완료 수, 전체 수, 종목명, 종목코드, 조회 성공 수, 성공 여부)
+
+    Returns:
+        (종목코드 목록, 종목명 목록, DataFrame 목록) - required개 이상 조회된 종목만
+    """
+    stocks, negative_cache = skip_negative_cached(detector, stocks, data_dir)
+    observe = negative_cache.observer(detector)
+    pairs = list(zip(stocks['Code'], stocks['Name'])) if hasattr(stocks, 'columns') else list(stocks)
+    prefetch_price_histories([code for code, _ in pairs], days, markets=universe_markets(stocks))
+
+    tickers, names, frames = [], [], []
+    for idx, (ticker, name) in enumerate(pairs):
+        ticker = str(ticker).zfill(6)
+        with ticker_run(ticker, name, observer=observe):
+            df = load_price_frame(ticker, days, required)
+            if df is not None:
+                tickers.append(ticker)
+                names.append(name)
+                frames.append(df)
+        if progress_callback:
+            progress_callback(idx + 1, len(pairs), name, ticker, len(frames), df is not None)
+
+    negative_cache.save()
+    return tickers, names, frames
+
+
+def universe_markets(stocks):
+    """종목 목록에 들어 있는 시장 목록 (Market 컬럼이 없으면 None)"""
+    if hasattr(stocks, 'columns') and 'Market' in stocks.columns:
+        return list(dict.fromkeys(stocks['Market'].dropna()))
+    return None
+
+
+def tagged_filename(prefix, date, tag=None):
+    """결과 CSV 파일 이름 - tag(스캔 대상 표시)가 있으면 {prefix}_{tag}_{date}.csv, 없으면 {prefix}_{date}.csv"""
+    return f"{prefix}_{tag}_{date}.csv" if tag else f"{prefix}_{date}.csv"
+
+
+# 종목 목록을 조회할 때마다 채워지는 종목코드 → 시장 (종목 목록 대신 (코드, 이름) 튜플로 스캔한 결과 태깅용)
+_ticker_markets = {}
+
+
+def tag_market(results, stocks=None):
+    """결과 DataFrame의 ticker 컬럼으로 market 컬럼 추가 (stocks의 Market 컬럼 우선, 모르는 종목은 빈 값)"""
+    if results is None or results.empty or 'ticker' not in results.columns:
+        return results
+    markets = _ticker_markets
+    if hasattr(stocks, 'columns') and 'Market' in stocks.columns:
+        markets = {**_ticker_markets, **dict(zip(stocks['Code'], stocks['Market']))}
+    results['market'] = results['ticker'].astype(str).str.zfill(6).map(markets).fillna('')
+    return results
+
+
+# 종목 목록 캐시 유효 시간 (하루 중 상장 종목은 거의 바뀌지 않음)
+LISTING_TTL_SECONDS = 12 * 60 * 60
+
+# 전체 시장 스캔 기본 대상
+DEFAULT_MARKETS = MARKETS
+
+# 448일선까지 쓰는 분석기(역매공파, 112/224/448 정배열, Morning Star)는 450개 이상의 캔들이 필요
+# - 거래일 기준 약 650 달력일 (공휴일 여유 포함 700일)
+LONG_MA_HISTORY_DAYS = 700
+
+# 분석기별 가격 데이터 조회 기간 (달력 기준) - 스캔 전 병렬 미리 조회도 같은 기간으로 캐시를 채움
+SWING_HISTORY_DAYS = 120
+TALIB_HISTORY_DAYS = 500
+SIGNAL_HISTORY_DAYS = 180
+
+# 파란점선 시장 스크리닝 조회 기간 (달력 기준, 기준선 26봉을 넉넉히 덮는 기간)
+ICHIMOKU_SCREEN_DAYS = 120
+
 class SwingTradeAnalyzer:
     """스윙매매 종목 분석기"""
 
@@ -25,15 +139,15 @@ class SwingTradeAnalyzer:
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
 
-    def get_cache_filepath(self, date=None):
-        """캐시 파일 경로 반환"""
+    def get_cache_filepath(self, date=None, tag=None):
+        """캐시 파일 경로 반환 (tag: 스캔 대상 표시, 예: 'all', 'kospi-top50')"""
         if date is None:
             date = datetime.now().strftime("%Y-%m-%d")
-        return os.path.join(self.data_dir, f"analysis_{date}.csv")
+        return os.path.join(self.data_dir, tagged_filename("analysis", date, tag))
 
-    def load_cached_analysis(self, date=None):
+    def load_cached_analysis(self, date=None, tag=None):
         """저장된 분석 데이터 로드"""
-        filepath = self.get_cache_filepath(date)
+        filepath = self.get_cache_filepath(date, tag)
         if os.path.exists(filepath):
             print(f"📂 캐시된 데이터 로드: {filepath}")
             df = pd.read_csv(filepath)
@@ -41,101 +155,86 @@ class SwingTradeAnalyzer:
             return df
         return None
 
-    def save_analysis_results(self, results_df, date=None):
+    def save_analysis_results(self, results_df, date=None, tag=None):
         """분석 결과를 CSV로 저장"""
         if results_df.empty:
             return
 
-        filepath = self.get_cache_filepath(date)
+        filepath = self.get_cache_filepath(date, tag)
         results_df.to_csv(filepath, index=False, encoding='utf-8-sig')
         print(f"✓ 분석 결과 저장: {filepath}")
 
     def get_kospi_stocks(self):
-        """KOSPI 전체 종목 조회 - 다중 소스 폴백 지원"""
+        """KOSPI 전체 종목 조회 (Code, Name, Market)"""
+        return self.get_market_stocks(('KOSPI',))
 
-        # 방법 1: pykrx 사용 (권장)
-        try:
-            from pykrx import stock
-            print("📊 [1/5] pykrx로 KOSPI 종목 조회 중...")
-            kospi_tickers = stock.get_market_ticker_list(market="KOSPI")
-
-            if kospi_tickers and len(kospi_tickers) > 0:
-                kospi_list = []
-                for ticker in kospi_tickers:
-                    try:
-                        name = stock.get_market_ticker_name(ticker)
-                        kospi_list.append({'Code': ticker, 'Name': name})
-                    except:
-                        kospi_list.append({'Code': ticker, 'Name': f'Unknown_{ticker}'})
-
-                result = pd.DataFrame(kospi_list)
-                print(f"✓ KOSPI 종목 {len(result)}개 조회 완료 (pykrx)")
-                return result
-        except ImportError:
-            print("⚠️ [1/5] pykrx 미설치 - 다음 방법 시도")
-        except Exception as e:
-            print(f"⚠️ [1/5] pykrx 실패: {str(e)}")
+    def get_market_stocks(self, markets=DEFAULT_MARKETS):
+        """
+        여러 시장 전체 종목 조회 (KOSPI, KOSDAQ, KONEX, ETF)
 
-        # 방법 2: FinanceDataReader 사용
+        Returns:
+            Code, Name, Market DataFrame (여러 시장에 있는 종목은 앞 시장 기준으로 한 번만)
+        """
+        frames = []
+        for market in markets:
+            listing = self.get_listing(market)
+            if not listing.empty:
+                frames.append(listing[['Code', 'Name']].assign(Market=market))
+        if not frames:
+            return pd.DataFrame(columns=['Code', 'Name', 'Market'])
+
+        result = pd.concat(frames, ignore_index=True).drop_duplicates(subset=['Code']).reset_index(drop=True)
+        _ticker_markets.update(zip(result['Code'], result['Market']))
+        if len(frames) > 1:
+            counts = ", ".join(f"{market} {count}" for market, count in result['Market'].value_counts(sort=False).items())
+            print(f"✓ 전체 {len(result)}개 종목 ({counts})")
+        return result
+
+    def get_listing(self, market):
+        """시장 하나의 전체 종목 조회 - 다중 소스 헤지 조회 후 로컬 파일/기본 목록(KOSPI만)으로 폴백"""
+        cache_file = os.path.join(self.data_dir, f"{market.lower()}_all_stocks.csv")
+
+        # 방법 1: FinanceDataReader / pykrx / KRX CSV 헤지 조회 (하루 동안 공용 캐시)
         try:
-            import FinanceDataReader as fdr
-            print("📊 [2/5] FinanceDataReader로 KOSPI 종목 조회 중...")
-            stocks_df = fdr.StockListing("KOSPI")
-
-            if stocks_df is not None and len(stocks_df) > 0:
-                result = stocks_df[['Code', 'Name']].copy()
-                result = result.drop_duplicates(subset=['Code']).reset_index(drop=True)
-                print(f"✓ KOSPI 종목 {len(result)}개 조회 완료 (FinanceDataReader)")
-                return result
+            print(f"📊 [1/3] {market} 종목 목록 조회 중 (FinanceDataReader / pykrx / KRX)...")
+            today = datetime.now().strftime("%Y-%m-%d")
+
+            def load_listing():
+                listing = fetch_listing(market)
+                if listing is None or listing.empty:
+                    # 빈 결과는 캐시하지 않도록 예외로 처리
+                    raise ValueError("모든 소스에서 종목 목록이 비어 있습니다")
+                return listing
+
+            result = get_shared_cache().get_or_compute(('listing', market, today), load_listing, ttl=LISTING_TTL_SECONDS)
+            if result is not None and not result.empty:
+                print(f"✓ {market} 종목 {len(result)}개 조회 완료 ({result.attrs.get('source', '캐시')})")
+                # 다음에 외부 소스가 모두 실패해도 쓸 수 있도록 전체 목록 저장
+                try:
+                    os.makedirs(self.data_dir, exist_ok=True)
+                    result.to_csv(cache_file, index=False, encoding='utf-8-sig')
+                except Exception:
+                    pass
+                return result.copy()
         except Exception as e:
-            print(f"⚠️ [2/5] FinanceDataReader 실패: {str(e)}")
+            print(f"⚠️ [1/3] 외부 종목 목록 조회 실패: {str(e)}")
 
-        # 방법 3: 로컬 저장된 KOSPI 전체 종목 파일에서 로드
+        # 방법 2: 로컬 저장된 KOSPI 전체 종목 파일에서 로드
         try:
-            print("📂 [3/5] 로컬 전체 KOSPI 종목 파일 확인 중...")
-            cache_file = os.path.join(self.data_dir, "kospi_all_stocks.csv")
+            print(f"📂 [2/3] 로컬 전체 {market} 종목 파일 확인 중...")
             if os.path.exists(cache_file):
-                result = pd.read_csv(cache_file)
+                result = pd.read_csv(cache_file, dtype={'Code': str})
                 if not result.empty and 'Code' in result.columns and 'Name' in result.columns:
-                    print(f"✓ KOSPI 종목 {len(result)}개 조회 완료 (저장된 전체 파일)")
+                    result['Code'] = result['Code'].str.zfill(6)
+                    print(f"✓ {market} 종목 {len(result)}개 조회 완료 (저장된 전체 파일)")
                     return result
         except Exception as e:
-            print(f"⚠️ [3/5] 로컬 전체 파일 실패: {str(e)}")
-
-        # 방법 4: KRX 공식 CSV 다운로드
-        try:
-            print("📥 [4/5] KRX 공식 CSV 다운로드 중...")
-            url = "https://kind.krx.co.kr/corpgeneral/corpList.do?method=download&searchType=13"
-
-            response = requests.get(
-                url,
-                headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'},
-                timeout=15
-            )
-
-            if response.status_code == 200:
-                for encoding in ['euc-kr', 'cp949', 'utf-8']:
-                    try:
-                        df = pd.read_csv(
-                            pd.io.common.BytesIO(response.content),
-                            encoding=encoding
-                        )
-                        df.columns = df.columns.str.strip()
-
-                        if '종목코드' in df.columns and '회사명' in df.columns:
-                            result = df[['회사명', '종목코드']].copy()
-                            result.columns = ['Name', 'Code']
-                            result['Code'] = result['Code'].astype(str).str.zfill(6)
-                            result = result.drop_duplicates(subset=['Code']).reset_index(drop=True)
-                            print(f"✓ KOSPI 종목 {len(result)}개 조회 완료 (KRX CSV)")
-                            return result
-                    except Exception as enc_e:
-                        print(f"  인코딩 {encoding} 실패: {str(enc_e)}")
-                        continue
-        except Exception as e:
-            print(f"⚠️ [4/5] KRX CSV 실패: {str(e)}")
+            print(f"⚠️ [2/3] 로컬 전체 파일 실패: {str(e)}")
 
-        # 방법 5: 확장된 기본 KOSPI 종목 데이터 사용
+        # 방법 3: 확장된 기본 KOSPI 종목 데이터 사용 (다른 시장은 기본 목록 없음)
+        if market != 'KOSPI':
+            print(f"⚠️ {market} 종목 목록을 가져오지 못해 제외합니다.")
+            return pd.DataFrame(columns=['Code', 'Name'])
         print("⚠️ 외부 데이터 소스 연결 실패. 확장된 기본 종목 데이터로 진행합니다...")
         fallback_data = {
             'Code': [
@@ -167,73 +266,19 @@ class SwingTradeAnalyzer:
 
         return result
 
-    def get_stock_data(self, ticker, days=120):
-        """FinanceDataReader를 사용한 주식 데이터 조회"""
+    def get_stock_data(self, ticker, days=SWING_HISTORY_DAYS):
+        """공용 가격 레이어에서 OHLCV 조회 (20개 미만이거나 실패하면 None)"""
         try:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
-
-            # FinanceDataReader는 종목코드 그대로 사용 (예: 005930)
-            ticker_str = str(ticker).zfill(6)
-
-            # 재시도 로직 (네트워크 불안정 대응)
-            df = None
-            max_retries = 3
-
-            for attempt in range(max_retries):
-                try:
-                    # FinanceDataReader로 데이터 조회
-                    df = fdr.DataReader(ticker_str, start_date, end_date)
-
-                    # 데이터 유효성 확인
-                    if df is not None and len(df) >= 20:  # 최소 20개 캔들
-                        break
-                    elif attempt < max_retries - 1:
-                        import time
-                        time.sleep(0.5)  # 0.5초 대기 후 재시도
-
-                except Exception as e:
-                    if attempt < max_retries - 1:
-                        import time
-                        time.sleep(0.5)
-                        continue
-                    else:
-                        # 마지막 시도 실패
-                        return None
-
-            # 데이터 검증
+            # 공용 캐시 경유 조회 (최소 20개 캔들, 네트워크 불안정 대응 3회 재시도)
+            # - 정수 압축 데이터에서 결측 없는 float64 OHLCV를 새로 만들어 주므로 추가 정제/복사 불필요
+            df = get_price_history(str(ticker).zfill(6), days, min_rows=20, retries=3)
             if df is None or len(df) < 20:
+                record_ticker_shortfall(df, 20)
                 return None
-
-            # 컬럼명 통일 및 정렬
-            try:
-                # FinanceDataReader는 Open, High, Low, Close, Volume을 반환
-                if all(col in df.columns for col in ['Open', 'High', 'Low', 'Close', 'Volume']):
-                    df = df[['Open', 'High', 'Low', 'Close', 'Volume']].copy()
-                else:
-                    # 컬럼명 통일
-                    df.columns = ['Open', 'High', 'Low', 'Close', 'Volume']
-
-                # NaN 값 제거
-                df = df.dropna()
-                if len(df) < 20:
-                    return None
-
-                # 데이터 타입 확인 및 변환
-                for col in ['Open', 'High', 'Low', 'Close', 'Volume']:
-                    if col in df.columns:
-                        df[col] = pd.to_numeric(df[col], errors='coerce')
-
-                df = df.dropna()
-                if len(df) < 20:
-                    return None
-
-                return df
-
-            except Exception as col_error:
-                return None
+            return df
 
         except Exception as e:
+            record_ticker_error(e, 'fetch')
             return None
 
     def calculate_indicators(self, df):
@@ -385,19 +430,22 @@ class SwingTradeAnalyzer:
                 return None
 
             # 지표 계산
-            df = self.calculate_indicators(df)
+            with timed_stage('indicators'):
+                df = self.calculate_indicators(df)
             if df is None:
+                record_ticker_error(stage='indicators')
                 return None
 
-            # 조건 검사
-            is_uptrend = self.is_uptrend(df)
-            golden_cross = self.check_golden_cross(df)
-            rsi_ok = self.check_rsi_condition(df)
-            macd_bullish = self.check_macd_bullish(df)
+            with timed_stage('signals'):
+                # 조건 검사
+                is_uptrend = self.is_uptrend(df)
+                golden_cross = self.check_golden_cross(df)
+                rsi_ok = self.check_rsi_condition(df)
+                macd_bullish = self.check_macd_bullish(df)
 
-            # 점수 계산
-            volatility_score = self.calculate_volatility_score(df)
-            volume_score = self.calculate_volume_score(df)
+                # 점수 계산
+                volatility_score = self.calculate_volatility_score(df)
+                volume_score = self.calculate_volume_score(df)
 
             # 종합 점수
             condition_score = 0
@@ -444,19 +492,24 @@ class SwingTradeAnalyzer:
             return result
 
         except Exception as e:
+            record_ticker_error(e)
             return None
 
-    def analyze_all_stocks(self, max_stocks=None, progress_callback=None):
-        """모든 KOSPI 종목 분석 - 추천 종목(점수>=50)만 반환
+    def analyze_all_stocks(self, max_stocks=None, progress_callback=None, result_callback=None, stocks=None,
+                           markets=DEFAULT_MARKETS):
+        """전체 시장 종목 분석 - 추천 종목(점수>=50)만 반환
 
         Args:
             max_stocks: 분석할 최대 종목 수 (None = 모든 종목)
-            progress_callback: 진행 상황 콜백 함수 (idx, total, name, ticker, success_count)
+            progress_callback: 진행 상황 콜백 함수 (idx, total, name, ticker, success_count, success)
+            result_callback: 종목 분석 결과(dict)가 나올 때마다 호출되는 콜백 (필터링 전 중간 결과)
+            stocks: 분석할 종목 목록 (Code, Name 컬럼). None이면 markets 전체 종목 조회
+            markets: stocks가 없을 때 조회할 시장 (기본: KOSPI, KOSDAQ, KONEX, ETF)
 
         Returns:
             DataFrame: 추천 종목(점수>=50, 변동성 2-8%)만 포함된 결과
         """
-        kospi_stocks = self.get_kospi_stocks()
+        kospi_stocks = self.get_market_stocks(markets) if stocks is None else stocks.reset_index(drop=True)
 
         if kospi_stocks.empty:
             return pd.DataFrame()
@@ -464,36 +517,42 @@ class SwingTradeAnalyzer:
         if max_stocks:
             kospi_stocks = kospi_stocks.head(max_stocks)
 
-        results = []
+        # 캔들 부족/가격 소스 연속 실패로 기록된 종목은 다시 내려받지 않음
+        kospi_stocks, negative_cache = skip_negative_cached('swing', kospi_stocks, self.data_dir)
+        observe = negative_cache.observer('swing')
 
-        for idx, row in kospi_stocks.iterrows():
-            ticker = row['Code']
-            name = row['Name']
+        # 콜백이 없으면 콘솔에 집계된 진행 상황만 출력 (종목마다 출력하지 않음)
+        if progress_callback is None:
+            progress_callback = ProgressTracker(listeners=[ConsoleProgressReporter("스윙매매 분석")])
+
+        # 가격 데이터를 병렬로 미리 조회 (시장 스냅샷/저장소 증분 갱신 후 부족한 종목만 조회, get_stock_data와 같은 조건)
+        prefetch_price_histories(kospi_stocks['Code'].tolist(), SWING_HISTORY_DAYS, min_rows=20, retries=3,
+                                 markets=universe_markets(kospi_stocks))
 
-            # 현재 분석 중인 종목 표시
-            print(f"🔄 분석 중: {name} ({ticker})")
+        results = []
 
-            result = self.analyze_stock(ticker, name)
+        for idx, (ticker, name) in enumerate(zip(kospi_stocks['Code'], kospi_stocks['Name'])):
+            with ticker_run(ticker, name, observer=observe):
+                result = self.analyze_stock(ticker, name)
 
             if result is not None:
                 results.append(result)
+                if result_callback:
+                    result_callback(result)
 
-            # 진행 상황 콜백 (매 종목마다 호출)
-            if progress_callback:
-                progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results))
+            # 진행 상황 콜백 (매 종목마다 호출 - 화면/콘솔 갱신 빈도는 ProgressTracker가 조절)
+            progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), result is not None)
 
-            # 진행 상황 표시 (10개마다)
-            if (idx + 1) % 10 == 0:
-                success_rate = len(results) / (idx + 1) * 100
-                print(f"📊 진행: {idx + 1}/{len(kospi_stocks)} - 성공: {len(results)}개 ({success_rate:.1f}%)")
+        negative_cache.save()
 
-        results_df = pd.DataFrame(results)
+        with timed_stage('assemble'):
+            results_df = pd.DataFrame(results)
 
-        # 추천 조건: 점수>=50, 변동성 2-8%, 상승추세
-        if not results_df.empty:
-            results_df = filter_swing_candidates(results_df, min_score=50)
+            # 추천 조건: 점수>=50, 변동성 2-8%, 상승추세
+            if not results_df.empty:
+                results_df = filter_swing_candidates(results_df, min_score=50)
 
-        return results_df
+        return tag_market(results_df, kospi_stocks)
 
 
 def filter_swing_candidates(results_df, min_score=50):
@@ -548,130 +607,72 @@ class SoaringStockFinder:
         results_df.to_csv(filepath, index=False, encoding='utf-8-sig')
         print(f"✓ 급등주 분석 결과 저장: {filepath}")
 
-    def get_stock_data_long(self, ticker, days=500):
-        """장기 주식 데이터 조회"""
-        try:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
-
-            # 한국 종목용 ticker 변환
-            if len(ticker) == 6 and ticker.isdigit():
-                ticker_symbol = f"{ticker}.KS"
-            else:
-                ticker_symbol = ticker
-
-            # yfinance 다운로드
-            df = yf.download(
-                ticker_symbol,
-                start=start_date,
-                end=end_date,
-                progress=False,
-                timeout=15,
-                threads=False
-            )
-
-            if df is None or len(df) < 450:
-                return None
-
-            # MultiIndex 처리
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = df.columns.get_level_values(0)
-
-            # 컬럼명 정리
-            df.columns = [str(col).strip() for col in df.columns]
-            df.columns = [col[0].upper() + col[1:].lower() if len(col) > 0 else col for col in df.columns]
-
-            # 컬럼 매핑
-            col_map = {}
-            for col in df.columns:
-                col_lower = col.lower().strip()
-                if col_lower == 'open':
-                    col_map[col] = 'Open'
-                elif col_lower == 'high':
-                    col_map[col] = 'High'
-                elif col_lower == 'low':
-                    col_map[col] = 'Low'
-                elif col_lower == 'close':
-                    col_map[col] = 'Close'
-                elif col_lower == 'volume':
-                    col_map[col] = 'Volume'
-                elif col_lower in ['adj close', 'adj_close']:
-                    col_map[col] = 'Adj Close'
-
-            if col_map:
-                df.rename(columns=col_map, inplace=True)
-
-            # 필요한 컬럼 확인
-            required_cols = ['Open', 'High', 'Low', 'Close', 'Volume']
-            if not all(col in df.columns for col in required_cols):
-                return None
-
-            # 데이터 정제
-            df[required_cols] = df[required_cols].apply(pd.to_numeric, errors='coerce')
-            df = df.dropna(subset=required_cols)
-
-            if len(df) < 450:
-                return None
-
-            return df[required_cols]
-
-        except Exception as e:
-            return None
+    def get_stock_data_long(self, ticker, days=LONG_MA_HISTORY_DAYS):
+        """장기 주식 데이터 조회 (공용 가격 레이어 경유, 450개 미만이면 None)"""
+        return load_price_frame(ticker, days, 450)
 
     def find_soaring_stocks(self, kospi_stocks, progress_callback=None):
         """급등주 발굴: 112MA < 224MA < 448MA 정배열"""
         results = []
+        kospi_stocks, negative_cache = skip_negative_cached('soaring-ma', kospi_stocks.reset_index(drop=True), self.data_dir)
+        observe = negative_cache.observer('soaring-ma')
 
-        for idx, row in kospi_stocks.iterrows():
-            ticker = row['Code']
-            name = row['Name']
-
-            # 장기 데이터 조회
-            df = self.get_stock_data_long(ticker)
-            if df is None or len(df) < 450:
-                if progress_callback:
-                    progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), False)
-                continue
+        # 가격 데이터를 병렬로 미리 조회해서 공용 캐시를 채움 (다른 분석기/차트와 공유)
+        prefetch_price_histories(kospi_stocks['Code'].tolist(), LONG_MA_HISTORY_DAYS, markets=universe_markets(kospi_stocks))
 
-            try:
-                # 이동평균선 계산
-                df['MA112'] = df['Close'].rolling(window=112).mean()
-                df['MA224'] = df['Close'].rolling(window=224).mean()
-                df['MA448'] = df['Close'].rolling(window=448).mean()
-
-                # 최신 데이터
-                latest = df.iloc[-1]
-
-                # 정배열 확인: MA112 < MA224 < MA448
-                if pd.notna(latest['MA112']) and pd.notna(latest['MA224']) and pd.notna(latest['MA448']):
-                    if latest['MA112'] < latest['MA224'] < latest['MA448']:
-                        # 현재가
-                        current_price = latest['Close']
+        for idx, row in kospi_stocks.iterrows():
+            with ticker_run(str(row['Code']).zfill(6), row['Name'], observer=observe):
+                ticker = row['Code']
+                name = row['Name']
 
-                        result = {
-                            'ticker': ticker,
-                            'name': name,
-                            'current_price': current_price,
-                            'price_date': df.index[-1].strftime('%Y-%m-%d'),
-                            'extraction_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                            'ma112': round(latest['MA112'], 2),
-                            'ma224': round(latest['MA224'], 2),
-                            'ma448': round(latest['MA448'], 2),
-                            'distance_112_224': round(latest['MA224'] - latest['MA112'], 2),
-                            'distance_224_448': round(latest['MA448'] - latest['MA224'], 2)
-                        }
+                # 장기 데이터 조회
+                df = self.get_stock_data_long(ticker)
+                if df is None or len(df) < 450:
+                    if progress_callback:
+                        progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), False)
+                    continue
 
-                        results.append(result)
+                try:
+                    # 이동평균선 계산
+                    df['MA112'] = df['Close'].rolling(window=112).mean()
+                    df['MA224'] = df['Close'].rolling(window=224).mean()
+                    df['MA448'] = df['Close'].rolling(window=448).mean()
+
+                    # 최신 데이터
+                    latest = df.iloc[-1]
+
+                    # 정배열 확인: MA112 < MA224 < MA448
+                    if pd.notna(latest['MA112']) and pd.notna(latest['MA224']) and pd.notna(latest['MA448']):
+                        if latest['MA112'] < latest['MA224'] < latest['MA448']:
+                            # 현재가
+                            current_price = latest['Close']
+
+                            result = {
+                                'ticker': ticker,
+                                'name': name,
+                                'current_price': current_price,
+                                'price_date': df.index[-1].strftime('%Y-%m-%d'),
+                                'extraction_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                                'ma112': round(latest['MA112'], 2),
+                                'ma224': round(latest['MA224'], 2),
+                                'ma448': round(latest['MA448'], 2),
+                                'distance_112_224': round(latest['MA224'] - latest['MA112'], 2),
+                                'distance_224_448': round(latest['MA448'] - latest['MA224'], 2)
+                            }
+
+                            results.append(result)
 
-                if progress_callback:
-                    progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), True)
+                    if progress_callback:
+                        progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), True)
 
-            except Exception as e:
-                if progress_callback:
-                    progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), False)
-                continue
+                except Exception as e:
+                    record_ticker_error(e)
+                    if progress_callback:
+                        progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), False)
+                    continue
 
-        return pd.DataFrame(results)
+        negative_cache.save()
+        return tag_market(pd.DataFrame(results), kospi_stocks)
 
 
 class BullishBreakawayFinder:
@@ -707,34 +708,9 @@ class BullishBreakawayFinder:
         results_df.to_csv(filepath, index=False, encoding='utf-8-sig')
         print(f"✓ Bullish Breakaway 분석 결과 저장: {filepath}")
 
-    def get_stock_data_long(self, ticker, days=500):
-        """장기 주식 데이터 조회"""
-        try:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
-
-            # 한국 종목용 ticker 변환
-            if len(ticker) == 6 and ticker.isdigit():
-                ticker_symbol = f"{ticker}.KS"
-            else:
-                ticker_symbol = ticker
-
-            # yfinance 다운로드
-            df = yf.download(
-                ticker_symbol,
-                start=start_date,
-                end=end_date,
-                progress=False,
-                interval="1d"
-            )
-
-            if df is None or df.empty or len(df) < 100:
-                return None
-
-            return df
-
-        except Exception as e:
-            return None
+    def get_stock_data_long(self, ticker, days=LONG_MA_HISTORY_DAYS):
+        """장기 주식 데이터 조회 (공용 가격 레이어 경유, 450개 미만이면 None)"""
+        return load_price_frame(ticker, days, 450)
 
     def detect_bullish_breakaway(self, df, lookback_period=60, breakout_threshold=2.5):
         """
@@ -805,49 +781,57 @@ class BullishBreakawayFinder:
     def find_bullish_breakaway_stocks(self, kospi_stocks, progress_callback=None):
         """Bullish Breakaway 패턴 발굴: 저항선 돌파하는 강한 상승"""
         results = []
+        kospi_stocks, negative_cache = skip_negative_cached('breakaway', kospi_stocks.reset_index(drop=True), self.data_dir)
+        observe = negative_cache.observer('breakaway')
+
+        # 가격 데이터를 병렬로 미리 조회해서 공용 캐시를 채움 (다른 분석기/차트와 공유)
+        prefetch_price_histories(kospi_stocks['Code'].tolist(), LONG_MA_HISTORY_DAYS, markets=universe_markets(kospi_stocks))
 
         for idx, row in kospi_stocks.iterrows():
-            ticker = row['Code']
-            name = row['Name']
+            with ticker_run(str(row['Code']).zfill(6), row['Name'], observer=observe):
+                ticker = row['Code']
+                name = row['Name']
 
-            df = self.get_stock_data_long(ticker)
-            if df is None or len(df) < 450:
-                if progress_callback:
-                    progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), False)
-                continue
+                df = self.get_stock_data_long(ticker)
+                if df is None:
+                    if progress_callback:
+                        progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), False)
+                    continue
 
-            try:
-                pattern_info = self.detect_bullish_breakaway(df)
+                try:
+                    pattern_info = self.detect_bullish_breakaway(df)
 
-                if pattern_info and pattern_info['pattern_detected']:
-                    current_price = df.iloc[-1]['Close']
+                    if pattern_info and pattern_info['pattern_detected']:
+                        current_price = df.iloc[-1]['Close']
 
-                    result = {
-                        'ticker': ticker,
-                        'name': name,
-                        'current_price': round(current_price, 2),
-                        'price_date': df.index[-1].strftime('%Y-%m-%d'),
-                        'extraction_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        'resistance': pattern_info['resistance'],
-                        'support': pattern_info['support'],
-                        'breakout_pct': pattern_info['breakout_pct'],
-                        'uptrend_pct': pattern_info['uptrend_pct'],
-                        'momentum_5d': pattern_info['momentum_5d'],
-                        'breakaway_strength': round(pattern_info['uptrend_pct'] + pattern_info['momentum_5d'], 2),
-                        'volume_check': '✓' if pattern_info['volume_check'] else '✗'
-                    }
+                        result = {
+                            'ticker': ticker,
+                            'name': name,
+                            'current_price': round(current_price, 2),
+                            'price_date': df.index[-1].strftime('%Y-%m-%d'),
+                            'extraction_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                            'resistance': pattern_info['resistance'],
+                            'support': pattern_info['support'],
+                            'breakout_pct': pattern_info['breakout_pct'],
+                            'uptrend_pct': pattern_info['uptrend_pct'],
+                            'momentum_5d': pattern_info['momentum_5d'],
+                            'breakaway_strength': round(pattern_info['uptrend_pct'] + pattern_info['momentum_5d'], 2),
+                            'volume_check': '✓' if pattern_info['volume_check'] else '✗'
+                        }
 
-                    results.append(result)
+                        results.append(result)
 
-                if progress_callback:
-                    progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), True)
+                    if progress_callback:
+                        progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), True)
 
-            except Exception as e:
-                if progress_callback:
-                    progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), False)
-                continue
+                except Exception as e:
+                    record_ticker_error(e)
+                    if progress_callback:
+                        progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), False)
+                    continue
 
-        return pd.DataFrame(results)
+        negative_cache.save()
+        return tag_market(pd.DataFrame(results), kospi_stocks)
 
 
 class MorningStarFinder:
@@ -883,75 +867,9 @@ class MorningStarFinder:
         results_df.to_csv(filepath, index=False, encoding='utf-8-sig')
         print(f"✓ Morning Star 분석 결과 저장: {filepath}")
 
-    def get_stock_data_long(self, ticker, days=500):
-        """장기 주식 데이터 조회"""
-        try:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
-
-            # 한국 종목용 ticker 변환
-            if len(ticker) == 6 and ticker.isdigit():
-                ticker_symbol = f"{ticker}.KS"
-            else:
-                ticker_symbol = ticker
-
-            # yfinance 다운로드
-            df = yf.download(
-                ticker_symbol,
-                start=start_date,
-                end=end_date,
-                progress=False,
-                timeout=15,
-                threads=False
-            )
-
-            if df is None or len(df) < 450:
-                return None
-
-            # MultiIndex 처리
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = df.columns.get_level_values(0)
-
-            # 컬럼명 정리
-            df.columns = [str(col).strip() for col in df.columns]
-            df.columns = [col[0].upper() + col[1:].lower() if len(col) > 0 else col for col in df.columns]
-
-            # 컬럼 매핑
-            col_map = {}
-            for col in df.columns:
-                col_lower = col.lower().strip()
-                if col_lower == 'open':
-                    col_map[col] = 'Open'
-                elif col_lower == 'high':
-                    col_map[col] = 'High'
-                elif col_lower == 'low':
-                    col_map[col] = 'Low'
-                elif col_lower == 'close':
-                    col_map[col] = 'Close'
-                elif col_lower == 'volume':
-                    col_map[col] = 'Volume'
-                elif col_lower in ['adj close', 'adj_close']:
-                    col_map[col] = 'Adj Close'
-
-            if col_map:
-                df.rename(columns=col_map, inplace=True)
-
-            # 필요한 컬럼 확인
-            required_cols = ['Open', 'High', 'Low', 'Close', 'Volume']
-            if not all(col in df.columns for col in required_cols):
-                return None
-
-            # 데이터 정제
-            df[required_cols] = df[required_cols].apply(pd.to_numeric, errors='coerce')
-            df = df.dropna(subset=required_cols)
-
-            if len(df) < 450:
-                return None
-
-            return df[required_cols]
-
-        except Exception as e:
-            return None
+    def get_stock_data_long(self, ticker, days=LONG_MA_HISTORY_DAYS):
+        """장기 주식 데이터 조회 (공용 가격 레이어 경유, 450개 미만이면 None)"""
+        return load_price_frame(ticker, days, 450)
 
     def detect_morning_star(self, df, lookback_period=60, reversal_pct=3.0):
         """
@@ -1017,49 +935,57 @@ class MorningStarFinder:
     def find_morning_star_stocks(self, kospi_stocks, progress_callback=None):
         """Morning Star 패턴 발굴: 하락 중인 종목에서 강한 반등"""
         results = []
+        kospi_stocks, negative_cache = skip_negative_cached('morning-star', kospi_stocks.reset_index(drop=True), self.data_dir)
+        observe = negative_cache.observer('morning-star')
+
+        # 가격 데이터를 병렬로 미리 조회해서 공용 캐시를 채움 (다른 분석기/차트와 공유)
+        prefetch_price_histories(kospi_stocks['Code'].tolist(), LONG_MA_HISTORY_DAYS, markets=universe_markets(kospi_stocks))
 
         for idx, row in kospi_stocks.iterrows():
-            ticker = row['Code']
-            name = row['Name']
+            with ticker_run(str(row['Code']).zfill(6), row['Name'], observer=observe):
+                ticker = row['Code']
+                name = row['Name']
 
-            # 장기 데이터 조회
-            df = self.get_stock_data_long(ticker)
-            if df is None or len(df) < 450:
-                if progress_callback:
-                    progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), False)
-                continue
+                # 장기 데이터 조회
+                df = self.get_stock_data_long(ticker)
+                if df is None or len(df) < 450:
+                    if progress_callback:
+                        progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), False)
+                    continue
 
-            try:
-                # Morning Star 패턴 감지
-                pattern_info = self.detect_morning_star(df)
+                try:
+                    # Morning Star 패턴 감지
+                    pattern_info = self.detect_morning_star(df)
 
-                if pattern_info and pattern_info['pattern_detected']:
-                    current_price = df.iloc[-1]['Close']
+                    if pattern_info and pattern_info['pattern_detected']:
+                        current_price = df.iloc[-1]['Close']
 
-                    result = {
-                        'ticker': ticker,
-                        'name': name,
-                        'current_price': round(current_price, 2),
-                        'price_date': df.index[-1].strftime('%Y-%m-%d'),
-                        'extraction_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        'decline_pct': pattern_info['decline_pct'],
-                        'rebound_pct': pattern_info['rebound_pct'],
-                        'low_price': pattern_info['low_price'],
-                        'recovery_strength': round((current_price - pattern_info['low_price']) / pattern_info['low_price'] * 100, 2),
-                        'volume_check': '✓' if pattern_info['volume_check'] else '✗'
-                    }
+                        result = {
+                            'ticker': ticker,
+                            'name': name,
+                            'current_price': round(current_price, 2),
+                            'price_date': df.index[-1].strftime('%Y-%m-%d'),
+                            'extraction_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                            'decline_pct': pattern_info['decline_pct'],
+                            'rebound_pct': pattern_info['rebound_pct'],
+                            'low_price': pattern_info['low_price'],
+                            'recovery_strength': round((current_price - pattern_info['low_price']) / pattern_info['low_price'] * 100, 2),
+                            'volume_check': '✓' if pattern_info['volume_check'] else '✗'
+                        }
 
-                    results.append(result)
+                        results.append(result)
 
-                if progress_callback:
-                    progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), True)
+                    if progress_callback:
+                        progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), True)
 
-            except Exception as e:
-                if progress_callback:
-                    progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), False)
-                continue
+                except Exception as e:
+                    record_ticker_error(e)
+                    if progress_callback:
+                        progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), False)
+                    continue
 
-        return pd.DataFrame(results)
+        negative_cache.save()
+        return tag_market(pd.DataFrame(results), kospi_stocks)
 
     def find_combined_patterns(self, kospi_stocks, progress_callback=None):
         """
@@ -1068,6 +994,21 @@ class MorningStarFinder:
         kospi_stocks: DataFrame 형태 (Code, Name 컬럼 포함)
         """
         results = []
+        breakaway_finder = BullishBreakawayFinder(self.data_dir)
+
+        if isinstance(kospi_stocks, pd.DataFrame):
+            kospi_stocks = kospi_stocks.reset_index(drop=True)
+        else:
+            kospi_stocks = [stock for stock in kospi_stocks if isinstance(stock, tuple)]
+        kospi_stocks, negative_cache = skip_negative_cached('morning-star', kospi_stocks, self.data_dir)
+        observe = negative_cache.observer('morning-star')
+
+        # 네거티브 캐시로 제외한 종목은 미리 조회하지 않음
+        if isinstance(kospi_stocks, pd.DataFrame):
+            codes = kospi_stocks['Code'].tolist()
+        else:
+            codes = [ticker for ticker, _ in kospi_stocks]
+        prefetch_price_histories(codes, LONG_MA_HISTORY_DAYS, markets=universe_markets(kospi_stocks))
 
         # kospi_stocks가 DataFrame인 경우와 리스트인 경우 모두 처리
         if isinstance(kospi_stocks, pd.DataFrame):
@@ -1078,74 +1019,72 @@ class MorningStarFinder:
             total_stocks = len(kospi_stocks)
 
         for idx, stock_data in stocks_iter:
-            try:
-                # DataFrame인 경우
-                if isinstance(kospi_stocks, pd.DataFrame):
-                    ticker = str(stock_data['Code']).zfill(6)
-                    name = stock_data['Name']
-                else:
-                    # 튜플 형태인 경우
-                    if isinstance(stock_data, tuple):
-                        ticker, name = stock_data
-                    else:
+            # DataFrame이면 행, 리스트면 (ticker, name) 튜플
+            if isinstance(kospi_stocks, pd.DataFrame):
+                ticker, name = str(stock_data['Code']).zfill(6), stock_data['Name']
+            else:
+                ticker, name = stock_data
+
+            with ticker_run(ticker, name, observer=observe):
+                try:
+                    # 데이터 조회
+                    df = self.get_stock_data_long(ticker)
+                    if df is None or len(df) < 60:
+                        if progress_callback:
+                            progress_callback(idx + 1, total_stocks, name, ticker, len(results), False)
                         continue
 
-                # 데이터 조회
-                df = self.get_stock_data_long(ticker)
-                if df is None or len(df) < 60:
-                    if progress_callback:
-                        progress_callback(idx + 1, total_stocks, name, ticker, len(results), False)
-                    continue
+                    current_price = df.iloc[-1]['Close']
 
-                current_price = df.iloc[-1]['Close']
-
-                # 1. Morning Star 패턴 감지
-                morning_star_info = self.detect_morning_star(df)
-                if morning_star_info and morning_star_info['pattern_detected']:
-                    result = {
-                        'pattern_type': '🌅 Morning Star',
-                        'ticker': ticker,
-                        'name': name,
-                        'current_price': round(current_price, 2),
-                        'price_date': df.index[-1].strftime('%Y-%m-%d'),
-                        'extraction_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        'decline_pct': morning_star_info['decline_pct'],
-                        'rebound_pct': morning_star_info['rebound_pct'],
-                        'low_price': morning_star_info['low_price'],
-                        'recovery_strength': round((current_price - morning_star_info['low_price']) / morning_star_info['low_price'] * 100, 2),
-                        'volume_check': '✓' if morning_star_info['volume_check'] else '✗'
-                    }
-                    results.append(result)
-
-                # 2. Bullish Breakaway 패턴 감지
-                breakaway_info = self.detect_bullish_breakaway(df)
-                if breakaway_info and breakaway_info['pattern_detected']:
-                    result = {
-                        'pattern_type': '⚡ Bullish Breakaway',
-                        'ticker': ticker,
-                        'name': name,
-                        'current_price': round(current_price, 2),
-                        'price_date': df.index[-1].strftime('%Y-%m-%d'),
-                        'extraction_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        'resistance': breakaway_info['resistance'],
-                        'support': breakaway_info['support'],
-                        'breakout_pct': breakaway_info['breakout_pct'],
-                        'uptrend_pct': breakaway_info['uptrend_pct'],
-                        'momentum_5d': breakaway_info['momentum_5d'],
-                        'breakaway_strength': breakaway_info['breakaway_strength'],
-                        'volume_check': '✓' if breakaway_info['volume_check'] else '✗'
-                    }
-                    results.append(result)
+                    # 1. Morning Star 패턴 감지
+                    morning_star_info = self.detect_morning_star(df)
+                    if morning_star_info and morning_star_info['pattern_detected']:
+                        result = {
+                            'pattern_type': '🌅 Morning Star',
+                            'ticker': ticker,
+                            'name': name,
+                            'current_price': round(current_price, 2),
+                            'price_date': df.index[-1].strftime('%Y-%m-%d'),
+                            'extraction_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                            'decline_pct': morning_star_info['decline_pct'],
+                            'rebound_pct': morning_star_info['rebound_pct'],
+                            'low_price': morning_star_info['low_price'],
+                            'recovery_strength': round((current_price - morning_star_info['low_price']) / morning_star_info['low_price'] * 100, 2),
+                            'volume_check': '✓' if morning_star_info['volume_check'] else '✗'
+                        }
+                        results.append(result)
 
-                if progress_callback:
-                    progress_callback(idx + 1, total_stocks, name, ticker, len(results), True)
+                    # 2. Bullish Breakaway 패턴 감지
+                    breakaway_info = breakaway_finder.detect_bullish_breakaway(df)
+                    if breakaway_info and breakaway_info['pattern_detected']:
+                        result = {
+                            'pattern_type': '⚡ Bullish Breakaway',
+                            'ticker': ticker,
+                            'name': name,
+                            'current_price': round(current_price, 2),
+                            'price_date': df.index[-1].strftime('%Y-%m-%d'),
+                            'extraction_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                            'resistance': breakaway_info['resistance'],
+                            'support': breakaway_info['support'],
+                            'breakout_pct': breakaway_info['breakout_pct'],
+                            'uptrend_pct': breakaway_info['uptrend_pct'],
+                            'momentum_5d': breakaway_info['momentum_5d'],
+                            'breakaway_strength': round(breakaway_info['uptrend_pct'] + breakaway_info['momentum_5d'], 2),
+                            'volume_check': '✓' if breakaway_info['volume_check'] else '✗'
+                        }
+                        results.append(result)
 
-            except Exception as e:
-                if progress_callback:
-                    progress_callback(idx + 1, total_stocks, name if 'name' in locals() else "Unknown", ticker if 'ticker' in locals() else "Unknown", len(results), False)
-                continue
+                    if progress_callback:
+                        progress_callback(idx + 1, total_stocks, name, ticker, len(results), True)
+
+                except Exception as e:
+                    record_ticker_error(e)
+                    if progress_callback:
+                        progress_callback(idx + 1, total_stocks, name, ticker, len(results), False)
+                    continue
 
-        return pd.DataFrame(results) if results else pd.DataFrame()
+        negative_cache.save()
+        return tag_market(pd.DataFrame(results), kospi_stocks) if results else pd.DataFrame()
 
     def get_combined_cache_filepath(self, date=None):
         """결합 패턴 캐시 파일 경로"""
@@ -1172,81 +1111,23 @@ class MorningStarFinder:
 
 
 class TalibPatternFinder:
-    """TA-Lib 기반 패턴 감지: Morning Star, Bullish Breakaway 등"""
+    """TA-Lib 규칙 패턴 감지: Morning Star, Bullish Breakaway 등 (NumPy 엔진, TA-Lib 설치 불필요)"""
 
     def __init__(self, data_dir="analysis_data"):
         self.data_dir = data_dir
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
 
-        # TA-Lib이 없으면 경고만 출력하고 계속 진행
-        if not TALIB_AVAILABLE:
-            print("⚠️ ta-lib이 설치되지 않았습니다. TA-Lib 패턴 감지 기능이 비활성화됩니다.")
-
-    def get_stock_data_long(self, ticker, days=500):
-        """FinanceDataReader를 사용한 장기 주식 데이터 조회"""
-        try:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
-
-            # FinanceDataReader는 한국 ticker 코드 그대로 사용 (예: 005930)
-            ticker_str = str(ticker).zfill(6)
-
-            # FinanceDataReader로 데이터 조회
-            df = fdr.DataReader(ticker_str, start_date, end_date)
-
-            if df is None or len(df) < 100:
-                return None
-
-            # MultiIndex 처리
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = df.columns.get_level_values(0)
-
-            # 컬럼명 정리
-            df.columns = [str(col).strip() for col in df.columns]
-            df.columns = [col[0].upper() + col[1:].lower() if len(col) > 0 else col for col in df.columns]
-
-            # 컬럼 매핑
-            col_map = {}
-            for col in df.columns:
-                col_lower = col.lower().strip()
-                if col_lower == 'open':
-                    col_map[col] = 'Open'
-                elif col_lower == 'high':
-                    col_map[col] = 'High'
-                elif col_lower == 'low':
-                    col_map[col] = 'Low'
-                elif col_lower == 'close':
-                    col_map[col] = 'Close'
-                elif col_lower == 'volume':
-                    col_map[col] = 'Volume'
-                elif col_lower in ['adj close', 'adj_close', 'change']:
-                    col_map[col] = 'Adj Close'
-
-            if col_map:
-                df.rename(columns=col_map, inplace=True)
-
-            # 필요한 컬럼 확인
-            required_cols = ['Open', 'High', 'Low', 'Close', 'Volume']
-            if not all(col in df.columns for col in required_cols):
-                return None
-
-            # 데이터 정제
-            df[required_cols] = df[required_cols].apply(pd.to_numeric, errors='coerce')
-            df = df.dropna(subset=required_cols)
-
-            if len(df) < 100:
-                return None
-
-            return df[required_cols]
-
-        except Exception as e:
-            return None
+    def get_stock_data_long(self, ticker, days=TALIB_HISTORY_DAYS):
+        """장기 주식 데이터 조회 (공용 가격 레이어 경유, 100개 미만이면 None)"""
+        return load_price_frame(ticker, days, 100)
 
-    def find_patterns_in_week(self, kospi_stocks, progress_callback=None):
+    def find_patterns_in_week(self, kospi_stocks, progress_callback=None, result_callback=None):
         """
         과거 6개월(180일) 동안 talib 패턴이 나타난 종목들 찾기
 
+        result_callback이 주어지면 패턴 결과(dict)가 나올 때마다 호출한다.
+
         Returns:
             DataFrame with columns:
             - pattern_type: 패턴 타입 (Morning Star / Bullish Breakaway)
@@ -1257,107 +1138,115 @@ class TalibPatternFinder:
         results = []
         one_eighty_days_ago = datetime.now() - timedelta(days=180)
 
-        # TA-Lib이 없으면 빈 결과 반환
-        if not TALIB_AVAILABLE:
-            return pd.DataFrame()
-
-        for idx, row in kospi_stocks.iterrows():
-            try:
-                ticker = str(row['Code']).zfill(6)
-                name = row['Name']
-
-                # 데이터 조회 (패턴 인식을 위해 500일 데이터 조회, 하지만 최근 180일(6개월) 데이터에서만 패턴 검색)
-                df = self.get_stock_data_long(ticker, days=500)
-                if df is None or len(df) < 100:
-                    if progress_callback:
-                        progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), False)
-                    continue
-
-                # Open, High, Low, Close를 numpy 배열로 변환
-                open_arr = df['Open'].values
-                high_arr = df['High'].values
-                low_arr = df['Low'].values
-                close_arr = df['Close'].values
+        kospi_stocks, negative_cache = skip_negative_cached('talib', kospi_stocks.reset_index(drop=True), self.data_dir)
+        observe = negative_cache.observer('talib')
 
-                # Morning Star 패턴 감지
-                morning_star = talib.CDLMORNINGSTAR(open_arr, high_arr, low_arr, close_arr)
+        # 가격 데이터를 병렬로 미리 조회해서 공용 캐시를 채움 (시장 스냅샷/저장소 증분 갱신 포함)
+        prefetch_price_histories(kospi_stocks['Code'].tolist(), TALIB_HISTORY_DAYS, markets=universe_markets(kospi_stocks))
 
-                # Bullish Breakaway 패턴 감지
-                bullish_breakaway = talib.CDLBREAKAWAY(open_arr, high_arr, low_arr, close_arr)
-
-                # 최근 180일(6개월) 데이터에서 패턴 검색
-                recent_df = df[df.index >= one_eighty_days_ago]
-                recent_indices = df.index.get_indexer(recent_df.index)
-
-                for pattern_idx in recent_indices:
-                    if pattern_idx < 0 or pattern_idx >= len(morning_star):
+        for idx, (ticker, name) in enumerate(zip(kospi_stocks['Code'], kospi_stocks['Name'])):
+            ticker = str(ticker).zfill(6)
+            with ticker_run(ticker, name, observer=observe):
+                try:
+                    # 데이터 조회 (패턴 인식을 위해 500일 데이터 조회, 하지만 최근 180일(6개월) 데이터에서만 패턴 검색)
+                    df = self.get_stock_data_long(ticker)
+                    if df is None or len(df) < 100:
+                        if progress_callback:
+                            progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), False)
                         continue
 
-                    # Morning Star 패턴 발견
-                    if morning_star[pattern_idx] != 0:
-                        pattern_date = df.index[pattern_idx]
-                        current_price = df.iloc[-1]['Close']
-
-                        result = {
-                            'pattern_type': '🌅 Morning Star',
-                            'ticker': ticker,
-                            'name': name,
-                            'current_price': round(current_price, 2),
-                            'pattern_date': pattern_date.strftime('%Y-%m-%d'),
-                            'pattern_index': int(pattern_idx),
-                            'price_date': df.index[-1].strftime('%Y-%m-%d'),
-                            'extraction_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        }
-                        results.append(result)
-
-                    # Bullish Breakaway 패턴 발견
-                    if bullish_breakaway[pattern_idx] != 0:
-                        pattern_date = df.index[pattern_idx]
-                        current_price = df.iloc[-1]['Close']
+                    # Open, High, Low, Close를 numpy 배열로 변환
+                    open_arr = df['Open'].to_numpy(dtype=np.float64)
+                    high_arr = df['High'].to_numpy(dtype=np.float64)
+                    low_arr = df['Low'].to_numpy(dtype=np.float64)
+                    close_arr = df['Close'].to_numpy(dtype=np.float64)
+
+                    with timed_stage('talib'):
+                        # Morning Star 패턴 감지
+                        morning_star = cdl_morningstar(open_arr, high_arr, low_arr, close_arr)
+
+                        # Bullish Breakaway 패턴 감지
+                        bullish_breakaway = cdl_breakaway(open_arr, high_arr, low_arr, close_arr)
+
+                    with timed_stage('assemble'):
+                        # 최근 180일(6개월) 데이터에서 패턴 검색
+                        recent_df = df[df.index >= one_eighty_days_ago]
+                        recent_indices = df.index.get_indexer(recent_df.index)
+
+                        for pattern_idx in recent_indices:
+                            if pattern_idx < 0 or pattern_idx >= len(morning_star):
+                                continue
+
+                            # Morning Star 패턴 발견
+                            if morning_star[pattern_idx] != 0:
+                                pattern_date = df.index[pattern_idx]
+                                current_price = df.iloc[-1]['Close']
+
+                                result = {
+                                    'pattern_type': '🌅 Morning Star',
+                                    'ticker': ticker,
+                                    'name': name,
+                                    'current_price': round(current_price, 2),
+                                    'pattern_date': pattern_date.strftime('%Y-%m-%d'),
+                                    'pattern_index': int(pattern_idx),
+                                    'price_date': df.index[-1].strftime('%Y-%m-%d'),
+                                    'extraction_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                                }
+                                results.append(result)
+                                if result_callback:
+                                    result_callback(result)
+
+                            # Bullish Breakaway 패턴 발견
+                            if bullish_breakaway[pattern_idx] != 0:
+                                pattern_date = df.index[pattern_idx]
+                                current_price = df.iloc[-1]['Close']
+
+                                result = {
+                                    'pattern_type': '⚡ Bullish Breakaway',
+                                    'ticker': ticker,
+                                    'name': name,
+                                    'current_price': round(current_price, 2),
+                                    'pattern_date': pattern_date.strftime('%Y-%m-%d'),
+                                    'pattern_index': int(pattern_idx),
+                                    'price_date': df.index[-1].strftime('%Y-%m-%d'),
+                                    'extraction_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                                }
+                                results.append(result)
+                                if result_callback:
+                                    result_callback(result)
 
-                        result = {
-                            'pattern_type': '⚡ Bullish Breakaway',
-                            'ticker': ticker,
-                            'name': name,
-                            'current_price': round(current_price, 2),
-                            'pattern_date': pattern_date.strftime('%Y-%m-%d'),
-                            'pattern_index': int(pattern_idx),
-                            'price_date': df.index[-1].strftime('%Y-%m-%d'),
-                            'extraction_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        }
-                        results.append(result)
-
-                if progress_callback:
-                    progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), True)
+                    if progress_callback:
+                        progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), True)
 
-            except Exception as e:
-                if progress_callback:
-                    progress_callback(idx + 1, len(kospi_stocks), name if 'name' in locals() else "Unknown",
-                                    ticker if 'ticker' in locals() else "Unknown", len(results), False)
-                continue
+                except Exception as e:
+                    record_ticker_error(e)
+                    if progress_callback:
+                        progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), False)
+                    continue
 
-        return pd.DataFrame(results) if results else pd.DataFrame()
+        negative_cache.save()
+        return tag_market(pd.DataFrame(results), kospi_stocks) if results else pd.DataFrame()
 
-    def get_talib_week_cache_filepath(self, date=None):
-        """TA-Lib 분기(3개월) 패턴 캐시 파일 경로"""
+    def get_talib_week_cache_filepath(self, date=None, tag=None):
+        """TA-Lib 분기(3개월) 패턴 캐시 파일 경로 (tag: 스캔 대상 표시)"""
         if date is None:
             date = datetime.now().strftime("%Y-%m-%d")
-        return os.path.join(self.data_dir, f"talib_quarter_patterns_{date}.csv")
+        return os.path.join(self.data_dir, tagged_filename("talib_quarter_patterns", date, tag))
 
-    def load_talib_week_patterns(self, date=None):
+    def load_talib_week_patterns(self, date=None, tag=None):
         """저장된 분기(3개월) 패턴 데이터 로드"""
-        filepath = self.get_talib_week_cache_filepath(date)
+        filepath = self.get_talib_week_cache_filepath(date, tag)
         if os.path.exists(filepath):
             df = pd.read_csv(filepath)
             return df
         return None
 
-    def save_talib_week_patterns(self, results_df, date=None):
+    def save_talib_week_patterns(self, results_df, date=None, tag=None):
         """분기(3개월) 패턴 결과를 CSV로 저장"""
         if results_df.empty:
             return
 
-        filepath = self.get_talib_week_cache_filepath(date)
+        filepath = self.get_talib_week_cache_filepath(date, tag)
         results_df.to_csv(filepath, index=False, encoding='utf-8-sig')
         return filepath
 
@@ -1370,26 +1259,9 @@ class SoaringSignalFinder:
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
 
-    def get_stock_data(self, ticker, days=180):
-        """FinanceDataReader를 사용한 주식 데이터 조회"""
-        try:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
-            ticker_str = str(ticker).zfill(6)
-
-            df = fdr.DataReader(ticker_str, start_date, end_date)
-
-            if df is None or len(df) < 20:
-                return None
-
-            # 데이터 정제
-            df = df.dropna()
-            if len(df) < 20:
-                return None
-
-            return df
-        except Exception as e:
-            return None
+    def get_stock_data(self, ticker, days=SIGNAL_HISTORY_DAYS):
+        """주식 데이터 조회 (공용 가격 레이어 경유, 20개 미만이면 None)"""
+        return load_price_frame(ticker, days, 20)
 
     def calculate_moving_averages(self, df):
         """이동평균선 계산"""
@@ -1402,6 +1274,7 @@ class SoaringSignalFinder:
             df['MA120'] = df['Close'].rolling(window=120).mean()
             return df
         except Exception as e:
+            record_ticker_error(e)
             return None
 
     def check_ma_alignment(self, df):
@@ -1530,10 +1403,10 @@ class SoaringSignalFinder:
             recent = df.iloc[-5:]
             upper_tail_count = (recent['Upper_Tail_Ratio'] > 0.3).sum()  # 윗꼬리가 30% 이상
 
-            # 저점이 계속 높아지는지 확인 (최근 10개 캔들)
-            if len(df) >= 10:
-                recent_lows = df['Low'].iloc[-10:]
-                rising_lows = all(recent_lows.iloc[i] < recent_lows.iloc[i+1] for i in range(len(recent_lows)-1))
+            # 저점이 계속 높아지는지 확인 (최근 10개 캔들이 연속 상승)
+            if len(df) >= RISING_LOWS_WINDOW:
+                recent_lows = df['Low'].to_numpy(dtype=np.float64)[-RISING_LOWS_WINDOW:]
+                rising_lows = bool(rising_run_length(recent_lows)[-1] >= RISING_LOWS_WINDOW - 1)
             else:
                 rising_lows = False
 
@@ -1586,11 +1459,11 @@ class SoaringSignalFinder:
 
             # 지속적인 저점 상승
             continuous_rising_lows = False
-            if len(df) >= 20:
-                recent_lows = df['Low'].iloc[-20:]
-                # 저점들이 우상향하는지 확인 (스트롱 상승 추세)
-                low_trend = np.polyfit(range(len(recent_lows)), recent_lows.values, 1)[0]
-                continuous_rising_lows = low_trend > 0
+            if len(df) >= SUPPORT_TREND_WINDOW:
+                recent_lows = df['Low'].to_numpy(dtype=np.float64)[-SUPPORT_TREND_WINDOW:]
+                # 저점들이 우상향하는지 확인 (스트롱 상승 추세, 회귀 기울기 닫힌 형태)
+                low_trend = rolling_trend(recent_lows, SUPPORT_TREND_WINDOW)[0][-1]
+                continuous_rising_lows = bool(low_trend > 0)
 
             signal_strength = 0
             if support_bounce:
@@ -1611,6 +1484,30 @@ class SoaringSignalFinder:
         except Exception as e:
             return {'support_bounce': False, 'resistance_breakout': False, 'signal_strength': 0}
 
+    def screen_rising_lows(self, kospi_stocks, progress_callback=None):
+        """
+        시장 전체 저점 추세 조건(지속적인 저점 상승 / 저점 연속 상승)을 한 번에 계산
+
+        종목별로는 가격 데이터만 불러오고, 회귀 기울기/R²/연속 상승 봉 수는 (종목 x 거래일) 패널 전체에 한 번 적용한다.
+
+        Returns:
+            DataFrame (ticker, name, low_slope, low_r2, rising_run, continuous_rising_lows, rising_lows,
+            current_price, price_date, market) - 저점 연속 상승 → 지속적인 저점 상승 → R² 높은 순
+        """
+        tickers, names, frames = load_panel_frames(
+            'low-trend', kospi_stocks, self.data_dir, SIGNAL_HISTORY_DAYS, SUPPORT_TREND_WINDOW, progress_callback
+        )
+        if not frames:
+            return pd.DataFrame()
+
+        with timed_stage('signals'):
+            screen = screen_low_trends(frames, tickers).reset_index()
+        screen.insert(1, 'name', names)
+        screen['current_price'] = [df['Close'].iloc[-1] for df in frames]
+        screen['price_date'] = [df.index[-1].strftime('%Y-%m-%d') for df in frames]
+        screen = screen.sort_values(['rising_lows', 'continuous_rising_lows', 'low_r2'], ascending=False, kind='mergesort')
+        return tag_market(screen.reset_index(drop=True), kospi_stocks)
+
     def analyze_soaring_signal(self, ticker, name):
         """
         종합 급등 신호 분석
@@ -1627,20 +1524,22 @@ class SoaringSignalFinder:
         """
         try:
             # 데이터 조회
-            df = self.get_stock_data(ticker, days=180)
+            df = self.get_stock_data(ticker)
             if df is None:
                 return None
 
             # 이동평균선 계산
-            df = self.calculate_moving_averages(df)
+            with timed_stage('indicators'):
+                df = self.calculate_moving_averages(df)
             if df is None:
                 return None
 
             # 각 신호 분석
-            ma_signal = self.check_ma_alignment(df)
-            volume_signal = self.check_volume_signal(df)
-            candlestick_signal = self.check_candlestick_signal(df)
-            support_signal = self.check_support_breakout(df)
+            with timed_stage('signals'):
+                ma_signal = self.check_ma_alignment(df)
+                volume_signal = self.check_volume_signal(df)
+                candlestick_signal = self.check_candlestick_signal(df)
+                support_signal = self.check_support_breakout(df)
 
             # 종합 점수 계산
             total_score = (
@@ -1699,39 +1598,45 @@ class SoaringSignalFinder:
             return result
 
         except Exception as e:
+            record_ticker_error(e)
             return None
 
     def find_soaring_signals(self, kospi_stocks, progress_callback=None):
         """
-        모든 KOSPI 종목에서 급등 신호 찾기
+        전체 종목에서 급등 신호 찾기
 
         Returns:
             DataFrame with soaring signal analysis for each stock
         """
         results = []
+        kospi_stocks, negative_cache = skip_negative_cached('signals', kospi_stocks.reset_index(drop=True), self.data_dir)
+        observe = negative_cache.observer('signals')
 
-        for idx, row in kospi_stocks.iterrows():
-            try:
-                ticker = str(row['Code']).zfill(6)
-                name = row['Name']
+        # 가격 데이터를 병렬로 미리 조회해서 공용 캐시를 채움 (시장 스냅샷/저장소 증분 갱신 포함)
+        prefetch_price_histories(kospi_stocks['Code'].tolist(), SIGNAL_HISTORY_DAYS, markets=universe_markets(kospi_stocks))
 
-                # 신호 분석
-                result = self.analyze_soaring_signal(ticker, name)
+        for idx, (ticker, name) in enumerate(zip(kospi_stocks['Code'], kospi_stocks['Name'])):
+            ticker = str(ticker).zfill(6)
+            with ticker_run(ticker, name, observer=observe):
+                try:
+                    # 신호 분석
+                    result = self.analyze_soaring_signal(ticker, name)
 
-                if result is not None:
-                    results.append(result)
+                    if result is not None:
+                        results.append(result)
 
-                # 진행 상황 콜백
-                if progress_callback:
-                    progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), True)
+                    # 진행 상황 콜백
+                    if progress_callback:
+                        progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), True)
 
-            except Exception as e:
-                if progress_callback:
-                    progress_callback(idx + 1, len(kospi_stocks), name if 'name' in locals() else "Unknown",
-                                    ticker if 'ticker' in locals() else "Unknown", len(results), False)
-                continue
+                except Exception as e:
+                    record_ticker_error(e)
+                    if progress_callback:
+                        progress_callback(idx + 1, len(kospi_stocks), name, ticker, len(results), False)
+                    continue
 
-        return pd.DataFrame(results) if results else pd.DataFrame()
+        negative_cache.save()
+        return tag_market(pd.DataFrame(results), kospi_stocks) if results else pd.DataFrame()
 
 
 class ComprehensiveAnalyzer:
@@ -1766,7 +1671,7 @@ class ComprehensiveAnalyzer:
             if progress_callback:
                 progress_callback("스윙매매 분석 시작", 0)
 
-            def swing_progress_callback(idx, total, stock_name, stock_code, success_count):
+            def swing_progress_callback(idx, total, stock_name, stock_code, success_count, success=True):
                 if progress_callback:
                     progress_callback(f"스윙매매: {stock_name}", idx / total if total > 0 else 0)
 
@@ -1839,25 +1744,9 @@ class ReverseMAAlignmentFinder:
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
 
-    def get_stock_data(self, ticker, days=500):
-        """FinanceDataReader를 사용한 주식 데이터 조회"""
-        try:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
-            ticker_str = str(ticker).zfill(6)
-
-            df = fdr.DataReader(ticker_str, start_date, end_date)
-
-            if df is None or len(df) < 450:
-                return None
-
-            df = df.dropna()
-            if len(df) < 450:
-                return None
-
-            return df
-        except Exception as e:
-            return None
+    def get_stock_data(self, ticker, days=LONG_MA_HISTORY_DAYS):
+        """장기 주식 데이터 조회 (공용 가격 레이어 경유, 450개 미만이면 None)"""
+        return load_price_frame(ticker, days, 450)
 
     def calculate_all_moving_averages(self, df):
         """모든 이동평균선 계산 (5, 20, 60, 112, 224, 448)"""
@@ -1871,6 +1760,7 @@ class ReverseMAAlignmentFinder:
             df['MA448'] = df['Close'].rolling(window=448).mean()
             return df
         except Exception as e:
+            record_ticker_error(e)
             return None
 
     def check_long_term_reverse_alignment(self, df):
@@ -2002,57 +1892,44 @@ class ReverseMAAlignmentFinder:
 
         return {'support_formed': False, 'strength': 0}
 
-    def check_ichimoku_cloud(self, df):
+    def check_ichimoku_cloud(self, df, ticker=None):
         """
         파란점선 (Ichimoku Cloud) 확인
         기본선(Kijun-sen)과 전환선(Tenkan-sen)의 위치로 파동 강도 판단
+
+        계산은 차트와 같은 ichimoku 모듈이 담당하고, ticker가 주어지면 (종목, 데이터 버전) 단위로 캐시한다.
         """
         if df is None or len(df) < 26:
             return {'cloud_ready': False, 'strength': 0}
 
         try:
-            df = df.copy()
-
-            # 전환선 (9일 최고점과 최저점의 중간값)
-            high_9 = df['High'].rolling(window=9).max()
-            low_9 = df['Low'].rolling(window=9).min()
-            df['Tenkan'] = (high_9 + low_9) / 2
-
-            # 기본선 (26일 최고점과 최저점의 중간값)
-            high_26 = df['High'].rolling(window=26).max()
-            low_26 = df['Low'].rolling(window=26).min()
-            df['Kijun'] = (high_26 + low_26) / 2
-
-            latest = df.iloc[-1]
-            tenkan = latest['Tenkan']
-            kijun = latest['Kijun']
-            close = latest['Close']
+            signal = get_ichimoku_signal(ticker, df) if ticker is not None else latest_cloud_signal(df)
+            return dict(signal)
+        except Exception:
+            return {'cloud_ready': False, 'strength': 0}
 
-            if pd.isna(tenkan) or pd.isna(kijun):
-                return {'cloud_ready': False, 'strength': 0}
+    def screen_ichimoku_clouds(self, kospi_stocks, progress_callback=None):
+        """
+        시장 전체 파란점선(전환선/기준선 파동 응축) 조건을 한 번에 계산
 
-            # 파동이 응축된 상태 판단 (전환선과 기본선의 간격)
-            distance = abs(tenkan - kijun)
-            avg_price = (tenkan + kijun) / 2
+        종목별로는 가격 데이터만 불러오고, 신호 계산은 (종목 x 거래일) 패널 전체에 한 번 적용한다.
 
-            # 간격을 가격 대비로 계산
-            gap_ratio = distance / avg_price if avg_price > 0 else 0
+        Returns:
+            DataFrame (ticker, name, tenkan, kijun, close, gap_ratio, strength, cloud_ready, is_condensed,
+            price_date, market) - cloud_ready 종목 먼저, strength 높은 순
+        """
+        tickers, names, frames = load_panel_frames(
+            'ichimoku', kospi_stocks, self.data_dir, ICHIMOKU_SCREEN_DAYS, ICHIMOKU_BASE_PERIOD, progress_callback
+        )
+        if not frames:
+            return pd.DataFrame()
 
-            # 파동이 응축되려면 간격이 좁아야 함 (1% 이하)
-            is_condensed = gap_ratio < 0.01
-
-            return {
-                'cloud_ready': close > tenkan > kijun or close > kijun > tenkan,
-                'strength': max(0, 1 - gap_ratio * 100),  # 간격이 좁을수록 높은 점수
-                'tenkan': tenkan,
-                'kijun': kijun,
-                'close': close,
-                'gap_ratio': gap_ratio,
-                'is_condensed': is_condensed,
-                'reason': f'파동 응축도: {gap_ratio*100:.2f}%'
-            }
-        except:
-            return {'cloud_ready': False, 'strength': 0}
+        with timed_stage('signals'):
+            screen = screen_ichimoku(frames, tickers).reset_index()
+        screen.insert(1, 'name', names)
+        screen['price_date'] = [df.index[-1].strftime('%Y-%m-%d') for df in frames]
+        screen = screen.sort_values(['cloud_ready', 'strength'], ascending=False, kind='mergesort')
+        return tag_market(screen.reset_index(drop=True), kospi_stocks)
 
     def analyze_reverse_ma_pattern(self, ticker, name):
         """
@@ -2069,16 +1946,18 @@ class ReverseMAAlignmentFinder:
             if df is None:
                 return None
 
-            df = self.calculate_all_moving_averages(df)
+            with timed_stage('indicators'):
+                df = self.calculate_all_moving_averages(df)
             if df is None:
                 return None
 
             # 각 조건 분석
-            long_reverse = self.check_long_term_reverse_alignment(df)
-            short_align = self.check_short_term_alignment(df)
-            ma112_cross = self.check_ma112_crossover_path(df)
-            support = self.check_support_line(df)
-            ichimoku = self.check_ichimoku_cloud(df)
+            with timed_stage('signals'):
+                long_reverse = self.check_long_term_reverse_alignment(df)
+                short_align = self.check_short_term_alignment(df)
+                ma112_cross = self.check_ma112_crossover_path(df)
+                support = self.check_support_line(df)
+                ichimoku = self.check_ichimoku_cloud(df, ticker)
 
             # 현재 가격
             latest = df.iloc[-1]
@@ -2177,33 +2056,50 @@ class ReverseMAAlignmentFinder:
             }
 
         except Exception as e:
+            record_ticker_error(e)
             return None
 
     def find_reverse_ma_patterns(self, kospi_stocks, progress_callback=None):
         """
-        KOSPI 전체 종목에서 역매공파 112 패턴 찾기
+        전체 종목에서 역매공파 112 패턴 찾기
+
+        Args:
+            kospi_stocks: Code/Name DataFrame (Market 컬럼이 있으면 시장 스냅샷 사용) 또는 (종목코드, 종목명) 목록
+            progress_callback: progress_callback(완료 수, 전체 수, 종목명, 종목코드, 점수 계산 종목 수, 성공 여부)
+                - (메시지, 비율) 형태 진행바는 progress.message_progress로 감싸서 넘김
         """
         results = []
-        total = len(kospi_stocks)
-
-        for idx, (ticker, name) in enumerate(kospi_stocks):
-            try:
-                if progress_callback:
-                    progress_callback(f"역매공파 분석: {name}", (idx / total) if total > 0 else 0)
+        if not hasattr(kospi_stocks, 'columns'):
+            kospi_stocks = list(kospi_stocks)
+        kospi_stocks, negative_cache = skip_negative_cached('reverse-ma', kospi_stocks, self.data_dir)
+        observe = negative_cache.observer('reverse-ma')
+        pairs = list(zip(kospi_stocks['Code'], kospi_stocks['Name'])) if hasattr(kospi_stocks, 'columns') else kospi_stocks
+        total = len(pairs)
+
+        # 가격 데이터를 병렬로 미리 조회해서 공용 캐시를 채움 (시장 스냅샷/저장소 증분 갱신 포함)
+        prefetch_price_histories([str(ticker).zfill(6) for ticker, _ in pairs], LONG_MA_HISTORY_DAYS,
+                                 markets=universe_markets(kospi_stocks))
+
+        for idx, (ticker, name) in enumerate(pairs):
+            ticker = str(ticker).zfill(6)
+            result = None
+            with ticker_run(ticker, name, observer=observe):
+                try:
+                    result = self.analyze_reverse_ma_pattern(ticker, name)
+                    if result is not None:
+                        results.append(result)
+                except Exception as e:
+                    record_ticker_error(e)
 
-                result = self.analyze_reverse_ma_pattern(ticker, name)
-                if result is not None:
-                    results.append(result)
+            # 진행 상황 콜백 (데이터 부족/오류로 점수를 못 낸 종목은 실패)
+            if progress_callback:
+                progress_callback(idx + 1, total, name, ticker, len(results), result is not None)
 
-            except Exception as e:
-                continue
+        negative_cache.save()
 
         # 점수 기준 정렬
         results_df = pd.DataFrame(results)
         if len(results_df) > 0:
             results_df = results_df.sort_values('score', ascending=False)
 
-        if progress_callback:
-            progress_callback(f"역매공파 분석 완료", 1.0)
-
-        return results_df if len(results_df) > 0 else pd.DataFrame()
+        return tag_market(results_df, kospi_stocks) if len(results_df) > 0 else pd.DataFrame()
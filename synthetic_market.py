@@ -0,0 +1,168 @@
+"""
+합성 OHLCV 시장 생성 모듈
+
+네트워크 없이 분석기 처리량을 측정할 수 있도록, 시드가 같으면 항상 같은 가격 데이터를 만드는
+가상의 종목 유니버스를 생성한다. 일부 종목에는 Morning Star, Bullish Breakaway 캔들 패턴이나
+마지막 거래일의 골든크로스(MA20이 MA60을 상향 돌파)를 심어 두고, 그 위치를 planted에 기록한다.
+
+사용 예:
+    market = SyntheticMarket(n_tickers=200, n_days=500, seed=42)
+    set_price_source(market.source)          # price_data의 가격 소스로 연결
+    market.stocks                            # Code, Name DataFrame (분석기 입력)
+    market.planted['900001']                 # [('morning_star', Timestamp), ...]
+"""
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+# 합성 종목코드 시작값 (실제 KOSPI 코드와 겹치지 않도록 9로 시작)
+SYNTHETIC_CODE_BASE = 900000
+
+# 종목 번호 % 4 -> 심는 패턴 (0은 패턴 없음)
+PLANT_CYCLE = (None, 'morning_star', 'breakaway', 'golden_cross')
+
+# 패턴 캔들 (시가, 고가, 저가, 종가) - 패턴 직전 종가 대비 비율
+MORNING_STAR_CANDLES = [
+    (1.000, 1.005, 0.945, 0.950),  # 긴 음봉
+    (0.940, 0.942, 0.933, 0.937),  # 갭 하락한 짧은 몸통
+    (0.945, 0.988, 0.943, 0.985),  # 첫 음봉 몸통 30% 이상 회복하는 양봉
+]
+BREAKAWAY_CANDLES = [
+    (1.000, 1.005, 0.945, 0.950),  # 긴 음봉
+    (0.930, 0.935, 0.910, 0.915),  # 갭 하락 음봉
+    (0.910, 0.915, 0.895, 0.900),  # 고가/저가가 낮아지는 캔들
+    (0.900, 0.905, 0.880, 0.885),  # 고가/저가가 낮아지는 음봉
+    (0.885, 0.945, 0.880, 0.940),  # 갭 안에서 마감하는 양봉
+]
+
+
+class SyntheticMarket:
+    """결정적(deterministic) 합성 가격 데이터 유니버스"""
+
+    def __init__(self, n_tickers=200, n_days=500, seed=42, end_date=None, volatility=0.015):
+        self.n_tickers = n_tickers
+        self.n_days = n_days
+        self.seed = seed
+        self.volatility = volatility
+        end_date = pd.Timestamp(end_date or datetime.now().date())
+        self.dates = pd.bdate_range(end=end_date, periods=n_days)
+        self.tickers = [str(SYNTHETIC_CODE_BASE + i).zfill(6) for i in range(n_tickers)]
+        self.stocks = pd.DataFrame({
+            'Code': self.tickers,
+            'Name': [f"합성{i:04d}" for i in range(n_tickers)],
+        })
+        self._histories = {}
+        self.planted = {}
+        for i, ticker in enumerate(self.tickers):
+            self._histories[ticker], self.planted[ticker] = self._generate(i)
+
+    # ---------- 생성 ----------
+
+    def _random_walk(self, rng, n, drift):
+        """종가 경로 (로그 수익률 누적)"""
+        returns = rng.normal(0, self.volatility, n) + drift
+        return 10000 * rng.uniform(0.5, 5.0) * np.exp(np.cumsum(returns))
+
+    def _ohlcv(self, rng, close):
+        """종가 경로에 시가/고가/저가/거래량 붙이기"""
+        n = len(close)
+        prev_close = np.concatenate([[close[0]], close[:-1]])
+        open_ = prev_close * (1 + rng.normal(0, self.volatility / 4, n))
+        high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, self.volatility / 3, n)))
+        low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, self.volatility / 3, n)))
+        volume = rng.lognormal(np.log(500_000), 0.4, n)
+        return open_, high, low, volume
+
+    def _plant_candles(self, close, open_, high, low, volume, start, candles):
+        """start 위치부터 패턴 캔들을 심고, 이후 경로는 마지막 패턴 종가에 이어지도록 조정"""
+        base = close[start - 1]
+        old_last = close[start + len(candles) - 1]
+        for offset, (o, h, l, c) in enumerate(candles):
+            idx = start + offset
+            open_[idx], high[idx], low[idx], close[idx] = base * o, base * h, base * l, base * c
+        # 패턴 이후 구간은 비율 그대로 새 종가 수준으로 이동
+        end = start + len(candles)
+        scale = close[end - 1] / old_last
+        close[end:] *= scale
+        open_[end:] *= scale
+        high[end:] *= scale
+        low[end:] *= scale
+        # 반전 캔들 거래량 급증
+        volume[end - 1] *= 3
+
+    def _generate(self, i):
+        """종목 i의 OHLCV와 심은 패턴 목록"""
+        rng = np.random.default_rng([self.seed, i])
+        n = self.n_days
+        pattern = PLANT_CYCLE[i % len(PLANT_CYCLE)]
+        planted = []
+
+        if pattern == 'golden_cross':
+            close = self._golden_cross_path(rng)
+        else:
+            close = self._random_walk(rng, n, drift=rng.normal(0.0003, 0.0005))
+        open_, high, low, volume = self._ohlcv(rng, close)
+
+        if pattern == 'golden_cross':
+            planted.append(('golden_cross', self.dates[-1]))
+        elif pattern is not None:
+            candles = MORNING_STAR_CANDLES if pattern == 'morning_star' else BREAKAWAY_CANDLES
+            # 최근 6개월 안 (패턴 검색 구간)에 심기
+            start = n - int(rng.integers(10, 100))
+            # 패턴 직전 10일은 몸통이 작은 캔들로 (TA-Lib의 긴/짧은 몸통 판정 기준)
+            calm = slice(start - 10, start)
+            open_[calm] = close[calm] * (1 + rng.normal(0, self.volatility / 8, 10))
+            high[calm] = np.maximum(open_[calm], close[calm]) * 1.003
+            low[calm] = np.minimum(open_[calm], close[calm]) * 0.997
+            self._plant_candles(close, open_, high, low, volume, start, candles)
+            planted.append((pattern, self.dates[start + len(candles) - 1]))
+
+        df = pd.DataFrame({
+            'Open': open_,
+            'High': high,
+            'Low': low,
+            'Close': close,
+            'Volume': volume.astype(np.int64),
+        }, index=self.dates)
+        df.index.name = 'Date'
+        return df, planted
+
+    def _golden_cross_path(self, rng):
+        """하락 후 반등해서 마지막 거래일에 MA20이 MA60을 상향 돌파하는 종가 경로"""
+        extra = 150
+        total = self.n_days + extra
+        turn = total - 80
+        drift = np.where(np.arange(total) < turn, -0.003, 0.005)
+        for _ in range(20):
+            returns = rng.normal(0, self.volatility * 0.8, total) + drift
+            close = 10000 * rng.uniform(0.5, 5.0) * np.exp(np.cumsum(returns))
+            series = pd.Series(close)
+            above = (series.rolling(20).mean() > series.rolling(60).mean()).to_numpy()
+            crosses = np.flatnonzero(~above[turn - 1:-1] & above[turn:]) + turn
+            if len(crosses) and crosses[0] >= self.n_days - 1:
+                end = crosses[0]
+                return close[end - self.n_days + 1:end + 1]
+        # 드물게 교차가 안 나오면 일반 경로 (planted에는 기록되지만 탐지 실패로 집계됨)
+        return close[-self.n_days:]
+
+    # ---------- 조회 ----------
+
+    def history(self, ticker):
+        """종목 전체 기간 OHLCV (복사본)"""
+        return self._histories[str(ticker).zfill(6)].copy()
+
+    def source(self, ticker, start_date, end_date):
+        """price_data.set_price_source에 연결할 수 있는 가격 소스"""
+        df = self._histories.get(str(ticker).zfill(6))
+        if df is None:
+            return None
+        return df.loc[pd.Timestamp(start_date).normalize():pd.Timestamp(end_date)].copy()
+
+    def planted_events(self):
+        """심은 패턴 목록 DataFrame (ticker, pattern, date)"""
+        rows = [
+            {'ticker': ticker, 'pattern': pattern, 'date': date}
+            for ticker, events in self.planted.items()
+            for pattern, date in events
+        ]
+        return pd.DataFrame(rows, columns=['ticker', 'pattern', 'date'])
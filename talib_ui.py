@@ -4,78 +4,32 @@ TA-Lib 기반 급등주 찾기 UI 모듈
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
-import FinanceDataReader as fdr
-from swing_analyzer import TalibPatternFinder, SwingTradeAnalyzer
-
-try:
-    import talib
-    TALIB_AVAILABLE = True
-except ImportError:
-    TALIB_AVAILABLE = False
-
-
-def get_stock_data_for_chart(ticker, days=500):
-    """차트용 주식 데이터 조회"""
-    try:
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
-
-        # FinanceDataReader는 한국 ticker 코드 그대로 사용 (예: 005930)
-        ticker_symbol = str(ticker).zfill(6)
-
-        df = fdr.DataReader(
-            ticker_symbol,
-            start_date,
-            end_date
-        )
-
-        if df is None or len(df) < 100:
-            return None
-
-        # MultiIndex 처리
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = df.columns.get_level_values(0)
-
-        # 컬럼명 정리
-        df.columns = [str(col).strip() for col in df.columns]
-        df.columns = [col[0].upper() + col[1:].lower() if len(col) > 0 else col for col in df.columns]
-
-        # 컬럼 매핑
-        col_map = {}
-        for col in df.columns:
-            col_lower = col.lower().strip()
-            if col_lower == 'open':
-                col_map[col] = 'Open'
-            elif col_lower == 'high':
-                col_map[col] = 'High'
-            elif col_lower == 'low':
-                col_map[col] = 'Low'
-            elif col_lower == 'close':
-                col_map[col] = 'Close'
-            elif col_lower == 'volume':
-                col_map[col] = 'Volume'
-            elif col_lower in ['adj close', 'adj_close']:
-                col_map[col] = 'Adj Close'
-
-        if col_map:
-            df.rename(columns=col_map, inplace=True)
-
-        required_cols = ['Open', 'High', 'Low', 'Close', 'Volume']
-        if not all(col in df.columns for col in required_cols):
-            return None
-
-        df[required_cols] = df[required_cols].apply(pd.to_numeric, errors='coerce')
-        df = df.dropna(subset=required_cols)
-
-        if len(df) < 100:
-            return None
-
-        return df[required_cols]
-
-    except Exception as e:
+from swing_analyzer import TalibPatternFinder, SwingTradeAnalyzer, DEFAULT_MARKETS
+from shared_cache import get_shared_cache
+from batch_scan import scan_key, parse_markets, universe_tag
+from chart_data import load_chart_data, get_chart_derived, get_chart_prefetcher, CHART_HISTORY_DAYS
+from scan_jobs import get_job_manager
+from lazy_import import lazy_module
+from scan_metrics import get_ui_timer
+from result_table import render_result_table
+from chart_builder import (downsample_ohlcv, line_trace, candlestick_trace, volume_trace, vline_shapes,
+                           DEFAULT_MAX_POINTS)
+from candlestick import cdl_morningstar, cdl_breakaway
+
+# plotly는 차트를 처음 그릴 때 import
+go = lazy_module('plotly.graph_objects')
+
+# 백그라운드 스캔 진행 상황 갱신 주기 (초)
+SCAN_POLL_SECONDS = 2
+
+
+def get_stock_data_for_chart(ticker, days=CHART_HISTORY_DAYS):
+    """차트용 주식 데이터 조회 (앱 차트 탭과 공유하는 LRU 차트 캐시 경유)"""
+    df = load_chart_data(ticker, days)
+    if df is None or len(df) < 100:
         return None
+    return df
 
 
 def detect_patterns_in_dataframe(df):
@@ -94,14 +48,14 @@ def detect_patterns_in_dataframe(df):
         return None
 
     try:
-        open_arr = df['Open'].values
-        high_arr = df['High'].values
-        low_arr = df['Low'].values
-        close_arr = df['Close'].values
+        open_arr = df['Open'].to_numpy(dtype=np.float64)
+        high_arr = df['High'].to_numpy(dtype=np.float64)
+        low_arr = df['Low'].to_numpy(dtype=np.float64)
+        close_arr = df['Close'].to_numpy(dtype=np.float64)
 
-        # 패턴 감지
-        morning_star = talib.CDLMORNINGSTAR(open_arr, high_arr, low_arr, close_arr)
-        breakaway = talib.CDLBREAKAWAY(open_arr, high_arr, low_arr, close_arr)
+        # 패턴 감지 (TA-Lib과 같은 판정의 NumPy 엔진)
+        morning_star = cdl_morningstar(open_arr, high_arr, low_arr, close_arr)
+        breakaway = cdl_breakaway(open_arr, high_arr, low_arr, close_arr)
 
         # 패턴이 감지된 인덱스 찾기
         morning_star_indices = np.where(morning_star != 0)[0]
@@ -118,7 +72,7 @@ def detect_patterns_in_dataframe(df):
         return None
 
 
-def create_pattern_chart(df, ticker, name, pattern_info, pattern_type='morning_star'):
+def create_pattern_chart(df, ticker, name, pattern_info, pattern_type='morning_star', max_points=DEFAULT_MAX_POINTS):
     """
     패턴이 표시된 차트 생성
 
@@ -128,6 +82,7 @@ def create_pattern_chart(df, ticker, name, pattern_info, pattern_type='morning_s
         name: 종목명
         pattern_info: 패턴 정보 (인덱스 등)
         pattern_type: 'morning_star' 또는 'breakaway'
+        max_points: 최대 캔들 수 (넘으면 구간별 고가/저가를 보존해 합침, None이면 원본 해상도)
     """
     if df is None or pattern_info is None:
         return None
@@ -140,30 +95,23 @@ def create_pattern_chart(df, ticker, name, pattern_info, pattern_type='morning_s
         df['MA60'] = df['Close'].rolling(window=60).mean()
 
         # 캔들스틱 차트 생성
-        fig = go.Figure(data=[go.Candlestick(
-            x=df.index,
-            open=df['Open'],
-            high=df['High'],
-            low=df['Low'],
-            close=df['Close'],
-            name='가격'
-        )])
+        fig = go.Figure(data=[candlestick_trace(downsample_ohlcv(df, max_points), name='가격')])
 
         # 이동평균선 추가
-        fig.add_trace(go.Scatter(
-            x=df.index, y=df['MA5'],
+        fig.add_trace(line_trace(
+            df.index, df['MA5'], max_points,
             name='MA5',
             line=dict(color='red', width=1),
             opacity=0.7
         ))
-        fig.add_trace(go.Scatter(
-            x=df.index, y=df['MA20'],
+        fig.add_trace(line_trace(
+            df.index, df['MA20'], max_points,
             name='MA20',
             line=dict(color='blue', width=1),
             opacity=0.7
         ))
-        fig.add_trace(go.Scatter(
-            x=df.index, y=df['MA60'],
+        fig.add_trace(line_trace(
+            df.index, df['MA60'], max_points,
             name='MA60',
             line=dict(color='green', width=1),
             opacity=0.7
@@ -179,35 +127,24 @@ def create_pattern_chart(df, ticker, name, pattern_info, pattern_type='morning_s
             pattern_label = '⚡ Breakaway'
             marker_color = 'orange'
 
-        # 패턴 인덱스에 수직선과 마커 추가
-        for idx in indices:
-            if idx < len(df):
-                pattern_date = df.index[idx]
-                pattern_high = df.iloc[idx]['High']
-
-                # 수직선 추가
-                fig.add_vline(
-                    x=pattern_date,
-                    line_dash="dash",
-                    line_color=marker_color,
-                    opacity=0.7,
-                    annotation_text=pattern_label,
-                    annotation_position="top"
-                )
-
-                # 마커 추가
-                fig.add_trace(go.Scatter(
-                    x=[pattern_date],
-                    y=[pattern_high],
-                    mode='markers+text',
-                    marker=dict(size=15, color=marker_color, symbol='diamond'),
-                    text=[pattern_label],
-                    textposition='top center',
-                    showlegend=False,
-                    hovertemplate=f'{pattern_label}<br>날짜: %{{x|%Y-%m-%d}}<extra></extra>'
-                ))
+        # 패턴 인덱스에 수직선과 마커 추가 (수직선은 shape 목록 한 번에, 마커는 트레이스 하나로)
+        indices = np.asarray(indices, dtype=np.int64)
+        indices = indices[indices < len(df)]
+        pattern_dates = df.index[indices]
+        if len(indices):
+            fig.add_trace(go.Scatter(
+                x=pattern_dates,
+                y=df['High'].to_numpy()[indices],
+                mode='markers+text',
+                marker=dict(size=15, color=marker_color, symbol='diamond'),
+                text=np.full(len(indices), pattern_label),
+                textposition='top center',
+                showlegend=False,
+                hovertemplate=f'{pattern_label}<br>날짜: %{{x|%Y-%m-%d}}<extra></extra>'
+            ))
 
         fig.update_layout(
+            shapes=vline_shapes(pattern_dates, marker_color),
             title=f'{name} ({ticker}) - {pattern_label} 패턴',
             yaxis_title='가격 (원)',
             xaxis_title='날짜',
@@ -223,17 +160,66 @@ def create_pattern_chart(df, ticker, name, pattern_info, pattern_type='morning_s
         return None
 
 
+@st.fragment(run_every=SCAN_POLL_SECONDS)
+def render_talib_job_status():
+    """백그라운드 TA-Lib 스캔 진행 상황 표시 (fragment - 이 영역만 주기적으로 다시 그림)"""
+    job = get_job_manager().get(st.session_state.talib_job_id)
+    if job is None:
+        st.session_state.talib_job_id = None
+        return
+
+    snapshot = job.snapshot()
+
+    if job.is_active:
+        st.progress(
+            snapshot['progress'],
+            text=f"진행: {snapshot['processed']}/{snapshot['total']} ({snapshot['progress']*100:.0f}%)"
+        )
+        st.caption(
+            f"검사 중: {snapshot['current']} | 성공: {snapshot['succeeded']}개 | 실패: {snapshot['failed']}개 | "
+            f"발견: {snapshot['found']}개 | 경과: {snapshot['elapsed_seconds']:.0f}초"
+        )
+
+        # 중간 결과 (현재까지 발견된 패턴)
+        partial_df = job.partial_frame()
+        if not partial_df.empty:
+            st.dataframe(
+                partial_df[['pattern_type', 'name', 'ticker', 'pattern_date']].tail(10),
+                use_container_width=True,
+                hide_index=True
+            )
+        return
+
+    # 완료 또는 실패 - 결과를 세션에 반영하고 전체 화면 다시 그리기
+    st.session_state.talib_job_id = None
+
+    if job.status == 'done' and job.result is not None and not job.result.empty:
+        results = job.result
+        st.session_state.talib_results = results
+        ms_count = len(results[results['pattern_type'].str.contains('Morning Star', na=False)])
+        ba_count = len(results[results['pattern_type'].str.contains('Breakaway', na=False)])
+        st.session_state.talib_job_message = (
+            'success', f"✅ 스캔 완료! Morning Star {ms_count}개, Bullish Breakaway {ba_count}개 발견 (캐시 저장됨)"
+        )
+    elif job.status == 'done':
+        st.session_state.talib_job_message = ('warning', "⚠️ 조건을 만족하는 패턴이 없습니다.")
+    else:
+        st.session_state.talib_job_message = ('error', f"스캔 중 오류 발생: {snapshot['error']}")
+
+    st.rerun()
+
+
 def render_talib_soaring_tab():
     """TA-Lib 기반 급등주 찾기 탭 렌더링"""
 
+    if 'talib_job_id' not in st.session_state:
+        st.session_state.talib_job_id = None
+    if 'talib_job_message' not in st.session_state:
+        st.session_state.talib_job_message = None
+
     st.header("🚀 급등주 찾기 (TA-Lib 기반)")
     st.subheader("과거 6개월 동안 Morning Star와 Bullish Breakaway 패턴이 나타난 종목")
-    st.caption("TA-Lib의 캔들스틱 패턴 인식 기능을 사용하여 정확한 패턴 감지")
-
-    if not TALIB_AVAILABLE:
-        st.error("❌ ta-lib이 설치되지 않았습니다.")
-        st.info("설치 방법: `pip install ta-lib` 또는 `conda install -c conda-forge ta-lib`")
-        return
+    st.caption("TA-Lib과 같은 규칙의 캔들스틱 패턴 인식 엔진으로 패턴 감지 (TA-Lib 설치 불필요)")
 
     col1, col2, col3 = st.columns([2, 1, 1])
 
@@ -255,22 +241,38 @@ def render_talib_soaring_tab():
     with col3:
         talib_scan_mode = st.selectbox(
             "스캔 범위",
-            options=["전체 (958개)", "빠른 스캔 (200개)", "테스트 (50개)"],
+            options=["전체", "빠른 스캔 (200개)", "테스트 (50개)"],
             help="스캔할 종목의 수를 선택합니다",
             key="talib_scan_mode"
         )
 
-    # 진행 상황 표시 영역
-    talib_progress_placeholder = st.empty()
+    # 상태 메시지 표시 영역
     talib_status_placeholder = st.empty()
-    talib_current_placeholder = st.empty()
-    talib_progress_bar_placeholder = st.empty()
+
+    # 스캔 대상 시장 (앱 사이드바에서 고른 시장, 없으면 전체 시장)
+    scan_universe = ','.join(st.session_state.get('scan_markets') or DEFAULT_MARKETS)
+    full_scan_key = scan_key('talib_patterns', scan_universe, None)
+    full_scan_tag = universe_tag(scan_universe)
+
+    # 다른 세션에서 전체 스캔이 실행 중이면 그 작업에 연결
+    if st.session_state.talib_job_id is None:
+        running_job = get_job_manager().find_active(full_scan_key)
+        if running_job is not None:
+            st.session_state.talib_job_id = running_job.job_id
+
+    # 직전 백그라운드 스캔의 완료/오류 메시지
+    if st.session_state.talib_job_message is not None:
+        message_type, message_text = st.session_state.talib_job_message
+        st.session_state.talib_job_message = None
+        with talib_status_placeholder.container():
+            getattr(st, message_type)(message_text)
 
     # 캐시 삭제
     if refresh_talib_cache:
         finder = TalibPatternFinder()
-        cache_path = finder.get_talib_week_cache_filepath()
+        cache_path = finder.get_talib_week_cache_filepath(tag=full_scan_tag)
         import os
+        get_shared_cache().invalidate(full_scan_key)
         if os.path.exists(cache_path):
             os.remove(cache_path)
             st.session_state.talib_results = None
@@ -287,15 +289,17 @@ def render_talib_soaring_tab():
         from pathlib import Path
 
         today = datetime.now().date()
-        cached_results = None
+        # 다른 세션이 오늘 실행한 전체 스캔 결과가 있으면 우선 사용
+        cached_results = get_shared_cache().get(full_scan_key)
 
-        for days_back in range(8):
-            check_date = today - timedelta(days=days_back)
-            cached_data = finder.load_talib_week_patterns(date=check_date)
+        if cached_results is None:
+            for days_back in range(8):
+                check_date = today - timedelta(days=days_back)
+                cached_data = finder.load_talib_week_patterns(date=check_date, tag=full_scan_tag)
 
-            if cached_data is not None and len(cached_data) > 0:
-                cached_results = cached_data
-                break
+                if cached_data is not None and len(cached_data) > 0:
+                    cached_results = cached_data
+                    break
 
         if cached_results is not None and len(cached_results) > 0:
             st.session_state.talib_results = cached_results
@@ -307,55 +311,44 @@ def render_talib_soaring_tab():
     if find_talib_patterns:
         # 스캔 범위 설정
         talib_mode_map = {
-            "전체 (958개)": None,
+            "전체": None,
             "빠른 스캔 (200개)": 200,
             "테스트 (50개)": 50
         }
         max_talib_stocks = talib_mode_map.get(talib_scan_mode, None)
 
-        try:
+        talib_scan_key = scan_key('talib_patterns', scan_universe, max_talib_stocks)
+
+        def run_talib_job(job):
             finder = TalibPatternFinder()
-            analyzer = SwingTradeAnalyzer()
-            kospi_stocks = analyzer.get_kospi_stocks()
-
-            if not kospi_stocks.empty:
-                if max_talib_stocks:
-                    kospi_stocks = kospi_stocks.head(max_talib_stocks)
-
-                with talib_status_placeholder.container():
-                    st.info(f"📊 {len(kospi_stocks)}개 종목 스캔 중 (TA-Lib 패턴 감지)...")
-
-                # 진행 상황 콜백
-                def talib_progress_callback(idx, total, name, ticker, found_count, success):
-                    with talib_progress_bar_placeholder.container():
-                        progress = idx / total
-                        st.progress(progress, text=f"진행: {idx}/{total} ({progress*100:.0f}%)")
-
-                    with talib_current_placeholder.container():
-                        status_text = "✓" if success else "✗"
-                        st.caption(f"{status_text} 검사 중: {name} ({ticker}) | 발견: {found_count}개")
-
-                # 패턴 스캔
-                results = finder.find_patterns_in_week(kospi_stocks, progress_callback=talib_progress_callback)
-
-                if not results.empty:
-                    # 결과 저장
-                    finder.save_talib_week_patterns(results)
-                    st.session_state.talib_results = results
-                    # 차트 데이터 초기화
-                    st.session_state.talib_chart_data = {}
-
-                    with talib_status_placeholder.container():
-                        ms_count = len(results[results['pattern_type'].str.contains('Morning Star', na=False)])
-                        ba_count = len(results[results['pattern_type'].str.contains('Breakaway', na=False)])
-                        st.success(f"✅ 스캔 완료! Morning Star {ms_count}개, Bullish Breakaway {ba_count}개 발견 (캐시 저장됨)")
-                else:
-                    with talib_status_placeholder.container():
-                        st.warning(f"⚠️ 조건을 만족하는 패턴이 없습니다.")
-
-        except Exception as e:
-            with talib_status_placeholder.container():
-                st.error(f"스캔 중 오류 발생: {str(e)}")
+            market_stocks = SwingTradeAnalyzer().get_market_stocks(parse_markets(scan_universe))
+            if market_stocks.empty:
+                return pd.DataFrame()
+            if max_talib_stocks:
+                market_stocks = market_stocks.head(max_talib_stocks)
+
+            scan_results = finder.find_patterns_in_week(
+                market_stocks,
+                progress_callback=job.update_progress,
+                result_callback=job.add_result
+            )
+            if not scan_results.empty:
+                finder.save_talib_week_patterns(scan_results, tag=universe_tag(scan_universe, max_talib_stocks))
+            return scan_results
+
+        # 같은 스캔이 이미 실행 중이면 새로 시작하지 않고 그 작업에 연결
+        job, created = get_job_manager().submit(talib_scan_key, run_talib_job, description="TA-Lib 패턴 스캔")
+        st.session_state.talib_job_id = job.job_id
+
+        with talib_status_placeholder.container():
+            if created:
+                st.info("📊 백그라운드에서 TA-Lib 패턴 스캔을 시작했습니다. 스캔 중에도 다른 탭을 볼 수 있습니다.")
+            else:
+                st.info("⏳ 다른 사용자가 실행 중인 같은 스캔에 연결했습니다. 완료되면 결과를 함께 사용합니다.")
+
+    # 백그라운드 스캔 진행 상황 (이 영역만 주기적으로 갱신)
+    if st.session_state.talib_job_id is not None:
+        render_talib_job_status()
 
     # 결과 표시
     if st.session_state.talib_results is not None and len(st.session_state.talib_results) > 0:
@@ -399,23 +392,13 @@ def render_talib_soaring_tab():
                     extraction_time = talib_df.iloc[0]['extraction_time']
                     st.caption(f"📊 데이터 추출: {extraction_time}")
 
-                # 테이블 표시
-                display_df = talib_df[['pattern_type', 'name', 'ticker', 'current_price', 'pattern_date']].copy()
-                display_df.columns = ['패턴', '종목명', '티커', '현재가', '패턴 발생일']
-                display_df['순위'] = range(1, len(display_df) + 1)
-                display_df = display_df[['순위', '패턴', '종목명', '티커', '현재가', '패턴 발생일']]
-
-                # 티커 포맷 (네이버증권 링크)
-                display_df['티커_temp'] = display_df['티커'].astype(str).str.zfill(6)
-                display_df['티커'] = display_df['티커_temp'].apply(
-                    lambda ticker: f'<a href="https://finance.naver.com/item/main.naver?code={str(ticker)}" target="_blank">{str(ticker)}</a>'
+                # 테이블 표시 (검색/정렬/페이지 이동, 현재 페이지만 전송)
+                render_result_table(
+                    talib_df, "talib_all",
+                    columns={'pattern_type': '패턴', 'name': '종목명', 'ticker': '티커',
+                             'current_price': '현재가', 'pattern_date': '패턴 발생일'},
+                    formats={'current_price': '₩%d'}
                 )
-                display_df = display_df.drop('티커_temp', axis=1)
-
-                # 가격 포맷
-                display_df['현재가'] = display_df['현재가'].apply(lambda x: f'₩{x:,.0f}')
-
-                st.markdown(display_df.to_html(escape=False, index=False), unsafe_allow_html=True)
                 st.caption("💡 팁: 티커를 클릭하면 네이버 증권에서 종목 정보를 확인할 수 있습니다")
 
         # ============ TAB: Morning Star ============
@@ -432,23 +415,12 @@ def render_talib_soaring_tab():
                 )
                 st.divider()
 
-                # 테이블 표시
-                display_ms_df = morning_star_df[['name', 'ticker', 'current_price', 'pattern_date']].copy()
-                display_ms_df.columns = ['종목명', '티커', '현재가', '패턴 발생일']
-                display_ms_df['순위'] = range(1, len(display_ms_df) + 1)
-                display_ms_df = display_ms_df[['순위', '종목명', '티커', '현재가', '패턴 발생일']]
-
-                # 티커 포맷
-                display_ms_df['티커_temp'] = display_ms_df['티커'].astype(str).str.zfill(6)
-                display_ms_df['티커'] = display_ms_df['티커_temp'].apply(
-                    lambda ticker: f'<a href="https://finance.naver.com/item/main.naver?code={str(ticker)}" target="_blank">{str(ticker)}</a>'
+                # 테이블 표시 (검색/정렬/페이지 이동, 현재 페이지만 전송)
+                render_result_table(
+                    morning_star_df, "talib_ms",
+                    columns={'name': '종목명', 'ticker': '티커', 'current_price': '현재가', 'pattern_date': '패턴 발생일'},
+                    formats={'current_price': '₩%d'}
                 )
-                display_ms_df = display_ms_df.drop('티커_temp', axis=1)
-
-                # 가격 포맷
-                display_ms_df['현재가'] = display_ms_df['현재가'].apply(lambda x: f'₩{x:,.0f}')
-
-                st.markdown(display_ms_df.to_html(escape=False, index=False), unsafe_allow_html=True)
             else:
                 st.info("🌅 Morning Star 패턴이 발견되지 않았습니다.")
 
@@ -466,23 +438,12 @@ def render_talib_soaring_tab():
                 )
                 st.divider()
 
-                # 테이블 표시
-                display_ba_df = bullish_breakaway_df[['name', 'ticker', 'current_price', 'pattern_date']].copy()
-                display_ba_df.columns = ['종목명', '티커', '현재가', '패턴 발생일']
-                display_ba_df['순위'] = range(1, len(display_ba_df) + 1)
-                display_ba_df = display_ba_df[['순위', '종목명', '티커', '현재가', '패턴 발생일']]
-
-                # 티커 포맷
-                display_ba_df['티커_temp'] = display_ba_df['티커'].astype(str).str.zfill(6)
-                display_ba_df['티커'] = display_ba_df['티커_temp'].apply(
-                    lambda ticker: f'<a href="https://finance.naver.com/item/main.naver?code={str(ticker)}" target="_blank">{str(ticker)}</a>'
+                # 테이블 표시 (검색/정렬/페이지 이동, 현재 페이지만 전송)
+                render_result_table(
+                    bullish_breakaway_df, "talib_ba",
+                    columns={'name': '종목명', 'ticker': '티커', 'current_price': '현재가', 'pattern_date': '패턴 발생일'},
+                    formats={'current_price': '₩%d'}
                 )
-                display_ba_df = display_ba_df.drop('티커_temp', axis=1)
-
-                # 가격 포맷
-                display_ba_df['현재가'] = display_ba_df['현재가'].apply(lambda x: f'₩{x:,.0f}')
-
-                st.markdown(display_ba_df.to_html(escape=False, index=False), unsafe_allow_html=True)
             else:
                 st.info("⚡ Bullish Breakaway 패턴이 발견되지 않았습니다.")
 
@@ -550,47 +511,51 @@ def render_talib_soaring_tab():
 
                     st.divider()
 
-                    # 차트 데이터 조회
-                    with st.spinner("📊 차트 데이터 로드 중..."):
-                        if ticker not in st.session_state.talib_chart_data:
-                            chart_df = get_stock_data_for_chart(ticker, days=500)
-                            if chart_df is not None:
-                                st.session_state.talib_chart_data[ticker] = chart_df
-                            else:
-                                st.error(f"❌ {stock_info['name']} ({ticker})의 데이터를 찾을 수 없습니다.")
-                                chart_df = None
-                        else:
-                            chart_df = st.session_state.talib_chart_data[ticker]
+                    # 차트 데이터 조회 (공용 LRU 차트 캐시)
+                    with st.spinner("📊 차트 데이터 로드 중..."), get_ui_timer().stage('chart_data'):
+                        chart_df = get_stock_data_for_chart(ticker)
+                        if chart_df is None:
+                            st.error(f"❌ {stock_info['name']} ({ticker})의 데이터를 찾을 수 없습니다.")
+
+                    # ◀/▶ 이동에 대비해 앞뒤 종목의 차트 데이터와 패턴을 백그라운드에서 미리 계산
+                    get_chart_prefetcher().prefetch(
+                        talib_df['ticker'].tolist(), ticker,
+                        derive={'talib_patterns': detect_patterns_in_dataframe}
+                    )
 
                     if chart_df is not None and len(chart_df) > 0:
-                        # 패턴 정보 감지
-                        pattern_info = detect_patterns_in_dataframe(chart_df)
+                        # 패턴 정보 감지 (프리페치된 결과가 있으면 재사용)
+                        with get_ui_timer().stage('talib'):
+                            pattern_info = get_chart_derived(ticker, CHART_HISTORY_DAYS, 'talib_patterns', detect_patterns_in_dataframe)
+
+                        # 캔들이 화면 폭보다 많으면 합쳐서 그림 (확대해서 볼 때는 원본 해상도)
+                        full_resolution = len(chart_df) > DEFAULT_MAX_POINTS and st.checkbox(
+                            "원본 해상도", value=False, key="talib_full_resolution",
+                            help="확대해서 일봉 하나하나를 볼 때 켜세요 (기본은 화면 폭에 맞춰 캔들을 합쳐서 표시)"
+                        )
+                        max_points = None if full_resolution else DEFAULT_MAX_POINTS
 
                         # 차트 생성
                         if pattern_info:
-                            if stock_info['pattern_type'].startswith('🌅'):
-                                fig = create_pattern_chart(chart_df, ticker, stock_info['name'], pattern_info, 'morning_star')
-                            else:
-                                fig = create_pattern_chart(chart_df, ticker, stock_info['name'], pattern_info, 'breakaway')
-
-                            if fig:
-                                st.plotly_chart(fig, use_container_width=True)
-                            else:
-                                st.error("차트를 생성할 수 없습니다.")
+                            with get_ui_timer().stage('chart_render'):
+                                if stock_info['pattern_type'].startswith('🌅'):
+                                    fig = create_pattern_chart(chart_df, ticker, stock_info['name'], pattern_info, 'morning_star', max_points)
+                                else:
+                                    fig = create_pattern_chart(chart_df, ticker, stock_info['name'], pattern_info, 'breakaway', max_points)
+
+                                if fig:
+                                    st.plotly_chart(fig, use_container_width=True)
+                                else:
+                                    st.error("차트를 생성할 수 없습니다.")
                         else:
                             st.error("패턴 정보를 감지할 수 없습니다.")
 
                         # 거래량 차트
                         st.subheader("📊 거래량")
-                        colors = ['green' if chart_df['Close'].iloc[i] >= chart_df['Open'].iloc[i] else 'red'
-                                  for i in range(len(chart_df))]
-
                         fig_volume = go.Figure()
-                        fig_volume.add_trace(go.Bar(
-                            x=chart_df.index,
-                            y=chart_df['Volume'],
+                        fig_volume.add_trace(volume_trace(
+                            downsample_ohlcv(chart_df, max_points),
                             name='거래량',
-                            marker=dict(color=colors),
                             showlegend=False
                         ))
 
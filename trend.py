@@ -0,0 +1,108 @@
+"""
+저점 추세 지표 모듈 (급등 신호 스캐너용)
+
+이동 구간 선형회귀 기울기/결정계수(R²)와 연속 상승 봉 수를 닫힌 형태 배열 연산으로 계산한다.
+입력은 1차원(한 종목)이나 2차원 패널(종목 x 거래일, 오른쪽 = 최근 봉) 모두 되므로
+np.polyfit을 종목/날짜마다 부르지 않고 시장 전체, 과거 모든 날짜의 저점 추세 조건을 한 번에 구할 수 있다.
+"""
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from price_panel import frames_to_panel
+
+# 지속적인 저점 상승: 최근 20개 저점의 회귀 기울기 > 0
+SUPPORT_TREND_WINDOW = 20
+
+# 저점이 계속 높아짐: 최근 10개 저점이 매일 높아짐 (연속 상승 9번)
+RISING_LOWS_WINDOW = 10
+
+
+def rolling_trend(values, window):
+    """
+    window개 봉 선형회귀(x = 0..window-1)의 기울기와 결정계수 (마지막 축 기준)
+
+    기울기 = Σ(x - x̄)·y / Σ(x - x̄)², R² = 기울기² · Σ(x - x̄)² / Σ(y - ȳ)²
+    np.polyfit(range(window), y, 1)[0]과 같은 기울기다.
+    앞쪽 window-1개와 결측이 섞인 구간은 NaN, 구간 값이 모두 같으면 R²는 0.
+
+    Returns:
+        (기울기 배열, R² 배열) - 입력과 같은 모양
+    """
+    values = np.asarray(values, dtype=np.float64)
+    slope = np.full(values.shape, np.nan)
+    r2 = np.full(values.shape, np.nan)
+    if window < 2 or values.shape[-1] < window:
+        return slope, r2
+
+    windows = sliding_window_view(values, window, axis=-1)
+    x = np.arange(window, dtype=np.float64) - (window - 1) / 2
+    sxx = float(x @ x)
+    sxy = windows @ x
+    syy = ((windows - windows.mean(axis=-1, keepdims=True)) ** 2).sum(axis=-1)
+
+    slope[..., window - 1:] = sxy / sxx
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r2[..., window - 1:] = np.where(syy > 0, sxy * sxy / (sxx * syy), 0.0)
+    r2[np.isnan(slope)] = np.nan
+    return slope, r2
+
+
+def rising_run_length(values):
+    """
+    봉마다 직전 봉보다 높아진 일이 몇 번 연속됐는지 (마지막 축 기준, 결측이면 끊김)
+
+    run >= k 이면 최근 k+1개 값이 모두 엄격하게 증가한 것이다.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    run = np.zeros(values.shape, dtype=np.int64)
+    if values.shape[-1] < 2:
+        return run
+    positions = np.arange(values.shape[-1])
+    rising = np.zeros(values.shape, dtype=bool)
+    rising[..., 1:] = values[..., 1:] > values[..., :-1]
+    last_break = np.maximum.accumulate(np.where(rising, 0, positions), axis=-1)
+    run[...] = positions - last_break
+    return run
+
+
+def low_trend_features(low, slope_window=SUPPORT_TREND_WINDOW, run_window=RISING_LOWS_WINDOW):
+    """
+    모든 봉의 저점 추세 지표 (1차원 또는 2차원 패널)
+
+    Returns:
+        {'low_slope', 'low_r2': slope_window개 저점 회귀 기울기/R²,
+         'rising_run': 연속 상승 봉 수,
+         'continuous_rising_lows': low_slope > 0 (SoaringSignalFinder.check_support_breakout 조건),
+         'rising_lows': 최근 run_window개 저점이 매일 높아짐 (check_candlestick_signal 조건)}
+    """
+    slope, r2 = rolling_trend(low, slope_window)
+    run = rising_run_length(low)
+    return {
+        'low_slope': slope,
+        'low_r2': r2,
+        'rising_run': run,
+        'continuous_rising_lows': slope > 0,
+        'rising_lows': run >= run_window - 1,
+    }
+
+
+def screen_low_trends(frames, tickers=None, slope_window=SUPPORT_TREND_WINDOW, run_window=RISING_LOWS_WINDOW):
+    """
+    여러 종목의 최근 봉 저점 추세 지표를 한 번에 계산 (시장 전체 스크리닝용)
+
+    Args:
+        frames: 종목별 가격 DataFrame 목록 ('Low' 컬럼 필요)
+        tickers: 결과 인덱스로 쓸 종목코드 목록 (None이면 0부터 번호)
+
+    Returns:
+        DataFrame (종목별 low_slope, low_r2, rising_run, continuous_rising_lows, rising_lows)
+    """
+    columns = ['low_slope', 'low_r2', 'rising_run', 'continuous_rising_lows', 'rising_lows']
+    index = pd.Index(tickers, name='ticker') if tickers is not None else None
+    if not len(frames):
+        return pd.DataFrame(columns=columns, index=index)
+
+    panel, _ = frames_to_panel(frames, ('Low',))
+    features = low_trend_features(panel['Low'], slope_window, run_window)
+    return pd.DataFrame({col: features[col][:, -1] for col in columns}, columns=columns, index=index)